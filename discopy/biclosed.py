@@ -57,6 +57,9 @@ class BinaryTyConstructor:
     def from_tree(cls, tree):
         return cls(*map(from_tree, (tree['left'], tree['right'])))
 
+    def _intern_key(self):
+        return type(self), self.left, self.right
+
 
 class Over(BinaryTyConstructor, Ty):
     """ Forward slash types. """
@@ -293,8 +296,9 @@ class Functor(monoidal.Functor):
     y.r @ x @ y.l
     >>> assert F((y >> x) << y) == F(y >> (x << y))
     """
-    def __init__(self, ob, ar, ob_factory=Ty, ar_factory=Diagram):
-        super().__init__(ob, ar, ob_factory, ar_factory)
+    def __init__(self, ob, ar, ob_factory=Ty, ar_factory=Diagram,
+                 cache_size=None):
+        super().__init__(ob, ar, ob_factory, ar_factory, cache_size)
 
     def __call__(self, diagram):
         if isinstance(diagram, Over):
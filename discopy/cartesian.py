@@ -34,6 +34,8 @@ We can check the axioms for the Copy/Discard comonoid on specific inputs:
 >>> assert (Copy(4) >> Swap(4, 4))(42, 43, 44, 45) == Copy(4)(42, 43, 44, 45)
 """
 
+from functools import reduce
+
 from discopy.cat import AxiomError
 from discopy import messages, monoidal, rigid
 from discopy.monoidal import Sum
@@ -116,7 +118,9 @@ class Function(rigid.Box):
         >>> assert (copy >> swap)(1) == copy(1)
         >>> assert (swap >> swap)(1, 2) == (1, 2)
         """
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if len(others) != 1:
+            return reduce(lambda f, g: f.then(g), others, self)
+        if isinstance(others[0], Sum):
             return monoidal.Diagram.then(self, *others)
         other = others[0]
         if not isinstance(other, Function):
@@ -135,7 +139,9 @@ class Function(rigid.Box):
         >>> assert (swap @ swap)(1, 2, 3, 4) == (2, 1, 4, 3)
         >>> assert (copy @ copy)(1, 2) == (1, 1, 2, 2)
         """
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if len(others) != 1:
+            return reduce(lambda f, g: f.tensor(g), others, self)
+        if isinstance(others[0], Sum):
             return monoidal.Diagram.tensor(self, *others)
         other = others[0]
         if not isinstance(other, Function):
@@ -163,8 +169,9 @@ class PythonFunctor(rigid.Functor):
     """
     Implements functors into the category of Python functions on tuples
     """
-    def __init__(self, ob, ar):
-        super().__init__(ob, ar, ob_factory=PRO, ar_factory=Function)
+    def __init__(self, ob, ar, cache_size=None):
+        super().__init__(ob, ar, ob_factory=PRO, ar_factory=Function,
+                         cache_size=cache_size)
 
 
 class Diagram(rigid.Diagram):
@@ -254,7 +261,7 @@ class Box(rigid.Box, Diagram):
         if function is not None:
             self._function = function
         rigid.Box.__init__(self, name, PRO(dom), PRO(cod), data=data)
-        Diagram.__init__(self, dom, cod, [self], [0])
+        Diagram.__init__(self, dom, cod, [self], monoidal.BOX_OFFSETS)
 
     @property
     def function(self):
@@ -323,8 +330,9 @@ class Functor(rigid.Functor):
     >>> F = Functor(ob, ar)
     >>> assert F(f >> g)(43) == 86
     """
-    def __init__(self, ob, ar):
-        super().__init__(ob, ar, ob_factory=PRO, ar_factory=Diagram)
+    def __init__(self, ob, ar, cache_size=None):
+        super().__init__(ob, ar, ob_factory=PRO, ar_factory=Diagram,
+                         cache_size=cache_size)
 
 
 def disco(dom, cod, name=None):
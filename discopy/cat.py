@@ -21,11 +21,17 @@ We can create dagger functors from the free category to itself:
 >>> assert F(arrow) == (h >> f >> g)[::-1]
 """
 
-from functools import total_ordering
+from functools import reduce, total_ordering
 from collections.abc import Mapping, Iterable
+from weakref import WeakValueDictionary
 
 from discopy import messages
-from discopy.utils import factory_name, from_tree, rsubs, rmap
+from discopy.utils import (
+    factory_name, from_tree, rsubs, rmap, set_state, LRUCache, Rope)
+
+
+NO_SYMBOLS = frozenset()  # Shared by all the boxes without free symbols.
+MISSING = object()  # Sentinel for cache lookups, images may be None.
 
 
 @total_ordering
@@ -59,8 +65,10 @@ class Ob:
     TypeError: unhashable type: 'list'
 
     """
+    __slots__ = ('_name', '_interned', '__weakref__')
+
     def __init__(self, name):
-        self._name = name
+        self._name, self._interned = name, False
 
     @property
     def name(self):
@@ -84,16 +92,27 @@ class Ob:
         return str(self.name)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Ob):
             return False
+        if self._interned and other._interned and type(self) is type(other):
+            return False  # Equal interned objects of a type are identical.
         return self.name == other.name
 
     def __hash__(self):
         return hash(self.name)
 
+    def _intern_key(self):
+        """ The key of an object in the table of :func:`intern`. """
+        return type(self), self.name
+
     def __lt__(self, other):
         return self.name < other.name
 
+    def __setstate__(self, state):
+        set_state(self, state, _interned=False)
+
     def to_tree(self):
         return {'factory': factory_name(self), 'name': self.name}
 
@@ -113,7 +132,7 @@ class Arrow:
     cod : cat.Ob
         Codomain of the arrow.
     boxes : list of :class:`Arrow`
-        Boxes of the arrow.
+        Boxes of the arrow, stored as a :class:`discopy.utils.Rope`.
 
     Raises
     ------
@@ -129,6 +148,8 @@ class Arrow:
     >>> print(arrow[::-1])
     h[::-1] >> g[::-1] >> f[::-1]
     """
+    __slots__ = ('_dom', '_cod', '_boxes', '_hash', '_interned', '__weakref__')
+
     def __init__(self, dom, cod, boxes, _scan=True):
         if not isinstance(dom, Ob):
             raise TypeError(messages.type_err(Ob, dom))
@@ -146,7 +167,12 @@ class Arrow:
             if scan != cod:
                 raise AxiomError(messages.does_not_compose(
                     boxes[-1] if boxes else Id(dom), Id(cod)))
-        self._dom, self._cod, self._boxes = dom, cod, boxes
+        self._dom, self._cod, self._hash = dom, cod, None
+        self._boxes = boxes if isinstance(boxes, Rope) else Rope(boxes)
+        self._interned = False
+
+    def __setstate__(self, state):
+        set_state(self, state, _hash=None, _interned=False)
 
     @staticmethod
     def upgrade(old):
@@ -186,44 +212,50 @@ class Arrow:
         """
         The list of boxes in an arrow is immutable. Use composition instead.
 
+        It is returned as a read-only :class:`discopy.utils.Rope`, shared
+        with the compositions and slices of the arrow.
+
         >>> f = Box('f', Ob('x'), Ob('y'))
         >>> arrow = Arrow(Ob('x'), Ob('x'), [])
-        >>> arrow.boxes.append(f)  # This does nothing.
+        >>> arrow.boxes.append(f)
+        Traceback (most recent call last):
+        ...
+        AttributeError: 'Rope' object has no attribute 'append'
         >>> assert f not in arrow.boxes
         """
-        return list(self._boxes)
+        return self._boxes
 
     def __iter__(self):
-        for box in self.boxes:
+        for box in self._boxes:
             yield box
 
     def __getitem__(self, key):
         if isinstance(key, slice):
             if key.step == -1:
-                boxes = [box[::-1] for box in self.boxes[key]]
+                boxes = [box[::-1] for box in self._boxes[key]]
                 return self.upgrade(
                     Arrow(self.cod, self.dom, boxes, _scan=False))
             if (key.step or 1) != 1:
                 raise IndexError
-            boxes = self.boxes[key]
+            boxes = self._boxes[key]
             if not boxes:
                 if (key.start or 0) >= len(self):
                     return Id(self.cod)
                 if (key.start or 0) <= -len(self):
                     return Id(self.dom)
-                return Id(self.boxes[key.start or 0].dom)
+                return Id(self._boxes[key.start or 0].dom)
             return self.upgrade(
                 Arrow(boxes[0].dom, boxes[-1].cod, boxes, _scan=False))
-        return self.boxes[key]
+        return self._boxes[key]
 
     def __len__(self):
-        return len(self.boxes)
+        return len(self._boxes)
 
     def __repr__(self):
-        if not self.boxes:  # i.e. self is identity.
+        if not self._boxes:  # i.e. self is identity.
             return repr(Id(self.dom))
-        if len(self.boxes) == 1:  # i.e. self is a box.
-            return repr(self.boxes[0])
+        if len(self._boxes) == 1:  # i.e. self is a box.
+            return repr(self._boxes[0])
         return "Arrow(dom={}, cod={}, boxes={})".format(
             repr(self.dom), repr(self.cod), repr(self.boxes))
 
@@ -233,11 +265,30 @@ class Arrow:
     def __eq__(self, other):
         if not isinstance(other, Arrow):
             return False
+        if self is other:
+            return True
+        if None not in (self._hash, other._hash) and self._hash != other._hash:
+            return False
         return all(getattr(self, a) == getattr(other, a)
                    for a in ["dom", "cod", "boxes"])
 
     def __hash__(self):
-        return hash(repr(self))
+        """
+        The hash of an arrow is computed from the hashes of its boxes, it is
+        cached so that it is only computed once.
+
+        >>> x, y = Ob('x'), Ob('y')
+        >>> f, g = Box('f', x, y), Box('g', y, x)
+        >>> assert hash(f >> g) == hash(Arrow(x, x, [f, g]))
+        >>> assert hash(Arrow(x, y, [f])) == hash(f)
+        """
+        if self._hash is None:
+            if len(self._boxes) == 1:
+                self._hash = hash(self._boxes[0])
+            else:
+                self._hash = hash((self.dom, self.cod, tuple(
+                    map(hash, self._boxes))))
+        return self._hash
 
     def __add__(self, other):
         return self.sum([self]) + other
@@ -280,20 +331,36 @@ class Arrow:
 
         >>> assert f >> Id(y) == f == Id(x) >> f
         >>> assert (f >> g) >> h == f >> (g >> h)
+
+        Composing many arrows at once takes a single pass, without building
+        the intermediate composites:
+
+        >>> assert Id(x).then(*1000 * [f >> g >> h]) == Arrow(
+        ...     x, x, 1000 * [f, g, h])
         """
         if not others:
             return self
-        if len(others) > 1:
-            return self.then(others[0]).then(*others[1:])
-        other, = others
-        if isinstance(other, Sum):
-            return self.sum([self]).then(other)
-        if not isinstance(other, Arrow):
-            raise TypeError(messages.type_err(Arrow, other))
-        if self.cod != other.dom:
-            raise AxiomError(messages.does_not_compose(self, other))
+        if any(isinstance(other, Sum) for other in others):
+            if len(others) > 1:
+                return reduce(lambda f, g: f.then(g), others, self)
+            return self.sum([self]).then(*others)
+        self._check_then(others, Arrow)
         return self.upgrade(Arrow(
-            self.dom, other.cod, self.boxes + other.boxes, _scan=False))
+            self.dom, others[-1].cod,
+            Rope.concat(self._boxes, *(other._boxes for other in others)),
+            _scan=False))
+
+    def _check_then(self, others, factory):
+        """
+        Checks that :code:`self.then(*others)` is well-typed, raising the
+        same errors as composing the arrows one at a time.
+        """
+        for i, other in enumerate(others):
+            if not isinstance(other, factory):
+                raise TypeError(messages.type_err(factory, other))
+            if (others[i - 1] if i else self).cod != other.dom:
+                raise AxiomError(messages.does_not_compose(
+                    self.then(*others[:i]), other))
 
     def __rshift__(self, other):
         return self.then(other)
@@ -458,6 +525,8 @@ class Id(Arrow):
     --------
         cat.Arrow.id
     """
+    __slots__ = ()
+
     def __init__(self, dom):
         Arrow.__init__(self, dom, dom, [], _scan=False)
 
@@ -501,6 +570,8 @@ class Box(Arrow):
     >>> assert f[:0] == Id(f.dom) and f[1:] == Id(f.cod)
 
     """
+    __slots__ = ('_name', '_dagger', '_data', '_free_symbols')
+
     def __init__(self, name, dom, cod, **params):
         def recursive_free_symbols(data):
             if hasattr(data, 'tolist'):
@@ -511,11 +582,11 @@ class Box(Arrow):
                 # Handles numpy 0-d arrays, which are actually not iterable.
                 if not hasattr(data, "shape") or data.shape != ():
                     return set().union(*map(recursive_free_symbols, data))
-            return data.free_symbols if hasattr(data, "free_symbols") else {}
+            return getattr(data, "free_symbols", NO_SYMBOLS)
         data, _dagger = params.get("data", None), params.get("_dagger", False)
         self._free_symbols = recursive_free_symbols(data)
         self._name, self._dom, self._cod = name, dom, cod
-        self._boxes, self._dagger, self._data = [self], _dagger, data
+        self._dagger, self._data = _dagger, data
         Arrow.__init__(self, dom, cod, [self], _scan=False)
 
     @property
@@ -596,10 +667,41 @@ class Box(Arrow):
         return str(self.name) + ("[::-1]" if self._dagger else '')
 
     def __hash__(self):
-        return hash(super().__repr__())
+        """
+        The hash of a box is computed from its name, domain, codomain and
+        whether it is a dagger. These are compared by :meth:`__eq__` in
+        every subclass, so equal boxes have equal hashes. The data is
+        left out since equal data may have different hashes. The hash is
+        cached so that it is only computed once.
+
+        >>> x, y = Ob('x'), Ob('y')
+        >>> f, g = Box('f', x, y, data=1), Box('f', x, y, data=1.0)
+        >>> assert f == g and hash(f) == hash(g)
+        >>> h, k = Box('h', x, y, data=[1]), Box('h', x, y, data=[2])
+        >>> assert h != k and hash(h) == hash(k)
+        """
+        if self._hash is None:
+            self._hash = hash((self._name, self.dom, self.cod, self._dagger))
+        return self._hash
+
+    def _intern_key(self):
+        """
+        The attributes compared by :meth:`__eq__`, or :code:`None` when
+        they are not hashable, e.g. when the data is an array.
+        """
+        key = (
+            type(self), self.name, self.dom, self.cod, self.data, self._dagger)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
 
     def __eq__(self, other):
         if isinstance(other, Box):
+            if None not in (self._hash, other._hash)\
+                    and self._hash != other._hash:
+                return False
             attributes = ['_name', '_dom', '_cod', '_data', '_dagger']
             return all(
                 getattr(self, x) == getattr(other, x) for x in attributes)
@@ -696,7 +798,7 @@ class Sum(Box):
             == (other.dom, other.cod, other.terms)
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.dom, self.cod, tuple(self.terms)))
 
     def __repr__(self):
         return self.name
@@ -724,7 +826,7 @@ class Sum(Box):
 
     def then(self, *others):
         if len(others) != 1:
-            return super().then(*others)
+            return reduce(lambda f, g: f.then(g), others, self)
         other = others[0] if isinstance(others[0], Sum) else Sum(list(others))
         unit = Sum([], self.dom, other.cod)
         terms = [f.then(g) for f in self.terms for g in other.terms]
@@ -833,6 +935,10 @@ class Functor:
     ar_factory : type, optional
         Class to be used as arrows for the codomain of the functor.
         If None, this will be set to :class:`cat.Arrow`.
+    cache_size : int, optional
+        If given, the images of the objects and boxes met while applying the
+        functor to arrows are kept in a cache with this many entries at most,
+        see :meth:`cache_info`.
 
     Examples
     --------
@@ -860,13 +966,15 @@ class Functor:
     Quiver : For functors from infinitely-generated categories,
              use quivers to create dict-like objects from functions.
     """
-    def __init__(self, ob, ar, ob_factory=None, ar_factory=None):
+    def __init__(self, ob, ar, ob_factory=None, ar_factory=None,
+                 cache_size=None):
         if ob_factory is None:
             ob_factory = Ob
         if ar_factory is None:
             ar_factory = Arrow
         self.ob_factory, self.ar_factory = ob_factory, ar_factory
         self._ob, self._ar = ob, ar
+        self._cache = None if cache_size is None else LRUCache(cache_size)
 
     @property
     def ob(self):
@@ -896,6 +1004,72 @@ class Functor:
     def __repr__(self):
         return "Functor(ob={}, ar={})".format(repr(self.ob), repr(self.ar))
 
+    def then(self, other, cache_size=1024):
+        """
+        The composite of two functors, applying `self` then `other`.
+
+        This is called using the binary operators `>>` and `<<`.
+
+        >>> x, y = Ob('x'), Ob('y')
+        >>> f, g = Box('f', x, y), Box('g', y, x)
+        >>> F = Functor({x: y, y: x}, {f: g, g: f})
+        >>> G = Functor({x: x, y: y}, {f: f >> g >> f, g: g})
+        >>> assert (F >> G)(f >> g) == G(F(f >> g)) == (G << F)(f >> g)
+
+        Parameters
+        ----------
+        other : cat.Functor
+            The functor to apply next.
+        cache_size : int, optional
+            The size of the cache for the images of boxes and objects, use
+            :code:`None` for no cache.
+
+        Returns
+        -------
+        composite : cat.Composite
+            A functor which applies `other` to the image of each box and
+            object under `self`, without building the image of whole arrows.
+        """
+        return self.composite_factory(self, other, cache_size=cache_size)
+
+    def __rshift__(self, other):
+        return self.then(other)
+
+    def __lshift__(self, other):
+        return other.then(self)
+
+    def cache_info(self):
+        """
+        The statistics of the cache of the functor, if it has one.
+
+        >>> x, y = Ob('x'), Ob('y')
+        >>> f = Box('f', x, y)
+        >>> F = Functor({x: y, y: x}, {f: f[::-1]}, cache_size=128)
+        >>> assert F(f >> f[::-1] >> f) == f[::-1] >> f >> f[::-1]
+        >>> F.cache_info()
+        CacheInfo(hits=1, misses=2, maxsize=128, currsize=2)
+        """
+        return None if self._cache is None else self._cache.info()
+
+    def cache_clear(self):
+        """ Empties the cache of the functor, if it has one. """
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _image(self, arrow):
+        """
+        The image of an object or a box, looked up in the cache first.
+
+        Bubbles and sums are not cached, their contents are.
+        """
+        if self._cache is None or isinstance(arrow, (Sum, Bubble)):
+            return self(arrow)
+        key = (type(arrow), arrow)
+        result = self._cache.get(key, MISSING)
+        if result is MISSING:
+            result = self._cache[key] = self(arrow)
+        return result
+
     def __call__(self, arrow):
         if isinstance(arrow, Sum):
             return self.ar_factory.sum(
@@ -910,10 +1084,63 @@ class Functor:
                 return self.ar[arrow.dagger()].dagger()
             return self.ar[arrow]
         if isinstance(arrow, Arrow):
-            return self.ar_factory.id(self(arrow.dom)).then(*map(self, arrow))
+            return self.ar_factory.id(self(arrow.dom)).then(
+                *map(self._image, arrow))
         raise TypeError(messages.type_err(Arrow, arrow))
 
 
+class Composite(Functor):
+    """
+    The composite of two functors, see :meth:`Functor.then`.
+
+    Boxes and objects are sent through both functors, one at a time,
+    then their images are composed in the codomain of the second functor.
+
+    Parameters
+    ----------
+    first : cat.Functor
+        The functor to apply first.
+    second : cat.Functor
+        The functor to apply second.
+    cache_size : int, optional
+        The size of the cache for the images of boxes and objects.
+
+    Examples
+    --------
+    >>> x, y = Ob('x'), Ob('y')
+    >>> f = Box('f', x, y)
+    >>> F = Functor({x: y, y: x}, {f: f[::-1]})
+    >>> G = F >> F
+    >>> assert G(f >> f[::-1] >> f) == f >> f[::-1] >> f
+    >>> G.cache_info()
+    CacheInfo(hits=1, misses=2, maxsize=1024, currsize=2)
+    """
+    def __init__(self, first, second, cache_size=1024):
+        self.first, self.second = first, second
+        super().__init__(
+            ob=self._compose, ar=self._compose,
+            ob_factory=second.ob_factory, ar_factory=second.ar_factory,
+            cache_size=cache_size)
+
+    def _compose(self, arrow):
+        return self.second(self.first(arrow))
+
+    def __eq__(self, other):
+        return isinstance(other, Composite)\
+            and (self.first, self.second) == (other.first, other.second)
+
+    def __repr__(self):
+        return "{} >> {}".format(repr(self.first), repr(self.second))
+
+    def __call__(self, arrow):
+        if isinstance(arrow, (Ob, Box)):
+            return self._compose(arrow)
+        return super().__call__(arrow)
+
+
+Functor.composite_factory = Composite
+
+
 class Quiver(Mapping):
     """
     Wraps a function into an immutable dict-like object, used as input for a
@@ -973,3 +1200,44 @@ class Quiver(Mapping):
         raise TypeError("Quivers have no length, you can't iterate them.")
 
     __iter__ = __len__
+
+
+INTERNED = WeakValueDictionary()
+
+
+def intern(obj):
+    """
+    Returns the canonical object equal to :code:`obj`, i.e. the first one
+    to be interned, so that equal interned objects are the same object.
+
+    Interned objects are only weakly referenced, they are freed as soon as
+    they are not used anymore. Setting :code:`config.INTERN_OBJECTS = True`
+    makes every :class:`discopy.monoidal.Ty` intern its objects.
+
+    Parameters
+    ----------
+    obj : :class:`Ob` or :class:`Box`
+        The object to intern, boxes are assumed to be immutable. Boxes with
+        unhashable data, e.g. arrays, are returned as they are. The objects
+        of a :class:`discopy.monoidal.Ty` are interned in place first.
+
+    Examples
+    --------
+    >>> x = intern(Ob('x'))
+    >>> assert intern(Ob('x')) is x and intern(Ob('y')) is not x
+    >>> f = intern(Box('f', x, x))
+    >>> assert intern(Box('f', Ob('x'), Ob('x'))) is f
+    """
+    if obj._interned:
+        return obj
+    objects = getattr(obj, '_objects', None)
+    if objects is not None:  # Types share interned objects, which are equal.
+        obj._objects = tuple(x if x is obj else intern(x) for x in objects)
+    key = obj._intern_key()
+    if key is None:
+        return obj
+    result = INTERNED.get(key)
+    if result is None:
+        INTERNED[key] = result = obj
+        obj._interned = True
+    return result
@@ -4,6 +4,9 @@
 
 IMPORT_JAX = False
 NUMPY_THRESHOLD = 16
+OPTIMAL_CONTRACTION = 8  # Largest network contracted along an optimal path.
+PLAN_CACHE_SIZE = 1024  # Contraction plans kept in tensor.Plan.cache.
+INTERN_OBJECTS = False  # Whether types intern their objects, see cat.intern.
 IGNORE_WARNINGS = [
     "No GPU/TPU found, falling back to CPU.",
     "Casting complex values to real discards the imaginary part"]
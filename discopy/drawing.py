@@ -182,7 +182,10 @@ def diagram2nx(diagram):
         node = Node("input", obj=obj, i=i)
         add_node(node, (i, len(diagram) or 1))
         scan.append(node)
-    for depth, (box, off) in enumerate(zip(diagram.boxes, diagram.offsets)):
+    columns = diagram.columns
+    for depth, (index, off) in enumerate(zip(
+            columns.indices.tolist(), columns.offsets.tolist())):
+        box = columns.table[index]
         x_pos = make_space(scan, box, off)
         scan = add_box(scan, box, off, depth, x_pos)
     for i, obj in enumerate(diagram.cod):
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+
+"""
+E-graphs of monoidal diagrams, i.e. equality saturation.
+
+An e-graph stores a set of terms built from boxes and identities with
+composition and tensor, together with an equivalence relation between them.
+It is saturated by the axioms of monoidal categories (associativity, unit
+and interchange) and by user-given rewrite rules, until no new equation can
+be derived or some budget runs out. We can then decide whether two diagrams
+are equal or extract the cheapest diagram equivalent to a given one.
+
+Example
+-------
+>>> from discopy.monoidal import Ty, Box, Id
+>>> x = Ty('x')
+>>> f, g, h = Box('f', x, x), Box('g', x, x), Box('h', x, x)
+>>> egraph = EGraph(rules=[(f >> g, h)])
+>>> assert egraph.equal(f @ Id(x) >> g @ Id(x) >> Id(x) @ f, h @ f)
+>>> print(egraph.simplify(f >> g >> f >> g))
+h >> h
+"""
+
+from time import perf_counter
+
+from discopy import messages, monoidal
+from discopy.cat import AxiomError
+
+
+class Cost:
+    """
+    A cost model for extracting diagrams from an e-graph, which counts the
+    number of boxes by default.
+
+    The cost of a term is computed bottom-up from the cost of its subterms.
+    Costs are assumed to be non-negative and monotone, i.e. a term costs at
+    least as much as each of its subterms.
+
+    Example
+    -------
+    >>> from discopy.monoidal import Ty, Box
+    >>> x = Ty('x')
+    >>> cost = Cost()
+    >>> cost.then(cost.box(Box('f', x, x)), cost.id(x), x, x, x)
+    1
+    """
+    def box(self, box):
+        """ The cost of a box. """
+        return 1
+
+    def id(self, dom):
+        """ The cost of an identity. """
+        return 0
+
+    def then(self, left, right, dom, mid, cod):
+        """ The cost of a composition given the cost of its terms. """
+        return left + right
+
+    def tensor(self, left, right, dom, cod):
+        """ The cost of a tensor given the cost of its terms. """
+        return left + right
+
+
+class ContractionCost(Cost):
+    """
+    Estimates the number of operations needed to evaluate a diagram as a
+    tensor network, contracting boxes in the order of the term.
+
+    Parameters
+    ----------
+    ob : dict
+        From objects to dimensions, missing objects have dimension
+        :code:`default`.
+    default : int, optional
+        The dimension of objects missing from :code:`ob`.
+
+    Example
+    -------
+    >>> from discopy.monoidal import Ty, Box
+    >>> x = Ty('x')
+    >>> cost = ContractionCost({x: 2})
+    >>> cost.box(Box('f', x, x @ x))
+    8
+    >>> cost.then(8, 4, x, x @ x, x)
+    28
+    """
+    def __init__(self, ob=None, default=2):
+        self.ob, self.default = ob or {}, default
+
+    def dim(self, ty):
+        """ The dimension of a type. """
+        result = 1
+        for k in range(len(ty)):
+            result *= self.ob.get(ty[k: k + 1], self.default)
+        return result
+
+    def box(self, box):
+        return self.dim(box.dom) * self.dim(box.cod)
+
+    def then(self, left, right, dom, mid, cod):
+        return left + right + self.dim(dom) * self.dim(mid) * self.dim(cod)
+
+    def tensor(self, left, right, dom, cod):
+        return left + right + self.dim(dom) * self.dim(cod)
+
+
+class EGraph:
+    """
+    An e-graph of monoidal diagrams.
+
+    Terms are stored as e-nodes, i.e. tuples :code:`("box", box)`,
+    :code:`("id", ty)`, :code:`("then", i, j)` or :code:`("tensor", i, j)`
+    where :code:`i` and :code:`j` are e-classes, i.e. sets of equal terms
+    identified by integers.
+
+    Parameters
+    ----------
+    rules : list, optional
+        Rewrite rules, either :class:`discopy.rewriting.Rule` or pairs of
+        diagrams :code:`(lhs, rhs)` with the same domain and codomain.
+    max_nodes : int, optional
+        Stop saturating once the e-graph has more e-nodes.
+    timeout : float, optional
+        Stop saturating after this many seconds.
+
+    Raises
+    ------
+    :class:`discopy.cat.AxiomError`
+        If the two sides of a rule have different domain or codomain.
+    TypeError
+        If a diagram is not of the same type as the first one added,
+        i.e. the type of the diagrams we extract.
+
+    Example
+    -------
+    >>> from discopy.monoidal import Ty, Box, Id
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g = Box('f', x, y), Box('g', y, x)
+    >>> egraph = EGraph()
+    >>> left, right = egraph.add(f @ g), egraph.add(Id(x) @ g >> f @ Id(x))
+    >>> egraph.find(left) == egraph.find(right)
+    False
+    >>> egraph.saturate()
+    True
+    >>> egraph.find(left) == egraph.find(right)
+    True
+    >>> assert egraph.extract(right) == f @ g
+    """
+    def __init__(self, rules=(), max_nodes=10000, timeout=None):
+        self.max_nodes, self.timeout = max_nodes, timeout
+        self.parent, self.types, self.memo, self.classes = [], [], {}, {}
+        self.ar = None
+        for rule in rules:
+            lhs, rhs = (rule.lhs, rule.rhs) if hasattr(rule, "lhs") else rule
+            if (lhs.dom, lhs.cod) != (rhs.dom, rhs.cod):
+                raise AxiomError(messages.rule_types_do_not_match(lhs, rhs))
+            self.union(self.add(lhs), self.add(rhs))
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.memo)
+
+    def find(self, i):
+        """ The canonical e-class of :code:`i`. """
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = i = parent[parent[i]]
+        return i
+
+    def canonical(self, node):
+        """ An e-node with canonical e-classes as arguments. """
+        if node[0] in ("then", "tensor"):
+            return node[0], self.find(node[1]), self.find(node[2])
+        return node
+
+    def add_node(self, node):
+        """ Adds an e-node to the e-graph and returns its e-class. """
+        node = self.canonical(node)
+        if node in self.memo:
+            return self.find(self.memo[node])
+        op, *args = node
+        if op == "box":
+            dom, cod = args[0].dom, args[0].cod
+        elif op == "id":
+            dom = cod = args[0]
+        elif op == "then":
+            dom, cod = self.types[args[0]][0], self.types[args[1]][1]
+        else:
+            (dom0, cod0), (dom1, cod1) = (self.types[i] for i in args)
+            dom, cod = dom0 @ dom1, cod0 @ cod1
+        i = len(self.parent)
+        self.parent.append(i)
+        self.types.append((dom, cod))
+        self.memo[node], self.classes[i] = i, {node}
+        if op == "id":
+            for k in range(1, len(dom)):
+                self.union(i, self.add_node(("tensor", *(
+                    self.add_node(("id", ty)) for ty in (dom[:k], dom[k:])))))
+        return i
+
+    def add(self, diagram):
+        """ Adds a diagram to the e-graph and returns its e-class. """
+        ar = next(
+            cls for cls in type(diagram).__mro__ if "upgrade" in vars(cls))
+        if self.ar is None:
+            self.ar = ar
+        elif ar is not self.ar:
+            raise TypeError(messages.type_err(self.ar, diagram))
+        result = self.add_node(("id", diagram.dom))
+        for left, box, right in diagram.layers:
+            layer = self.add_node(("box", box))
+            if left:
+                layer = self.add_node(
+                    ("tensor", self.add_node(("id", left)), layer))
+            if right:
+                layer = self.add_node(
+                    ("tensor", layer, self.add_node(("id", right))))
+            result = self.add_node(("then", result, layer))
+        return result
+
+    def union(self, i, j):
+        """ Merges two e-classes, returns whether they were distinct. """
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        if len(self.classes[i]) < len(self.classes[j]):
+            i, j = j, i
+        self.parent[j] = i
+        self.classes[i] |= self.classes.pop(j)
+        return True
+
+    def rebuild(self):
+        """ Restores congruence, i.e. merges e-classes with equal e-nodes. """
+        changed = True
+        while changed:
+            changed, memo = False, {}
+            for node, i in self.memo.items():
+                node, i = self.canonical(node), self.find(i)
+                if node in memo and self.union(memo[node], i):
+                    changed = True
+                memo[node] = self.find(i)
+            self.memo = memo
+        self.classes = {}
+        for node, i in self.memo.items():
+            self.classes.setdefault(self.find(i), set()).add(node)
+
+    def matches(self):
+        """ Yields pairs of terms equal by the monoidal axioms. """
+        classes, types = self.classes, self.types
+
+        def nodes(i, op):
+            return [node for node in classes[self.find(i)] if node[0] == op]
+        for i, i_nodes in list(classes.items()):
+            # Every term is a tensor with the unit, so that it interchanges.
+            unit = ("id", type(types[i][0])())
+            yield i, ("tensor", unit, i)
+            yield i, ("tensor", i, unit)
+            for op, j, k in [node for node in i_nodes if len(node) == 3]:
+                # Unit laws.
+                for unit, other in [(j, k), (k, j)]:
+                    if any(node[0] == "id" for node in classes[self.find(
+                            unit)]) and (op == "then" or not types[unit][0]):
+                        yield i, other
+                # Associativity.
+                for _, a, b in nodes(j, op):
+                    yield i, (op, a, (op, b, k))
+                for _, b, c in nodes(k, op):
+                    yield i, (op, (op, j, b), c)
+                # Interchange.
+                if op == "then":
+                    for _, a, b in nodes(j, "tensor"):
+                        for _, c, d in nodes(k, "tensor"):
+                            if types[a][1] == types[c][0]:
+                                yield i, ("tensor", ("then", a, c),
+                                          ("then", b, d))
+
+    def add_term(self, term):
+        """ Adds a term, i.e. a nested e-node, returns its e-class. """
+        if isinstance(term, int):
+            return term
+        op, *args = term
+        if op in ("then", "tensor"):
+            args = [self.add_term(arg) for arg in args]
+        return self.add_node((op, *args))
+
+    def saturate(self, max_nodes=None, timeout=None, max_iter=None):
+        """
+        Applies the axioms and the rules until no new equation is derived.
+
+        Parameters
+        ----------
+        max_nodes : int, optional
+            Overrides the maximum number of e-nodes of the e-graph.
+        timeout : float, optional
+            Overrides the maximum time in seconds.
+        max_iter : int, optional
+            The maximum number of iterations.
+
+        Returns
+        -------
+        saturated : bool
+            Whether the e-graph is saturated, i.e. the budget was enough.
+        """
+        max_nodes = self.max_nodes if max_nodes is None else max_nodes
+        timeout = self.timeout if timeout is None else timeout
+        start, iteration = perf_counter(), 0
+        while max_iter is None or iteration < max_iter:
+            iteration, size = iteration + 1, len(self)
+            changed = False
+            for i, term in list(self.matches()):
+                if self.union(i, self.add_term(term)):
+                    changed = True
+                if len(self) > max_nodes or timeout is not None\
+                        and perf_counter() - start > timeout:
+                    self.rebuild()
+                    return False
+            self.rebuild()
+            if not changed and len(self) == size:
+                return True
+        return False
+
+    def equal(self, left, right, **params):
+        """
+        Whether two diagrams are equal in the saturated e-graph.
+
+        Note
+        ----
+        A negative answer only means the diagrams could not be proved equal
+        within the budget, see :meth:`saturate`.
+        """
+        i, j = self.add(left), self.add(right)
+        self.rebuild()
+        if self.find(i) == self.find(j):
+            return True
+        self.saturate(**params)
+        return self.find(i) == self.find(j)
+
+    def extract(self, i, cost=None):
+        """
+        Extracts a diagram of minimum cost from an e-class.
+
+        Parameters
+        ----------
+        i : int
+            The e-class.
+        cost : :class:`Cost`, optional
+            The cost model, counts the number of boxes by default.
+        """
+        cost = cost or Cost()
+        best, changed = {}, True
+        while changed:
+            changed = False
+            for j, nodes in self.classes.items():
+                for node in nodes:
+                    value = self._cost(node, best, cost)
+                    if value is not None and (j not in best or value < best[
+                            j][:2]):
+                        best[j], changed = value + (node, ), True
+
+        def build(j):
+            op, *args = best[self.find(j)][2]
+            if op == "box":
+                return args[0]
+            if op == "id":
+                return monoidal.Id(args[0])
+            left, right = map(build, args)
+            return left.then(right) if op == "then" else left.tensor(right)
+        return self.ar.upgrade(build(i))
+
+    def _cost(self, node, best, cost):
+        op, *args = node
+        if op == "box":
+            return cost.box(args[0]), 1
+        if op == "id":
+            return cost.id(args[0]), 1
+        args = [self.find(j) for j in args]
+        if any(j not in best for j in args):
+            return None
+        (left, left_size, _), (right, right_size, _) = (best[j] for j in args)
+        (dom0, cod0), (dom1, cod1) = (self.types[j] for j in args)
+        value = cost.then(left, right, dom0, cod0, cod1) if op == "then"\
+            else cost.tensor(left, right, dom0 @ dom1, cod0 @ cod1)
+        return value, left_size + right_size + 1
+
+    def simplify(self, diagram, cost=None, **params):
+        """
+        Saturates the e-graph with a diagram and extracts the cheapest
+        equivalent diagram, see :meth:`saturate` and :meth:`extract`.
+        """
+        i = self.add(diagram)
+        self.saturate(**params)
+        return self.extract(i, cost)
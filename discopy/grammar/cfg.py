@@ -27,7 +27,7 @@ Jane >> loves @ Id(N) >> Jane @ Id(V @ N) >> R1 @ Id(N) >> R0
 import random
 
 from discopy import messages
-from discopy.monoidal import Ty, Box, Id
+from discopy.monoidal import Ty, Box, Diagram
 
 
 class Word(Box):
@@ -107,11 +107,16 @@ class CFG:
         n_sentences, i = 1, 0
         while n_sentences <= (max_sentences or n_sentences) and i < max_iter:
             i += 1
-            sentence = Id(start)
+            # Productions are prepended at offset zero, so we only keep
+            # track of the domain and build the sentence once at the end.
+            scan, boxes = list(start), []
             depth = 0
             while depth < max_depth:
                 recall = depth
-                if sentence.dom == Ty():
+                if not scan:
+                    sentence = Diagram(
+                        Ty(), start, boxes[::-1], len(boxes) * [0],
+                        _scan=False)
                     if remove_duplicates and sentence in cache:
                         break
                     yield sentence
@@ -119,13 +124,14 @@ class CFG:
                         cache.add(sentence)
                     n_sentences += 1
                     break
-                tag = sentence.dom[0]
+                tag = scan[0]
                 random.shuffle(prods)
                 for prod in prods:
-                    if prod in (not_twice or []) and prod in sentence.boxes:
+                    if prod in (not_twice or []) and prod in boxes:
                         continue
                     if Ty(tag) == prod.cod:
-                        sentence = sentence << prod @ Id(sentence.dom[1:])
+                        scan[:1] = prod.dom
+                        boxes.append(prod)
                         depth += 1
                         break
                 if recall == depth:  # in this case, no production was found
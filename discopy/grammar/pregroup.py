@@ -22,7 +22,7 @@ Implements pregroup grammars and distributional compositional models.
     :align: center
 """
 
-from discopy import messages, drawing, rewriting, monoidal
+from discopy import messages, drawing, rewriting
 from discopy.grammar import cfg
 from discopy.rigid import Ty, Box, Diagram, Id, Cup, Cap, Swap
 
@@ -82,8 +82,7 @@ def normal_form(diagram, normalizer=None, **params):
     if not is_pregroup:
         raise ValueError(messages.expected_pregroup())
 
-    norm = lambda d: monoidal.Diagram.normal_form(
-        d, normalizer=normalizer or Diagram.normalize, **params)
+    norm = lambda d: d.normal_form(normalizer=normalizer, **params)
 
     return norm(words) >> norm(wires)
 
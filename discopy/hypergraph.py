@@ -105,8 +105,10 @@ We can also check that the axioms for symmetry hold on the nose.
 
 import random
 
+import numpy
+
 import matplotlib.pyplot as plt
-from networkx import Graph, connected_components, spring_layout, draw_networkx
+from networkx import Graph, spring_layout, draw_networkx
 
 from discopy import cat, monoidal, rigid, drawing
 from discopy.cat import AxiomError
@@ -115,7 +117,7 @@ from discopy.drawing import Node
 
 def pushout(left, right, left_boundary, right_boundary):
     """
-    Computes the pushout of two finite mappings using connected components.
+    Computes the pushout of two finite mappings using union-find.
 
     Parameters
     ----------
@@ -140,26 +142,237 @@ def pushout(left, right, left_boundary, right_boundary):
     """
     if len(left_boundary) != len(right_boundary):
         raise ValueError
-    components, left_pushout, right_pushout = set(), dict(), dict()
+    # Union-find on the disjoint union of left and right.
+    parent = list(range(left + right))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = i = parent[parent[i]]
+        return i
+    for i, j in zip(left_boundary, right_boundary):
+        parent[find(i)] = find(left + j)
     left_proper = sorted(set(range(left)) - set(left_boundary))
-    left_pushout.update({j: i for i, j in enumerate(left_proper)})
-    graph = Graph([
-        (("middle", i), ("left", j)) for i, j in enumerate(left_boundary)] + [
-        (("middle", i), ("right", j)) for i, j in enumerate(right_boundary)])
-    for i, component in enumerate(connected_components(graph)):
-        components.add(i)
-        for case, j in component:
-            if case == "left":
-                left_pushout[j] = len(left_proper) + i
-            if case == "right":
-                right_pushout[j] = len(left_proper) + i
-    right_proper = set(range(right)) - set(right_boundary)
+    left_pushout = {j: i for i, j in enumerate(left_proper)}
+    components = {}
+    for j in left_boundary:
+        components.setdefault(find(j), len(left_proper) + len(components))
+    left_pushout.update({j: components[find(j)] for j in left_boundary})
+    right_pushout = {j: components[find(left + j)] for j in right_boundary}
+    right_proper = sorted(set(range(right)) - set(right_boundary))
     right_pushout.update({
         j: len(left_proper) + len(components) + i
         for i, j in enumerate(right_proper)})
     return left_pushout, right_pushout
 
 
+def _refine(adjacency, elements, position, cell, end, queue):
+    """
+    Refines an ordered partition in place until it is equitable, i.e. each
+    cell has the same number of neighbours in each other cell, for each edge
+    label. Only the neighbours of the cells in the queue are looked at, and
+    only for the smaller parts of each split.
+    """
+    queued = set(queue)
+    while queue:
+        splitter = queue.pop()
+        queued.discard(splitter)
+        signatures = {}
+        for x in elements[splitter: end[splitter]]:
+            for y, label in adjacency[x]:
+                signatures.setdefault(y, []).append(label)
+        touched = {}
+        for y in signatures:
+            touched.setdefault(cell[y], []).append(y)
+        for start, members in sorted(touched.items()):
+            stop = end[start]
+            signature = {x: tuple(sorted(signatures[x])) for x in members}
+            if len(set(signature.values())) == 1 and (
+                    len(members) == stop - start):
+                continue
+            # Move the touched members to the end of the cell, sorted by
+            # signature, the others have an empty signature.
+            members.sort(key=signature.__getitem__)
+            tail, moved = stop - len(members), set(members)
+            slots = [position[x] for x in members if position[x] < tail]
+            for i, y in zip(slots, [
+                    y for y in elements[tail: stop] if y not in moved]):
+                elements[i], position[y] = y, i
+            fragments = [start] if tail > start else []
+            for k, x in enumerate(members):
+                if not k or signature[x] != signature[members[k - 1]]:
+                    if fragments:
+                        end[fragments[-1]] = tail + k
+                    fragments.append(tail + k)
+                elements[tail + k], position[x] = x, tail + k
+                cell[x] = fragments[-1]
+            end[fragments[-1]] = stop
+            # If the cell is not queued, its largest fragment need not be.
+            if start not in queued:
+                fragments.remove(max(fragments, key=lambda i: end[i] - i))
+            for i in fragments:
+                if i not in queued:
+                    queue.append(i)
+                    queued.add(i)
+
+
+def _class_keys(items, digest=hash):
+    """
+    Sortable keys such that equal items get equal keys, i.e. their digest and
+    when unequal items have the same digest, the rank of their smallest repr.
+    """
+    buckets, keys = {}, {}
+    for item in items:
+        bucket = buckets.setdefault(digest(item), [])
+        for members in bucket:
+            if members[0] == item:
+                members.append(item)
+                break
+        else:
+            bucket.append([item])
+    for key, bucket in buckets.items():
+        if len(bucket) > 1:
+            bucket.sort(key=lambda members: min(map(repr, members)))
+        for rank, members in enumerate(bucket):
+            keys.update({id(item): (key, rank) for item in members})
+    return [keys[id(item)] for item in items]
+
+
+def canonical_labelling(keys, adjacency):
+    """
+    Computes a canonical ordering of the vertices of a labelled graph by
+    individualisation-refinement.
+
+    Vertices are sorted by their keys into an ordered partition, which is
+    refined by colour refinement, i.e. the Weisfeiler-Leman algorithm. When
+    some cell has more than one vertex, each of its vertices is put in a
+    cell on its own in turn and the search goes on from the refined
+    partition. The canonical ordering is the one for which the relabelled
+    graph is lexicographically smallest. The automorphisms found along the
+    way prune the vertices in the same orbit as some vertex already tried.
+
+    Parameters
+    ----------
+    keys : List[Any]
+        The initial key of each vertex, they must be sortable.
+    adjacency : List[List[Tuple[int, Any]]]
+        The neighbours of each vertex with the label of the edge, labels
+        must be sortable.
+
+    Returns
+    -------
+    position : List[int]
+        The position of each vertex in the canonical order.
+
+    Note
+    ----
+    The search takes exponential time in the worst case, e.g. for some
+    strongly regular graphs, but a polynomial number of steps in practice.
+
+    Examples
+    --------
+    >>> path = [[(1, 0)], [(0, 0), (2, 0)], [(1, 0)]]
+    >>> canonical_labelling(["end", "middle", "end"], path)
+    [0, 2, 1]
+    >>> cycle = [[(1, 0), (2, 0)], [(0, 0), (2, 0)], [(0, 0), (1, 0)]]
+    >>> canonical_labelling(3 * ["vertex"], cycle)
+    [0, 1, 2]
+    """
+    n_vertices = len(keys)
+    elements = sorted(range(n_vertices), key=keys.__getitem__)
+    position, cell, end = n_vertices * [0], n_vertices * [0], {}
+    for i, x in enumerate(elements):
+        position[x] = i
+        same = i and keys[elements[i - 1]] == keys[x]
+        cell[x] = cell[elements[i - 1]] if same else i
+        end[cell[x]] = i + 1
+    _refine(adjacency, elements, position, cell, end, sorted(end))
+    best, automorphisms = None, []
+
+    # Refinement only splits cells, so the keys in the order of a discrete
+    # partition are the same for every leaf. Leaves are compared by the
+    # neighbours of their vertices in order, computed only up to the first
+    # difference, the rows of the best leaf and the first one are kept.
+    def row(leaf, i):
+        position, elements, _, rows = leaf
+        while len(rows) <= i:
+            rows.append(sorted((position[y], label) for y, label in adjacency[
+                elements[len(rows)]]))
+        return rows[i]
+
+    def compare(leaf, other):
+        for i in range(n_vertices):
+            if row(leaf, i) != row(other, i):
+                return -1 if row(leaf, i) < row(other, i) else 1
+        return 0
+
+    def find(parent, i):
+        while parent[i] != i:
+            parent[i] = i = parent[parent[i]]
+        return i
+
+    # Depth-first search, each frame is a partition with the individualised
+    # vertices, the vertices left to try, the orbits already tried and the
+    # union-find of orbits under the automorphisms which fix the vertices.
+    stack = [[(elements, position, cell, end), [], None, set(), None, 0]]
+    while stack:
+        frame = stack[-1]
+        (elements, position, cell, end), fixed, todo, tried, parent, _ = frame
+        if todo is None:
+            first = min((i for i in end if end[i] - i > 1), default=None)
+            if first is None:
+                stack.pop()
+                leaf = position, elements, fixed, []
+                if best is None:
+                    best = reference = leaf
+                elif compare(leaf, best) < 0:
+                    best = leaf
+                for other in (reference, best):
+                    if other is leaf or compare(leaf, other):
+                        continue
+                    automorphism = {
+                        x: y for x, y in zip(other[1], elements) if x != y}
+                    automorphisms.append(automorphism)
+                    # If the automorphism sends the path to the other leaf
+                    # onto this path, the subtree where they diverge is the
+                    # image of one already searched.
+                    depth = 0
+                    while other[2][depth] == fixed[depth]:
+                        depth += 1
+                    if all(automorphism.get(x, x) == y
+                           for x, y in zip(other[2], fixed)):
+                        del stack[depth + 1:]
+                    break
+                continue
+            todo = frame[2] = elements[first: end[first]][::-1]
+            parent = frame[4] = list(range(n_vertices))
+        if not todo:
+            stack.pop()
+            continue
+        for automorphism in automorphisms[frame[5]:]:
+            if not any(x in automorphism for x in fixed):
+                for x, y in automorphism.items():
+                    parent[find(parent, x)] = find(parent, y)
+        frame[5] = len(automorphisms)
+        y = todo.pop()
+        orbit = find(parent, y)
+        if orbit in tried:
+            continue
+        tried.add(orbit)
+        first = cell[y]
+        elements, position, cell, end = (
+            list(elements), list(position), list(cell), dict(end))
+        i = position[y]
+        elements[i], elements[first] = elements[first], y
+        position[elements[i]], position[y] = i, first
+        for z in elements[first + 1: end[first]]:
+            cell[z] = first + 1
+        end[first + 1], end[first] = end[first], first + 1
+        _refine(adjacency, elements, position, cell, end, [first, first + 1])
+        partition = elements, position, cell, end
+        stack.append([partition, fixed + [y], None, set(), None, 0])
+    return best[0]
+
+
 class Ty(rigid.Ty):
     """ Self-dual types in a hypergraph diagram. """
     @staticmethod
@@ -253,8 +466,8 @@ class Diagram(cat.Arrow):
                 + sum(len(box.dom) + len(box.cod) for box in boxes) + len(cod):
             raise ValueError
         if spider_types is None:
-            port_types = list(map(Ty, self.dom)) + sum(
-                [list(map(Ty, box.dom @ box.cod)) for box in boxes], [])\
+            port_types = list(map(Ty, self.dom)) + [
+                Ty(obj) for box in boxes for obj in box.dom @ box.cod]\
                 + list(map(Ty, self.cod))
             spider_types = {}
             for spider, typ in zip(wires, port_types):
@@ -264,8 +477,9 @@ class Diagram(cat.Arrow):
                 else:
                     spider_types[spider] = typ
             spider_types = [spider_types[i] for i in sorted(spider_types)]
-        relabeling = list(sorted(set(wires), key=lambda i: wires.index(i)))
-        wires = [relabeling.index(spider) for spider in wires]
+        relabeling = list(dict.fromkeys(wires))
+        index = {spider: i for i, spider in enumerate(relabeling)}
+        wires = [index[spider] for spider in wires]
         spider_types = {i: t for i, t in enumerate(spider_types)}\
             if isinstance(spider_types, list) else spider_types
         relabeling += list(sorted(set(spider_types) - set(relabeling)))
@@ -339,44 +553,77 @@ class Diagram(cat.Arrow):
         """ The zero-legged spiders in a hypergraph diagram. """
         return [i for i in range(self.n_spiders) if not self.wires.count(i)]
 
-    def then(self, other):
+    def then(self, *others):
         """
-        Composition of two hypergraph diagrams, i.e. their :func:`pushout`.
+        Composition of hypergraph diagrams, i.e. their :func:`pushout`.
+
+        Any number of diagrams are composed at once, gluing all their
+        spiders with one union-find, in time linear in their total size.
+
+        Examples
+        --------
+        >>> x = Ty('x')
+        >>> split, merge = Spider(1, 2, x), Spider(2, 1, x)
+        >>> assert split.then(merge, split, merge) == Id(x)
         """
-        if not self.cod == other.dom:
-            raise AxiomError
-        dom, cod, boxes = self.dom, other.cod, self.boxes + other.boxes
-        self_boundary = self.wires[len(self.wires) - len(self.cod):]
-        other_boundary = other.wires[:len(other.dom)]
-        self_pushout, other_pushout = pushout(
-            self.n_spiders, other.n_spiders, self_boundary, other_boundary)
-        wires = [
-            self_pushout[i] for i in self.wires[
-                :len(self.wires) - len(self.cod)]]\
-            + [other_pushout[i] for i in other.wires[len(other.dom):]]
+        diagrams = (self, ) + others
+        for left, right in zip(diagrams, others):
+            if not left.cod == right.dom:
+                raise AxiomError
+        offsets = [0]
+        for diagram in diagrams:
+            offsets.append(offsets[-1] + diagram.n_spiders)
+        parent = list(range(offsets[-1]))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = i = parent[parent[i]]
+            return i
+        for k, (left, right) in enumerate(zip(diagrams, others)):
+            for i, j in zip(left.wires[len(left.wires) - len(left.cod):],
+                            right.wires[:len(right.dom)]):
+                i, j = find(offsets[k] + i), find(offsets[k + 1] + j)
+                parent[max(i, j)] = min(i, j)
+        wires = [find(i) for i in self.wires[:len(self.dom)]]
+        for k, diagram in enumerate(diagrams):
+            wires += [find(offsets[k] + i) for i in diagram.wires[
+                len(diagram.dom):len(diagram.wires) - len(diagram.cod)]]
+        last = diagrams[-1]
+        wires += [find(offsets[-2] + i)
+                  for i in last.wires[len(last.wires) - len(last.cod):]]
         spider_types = {
-            self_pushout[i]: t for i, t in enumerate(self.spider_types)}
-        spider_types.update({
-            other_pushout[i]: t for i, t in enumerate(other.spider_types)})
-        return Diagram(dom, cod, boxes, wires, spider_types)
+            find(offsets[k] + i): typ for k, diagram in enumerate(diagrams)
+            for i, typ in enumerate(diagram.spider_types)}
+        boxes = [box for diagram in diagrams for box in diagram.boxes]
+        return Diagram(self.dom, last.cod, boxes, wires, spider_types)
 
     def tensor(self, other=None, *rest):
-        """ Tensor of two hypergraph diagrams, i.e. their disjoint union. """
-        if other is None or rest:
-            return monoidal.Diagram.tensor(self, other, *rest)
-        dom, cod = self.dom @ other.dom, self.cod @ other.cod
-        boxes = self.boxes + other.boxes
-        dom_wires = self.wires[:len(self.dom)] + [
-            self.n_spiders + i for i in other.wires[:len(other.dom)]]
-        box_wires = self.wires[len(self.dom):-len(self.cod) or len(self.wires)]
-        box_wires += [self.n_spiders + i for i in other.wires[
-            len(other.dom):-len(other.cod) or len(other.wires)]]
-        cod_wires = self.wires[len(self.wires) - len(self.cod):] + [
-            self.n_spiders + i
-            for i in other.wires[len(other.wires) - len(other.cod):]]
-        wires = dom_wires + box_wires + cod_wires
-        spiders = self.spider_types + other.spider_types
-        return Diagram(dom, cod, boxes, wires, spiders)
+        """
+        Tensor of hypergraph diagrams, i.e. their disjoint union.
+
+        Any number of diagrams are tensored at once, in time linear in their
+        total size.
+        """
+        if other is None:
+            return self
+        diagrams = (self, other) + rest
+        offsets = [0]
+        for diagram in diagrams:
+            offsets.append(offsets[-1] + diagram.n_spiders)
+        dom_wires, box_wires, cod_wires = [], [], []
+        for diagram, offset in zip(diagrams, offsets):
+            n_dom, n_wires = len(diagram.dom), len(diagram.wires)
+            n_cod = n_wires - len(diagram.cod)
+            dom_wires += [offset + i for i in diagram.wires[:n_dom]]
+            box_wires += [offset + i for i in diagram.wires[n_dom:n_cod]]
+            cod_wires += [offset + i for i in diagram.wires[n_cod:]]
+        dom = self.dom.tensor(*(diagram.dom for diagram in diagrams[1:]))
+        cod = self.cod.tensor(*(diagram.cod for diagram in diagrams[1:]))
+        boxes = [box for diagram in diagrams for box in diagram.boxes]
+        spider_types = [
+            typ for diagram in diagrams for typ in diagram.spider_types]
+        return Diagram(
+            dom, cod, boxes, dom_wires + box_wires + cod_wires, spider_types)
 
     __matmul__ = tensor
 
@@ -394,9 +641,9 @@ class Diagram(cat.Arrow):
         dom, cod = self.cod, self.dom
         boxes = [box.dagger() for box in self.boxes[::-1]]
         dom_wires = self.wires[len(self.wires) - len(self.cod):]
-        box_wires = sum([
-            cod_wires + dom_wires
-            for dom_wires, cod_wires in self.box_wires[::-1]], [])
+        box_wires = [
+            spider for dom_wires, cod_wires in self.box_wires[::-1]
+            for spider in cod_wires + dom_wires]
         cod_wires = self.wires[:len(self.dom)]
         wires = dom_wires + box_wires + cod_wires
         return Diagram(dom, cod, boxes, wires, self.spider_types)
@@ -409,8 +656,81 @@ class Diagram(cat.Arrow):
     def __eq__(self, other):
         if not isinstance(other, Diagram):
             return False
-        return all(getattr(self, attr) == getattr(other, attr)
-                   for attr in ['dom', 'cod', 'boxes', 'wires', 'n_spiders'])
+        attributes = ['dom', 'cod', 'boxes', 'wires', 'spider_types']
+        if all(getattr(self, attr) == getattr(other, attr)
+               for attr in attributes):
+            return True
+        if (self.dom, self.cod, len(self.boxes), self.n_spiders) != (
+                other.dom, other.cod, len(other.boxes), other.n_spiders):
+            return False
+        left, right = self.canonical_form(), other.canonical_form()
+        return all(getattr(left, attr) == getattr(right, attr)
+                   for attr in attributes)
+
+    def __hash__(self):
+        if getattr(self, "_canonical_hash", None) is None:
+            canonical = self.canonical_form()
+            boxes = tuple(map(cat.Box.__hash__, canonical.boxes))
+            self._canonical_hash = hash((
+                self.dom, self.cod, boxes,
+                tuple(canonical.wires), tuple(canonical.spider_types)))
+        return self._canonical_hash
+
+    def canonical_form(self):
+        """
+        A canonical representative of the diagram up to reordering of the
+        boxes and relabelling of the spiders.
+
+        Spiders and boxes are first coloured by their types and boundary
+        ports, then by the colours of their neighbours until the colouring
+        is stable, ties are broken by a search, see
+        :func:`canonical_labelling`. Two diagrams are equal if and only if
+        they have the same canonical form.
+
+        Examples
+        --------
+        >>> x, y = types('x y')
+        >>> f, g = Box('f', x, y), Box('g', y, x)
+        >>> left, right = f @ g, Swap(x, y) >> g @ f >> Swap(x, y)
+        >>> assert left.boxes != right.boxes and left == right
+        >>> assert left.canonical_form().boxes == right.canonical_form().boxes
+        >>> assert hash(left) == hash(right) and len({left, right}) == 1
+        >>> assert f @ f != f @ f >> Swap(y, y)
+        """
+        if getattr(self, "_canonical_form", None) is not None:
+            return self._canonical_form
+        n_spiders, n_boxes, n_dom = self.n_spiders, len(self.boxes), len(
+            self.dom)
+        box_wires = self.box_wires
+        boundary = [[] for _ in range(n_spiders)]
+        for port, spider in enumerate(self.wires[:n_dom]):
+            boundary[spider].append(port)
+        for port, spider in enumerate(
+                self.wires[len(self.wires) - len(self.cod):]):
+            boundary[spider].append(n_dom + port)
+        keys = [(0, typ, tuple(ports)) for typ, ports in zip(
+            _class_keys(self.spider_types), boundary)]
+        keys += [(1, box) for box in _class_keys(self.boxes, cat.Box.__hash__)]
+        adjacency = [[] for _ in keys]
+        for i, (dom_wires, cod_wires) in enumerate(box_wires):
+            for kind, wires in enumerate([dom_wires, cod_wires]):
+                for port, spider in enumerate(wires):
+                    adjacency[spider].append((n_spiders + i, (kind, port)))
+                    adjacency[n_spiders + i].append((spider, (kind, port)))
+        position = canonical_labelling(keys, adjacency)
+        spiders, boxes = position[:n_spiders], position[n_spiders:]
+        order = sorted(range(n_boxes), key=boxes.__getitem__)
+        wires = self.wires[:n_dom] + [
+            spider for i in order for spider in box_wires[i][0] + box_wires[
+                i][1]] + self.wires[len(self.wires) - len(self.cod):]
+        wires = [spiders[spider] for spider in wires]
+        spider_types = {
+            spiders[i]: typ for i, typ in enumerate(self.spider_types)}
+        self._canonical_form = Diagram(
+            self.dom, self.cod, [self._boxes[i] for i in order], wires,
+            spider_types)
+        self._canonical_form._canonical_form = self._canonical_form
+        return self._canonical_form
 
     def __repr__(self):
         data = list(map(repr, [self.dom, self.cod, self.boxes, self.wires]))
@@ -539,7 +859,7 @@ class Diagram(cat.Arrow):
         >>> assert spider.wires == [0, 0, 1, 2, 1, 2]
         """
         boxes, wires, spider_types =\
-            self.boxes.copy(), self.wires.copy(), self.spider_types.copy()
+            list(self.boxes), self.wires.copy(), self.spider_types.copy()
         for i, typ in reversed(list(enumerate(self.spider_types))):
             ports = [port for port, spider in enumerate(wires) if spider == i]
             n_legs = len(ports)
@@ -696,6 +1016,64 @@ class Diagram(cat.Arrow):
             ar=lambda box: Box(box.name, box.dom, box.cod),
             ob_factory=Ty, ar_factory=Diagram)(old)
 
+    def eval(self, functor):
+        """
+        Evaluation of a hypergraph diagram as a tensor network.
+
+        Each spider is sent to an index shared by all the boxes it
+        connects, so that no swaps, cups or caps are ever built. Spiders
+        with more than two legs are contracted as hyperedges, the network
+        is contracted with a cached :class:`discopy.tensor.Plan`. Boxes are
+        sent through the functor, using its cache if it has one.
+
+        Parameters
+        ----------
+        functor : discopy.tensor.Functor
+            From types to dimensions and from boxes to arrays.
+
+        Returns
+        -------
+        tensor : discopy.tensor.Tensor
+            The contraction of the network, along a planned path.
+
+        Examples
+        --------
+        >>> from discopy.tensor import Functor
+        >>> x = Ty('x')
+        >>> v, m = Box('v', Ty(), x), Box('m', x, x)
+        >>> F = Functor({x: 2}, {v: [0, 1], m: [[0, 1], [1, 0]]})
+        >>> (v >> m).eval(F)
+        Tensor(dom=Dim(1), cod=Dim(2), array=[1, 0])
+        >>> (v >> Spider(1, 2, x)).eval(F)
+        Tensor(dom=Dim(1), cod=Dim(2, 2), array=[0., 0., 0., 1.])
+        >>> Spider(2, 1, x).eval(F)  # doctest: +ELLIPSIS
+        Tensor(dom=Dim(2, 2), cod=Dim(2), array=[1., 0., ..., 0., 1.])
+        >>> assert (Cap(x, x) >> Cup(x, x)).eval(F) == 2
+        """
+        from discopy.tensor import Tensor, Plan
+        dims = [tuple(functor(typ)) for typ in self.spider_types]
+        labels, sizes = [], {}
+        for dim in dims:
+            labels.append(list(range(len(sizes), len(sizes) + len(dim))))
+            sizes.update(zip(labels[-1], dim))
+        arrays, inputs = [], []
+        for box, (dom_wires, cod_wires) in zip(self.boxes, self.box_wires):
+            arrays.append(functor._image(box).array)
+            inputs.append([
+                label for spider in dom_wires + cod_wires
+                for label in labels[spider]])
+        boundary = self.wires[:len(self.dom)]\
+            + self.wires[len(self.wires) - len(self.cod):]
+        inside = set(self.wires[len(self.dom):len(self.wires) - len(self.cod)])
+        for spider in set(boundary) - inside:
+            if boundary.count(spider) == 1:
+                for n, label in zip(dims[spider], labels[spider]):
+                    arrays.append(Tensor.np.ones(n, dtype=int))
+                    inputs.append([label])
+        output = [label for spider in boundary for label in labels[spider]]
+        array = Plan.cached(inputs, output, sizes)(arrays)
+        return Tensor(functor(self.dom), functor(self.cod), array)
+
     def spring_layout(self, seed=None, k=None):
         """ Computes planar position using a force-directed layout. """
         if seed is not None:
@@ -806,6 +1184,8 @@ class Box(cat.Box, Diagram):
             return cat.Box.__eq__(self, other)
         return Diagram.__eq__(self, other)
 
+    __hash__ = Diagram.__hash__
+
 
 class Id(Diagram):
     """ Identity diagram. """
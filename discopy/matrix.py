@@ -31,6 +31,8 @@ array([[2, 0],
 
 """
 
+from functools import reduce
+
 from discopy import messages, monoidal
 from discopy.cat import AxiomError
 from discopy.monoidal import PRO
@@ -85,7 +87,9 @@ class Matrix(monoidal.Box):
 
     def then(self, *others):
         from discopy import Sum
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if len(others) != 1:
+            return reduce(lambda f, g: f.then(g), others, self)
+        if isinstance(others[0], Sum):
             return monoidal.Diagram.then(self, *others)
         other, = others
         if not isinstance(other, Matrix):
@@ -97,7 +101,9 @@ class Matrix(monoidal.Box):
 
     def tensor(self, *others):
         from discopy import Sum
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if len(others) != 1:
+            return reduce(lambda f, g: f.tensor(g), others, self)
+        if isinstance(others[0], Sum):
             return monoidal.Diagram.tensor(self, *others)
         other = others[0]
         if not isinstance(other, Matrix):
@@ -29,6 +29,18 @@ def is_not_connected(diagram):
     return "{} is not connected.".format(str(diagram))
 
 
+def rule_types_do_not_match(lhs, rhs):
+    """ Rewrite rule error. """
+    return "Cannot rewrite {} to {}: dom={}, cod={} vs dom={}, cod={}.".format(
+        lhs, rhs, lhs.dom, lhs.cod, rhs.dom, rhs.cod)
+
+
+def is_not_a_permutation(permutation, diagram):
+    """ Reordering error. """
+    return "{} is not a permutation of the {} boxes of {}.".format(
+        permutation, len(diagram), diagram)
+
+
 def boxes_and_offsets_must_have_same_len():
     """ Disconnected diagram error. """
     return "Boxes and offsets must have the same length."
@@ -78,12 +90,28 @@ def expected_pregroup():
            " use diagram.draw() instead."
 
 
+def unknown_method(method, *methods):
+    """ Unknown method error. """
+    return "Unknown method {}, expected one of {}.".format(
+        repr(method), ", ".join(map(repr, methods)))
+
+
 def expected_input_length(function, values):
     """ Unexpected input length error. """
     return "Expected input of length {}, got {} instead.".format(
         len(function.dom), len(values))
 
 
+def expected_arrays(n_arrays, arrays):
+    """ Unexpected number of arrays error. """
+    return "Expected {} arrays, got {} instead.".format(n_arrays, len(arrays))
+
+
+def mixed_circuit(circuit):
+    """ Mixed circuits cannot be compiled to tensors. """
+    return "Expected a pure circuit, got a mixed circuit {}.".format(circuit)
+
+
 class WarnOnce:
     warned = False
 
@@ -38,13 +38,25 @@ We can check the Eckmann-Hilton argument, up to interchanger.
 .. image:: ../_static/imgs/EckmannHilton.gif
     :align: center
 """
-from discopy import cat, messages, drawing, rewriting
-from discopy.cat import Ob
+from functools import reduce
+from itertools import accumulate
+
+import numpy as np
+
+from discopy import cat, config, messages, drawing, rewriting
+from discopy.cat import Ob, AxiomError, intern
 from discopy.messages import WarnOnce
-from discopy.utils import factory_name, from_tree
+from discopy.utils import factory_name, from_tree, set_state, Rope
 
 warn_permutation = WarnOnce()
 
+# Parameters of the rolling hash of diagrams, see Diagram._hash_data.
+HASH_MODULUS, HASH_BASE, HASH_SHIFT = (1 << 61) - 1, 1000003, 2654435761
+# The offsets of every box, i.e. a single box at offset zero.
+BOX_OFFSETS = Rope((0, ))
+# Number of boxes in between two scans kept for slicing, see Diagram._scan.
+SCAN_STEP = 64
+
 
 class Ty(Ob):
     """
@@ -72,9 +84,15 @@ class Ty(Ob):
     >>> assert x @ unit == x == unit @ x
     >>> assert (x @ y) @ z == x @ y @ z == x @ (y @ z)
     """
+    __slots__ = ('_objects', '_hash')
+
     def __init__(self, *objects):
+        self._hash = None
         self._objects = tuple(
             x if isinstance(x, Ob) else Ob(x) for x in objects)
+        if config.INTERN_OBJECTS:  # Biclosed types are their own object.
+            self._objects = tuple(
+                x if x is self else intern(x) for x in self._objects)
         super().__init__(self)
 
     @property
@@ -166,10 +184,19 @@ class Ty(Ob):
         return Ty(*self)
 
     def __eq__(self, other):
-        return isinstance(other, Ty) and self._objects == other._objects
+        return self is other\
+            or isinstance(other, Ty) and self._objects == other._objects
 
     def __hash__(self):
-        return hash(repr(self))
+        if self._hash is None:
+            self._hash = hash(self._objects)
+        return self._hash
+
+    def __setstate__(self, state):
+        set_state(self, state, _hash=None, _interned=False)
+
+    def _intern_key(self):
+        return type(self), self._objects
 
     def __repr__(self):
         return "Ty({})".format(', '.join(repr(x.name) for x in self._objects))
@@ -238,6 +265,8 @@ class PRO(Ty):
     >>> assert PRO(3) == Ty(1, 1, 1)
     >>> assert PRO(1) == PRO(Ob(1))
     """
+    __slots__ = ()
+
     @staticmethod
     def upgrade(old):
         for obj in old:
@@ -282,6 +311,8 @@ class Layer(cat.Box):
     >>> print(first >> then)
     Id(x) @ f @ Id(z) >> Id(x) @ g @ Id(z)
     """
+    __slots__ = ('_left', '_box', '_right')
+
     def __init__(self, left, box, right):
         self._left, self._box, self._right = left, box, right
         dom, cod = left @ box.dom @ right, left @ box.cod @ right
@@ -308,6 +339,141 @@ class Layer(cat.Box):
         return super().__getitem__(key)
 
 
+class Columns:
+    """
+    Columnar representation of a diagram, i.e. its offsets and the number of
+    wires going in and out of each box as arrays of :code:`int32`.
+
+    Each box object is stored once in :code:`table`, the :code:`indices` of
+    the boxes in the diagram point to it. Boxes are told apart by identity,
+    so that algorithms can compute something once per box object without
+    hashing boxes or comparing their data.
+
+    Parameters
+    ----------
+    diagram : :class:`Diagram`
+        The diagram to represent.
+
+    Examples
+    --------
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g = Box('f', x, y @ y), Box('g', y, x)
+    >>> columns = Columns(f >> g @ g)
+    >>> columns.offsets
+    array([0, 0, 1], dtype=int32)
+    >>> columns.n_dom, columns.n_cod
+    (array([1, 1, 1], dtype=int32), array([2, 1, 1], dtype=int32))
+    >>> columns.widths
+    array([1, 2, 2, 2], dtype=int32)
+    >>> columns.table
+    (Box('f', Ty('x'), Ty('y', 'y')), Box('g', Ty('y'), Ty('x')))
+    >>> columns.indices
+    array([0, 1, 1], dtype=int32)
+    """
+    __slots__ = ('table', 'indices', 'offsets', 'n_dom', 'n_cod', 'widths')
+
+    def __init__(self, diagram):
+        boxes, n_boxes = diagram.boxes, len(diagram)
+        self.offsets = np.fromiter(diagram.offsets, np.int32, n_boxes)
+        self.n_dom = np.fromiter(
+            (len(box.dom) for box in boxes), np.int32, n_boxes)
+        self.n_cod = np.fromiter(
+            (len(box.cod) for box in boxes), np.int32, n_boxes)
+        self.widths = np.empty(n_boxes + 1, np.int32)
+        self.widths[0] = len(diagram.dom)
+        np.cumsum(self.n_cod - self.n_dom, out=self.widths[1:])
+        self.widths[1:] += len(diagram.dom)
+        table, self.indices = {}, np.empty(n_boxes, np.int32)
+        for i, box in enumerate(boxes):
+            self.indices[i] = table.setdefault(id(box), (len(table), box))[0]
+        self.table = tuple(box for _, box in table.values())
+
+    def __len__(self):
+        return len(self.offsets)
+
+
+class Ports:
+    """
+    Connectivity of a diagram, i.e. which input port each output port is
+    plugged into and vice versa, as arrays of :code:`int32`.
+
+    Ports are numbered in one sequence for the outputs and one for the
+    inputs. The domain of the diagram counts as the outputs of a box with
+    index :code:`-1`, its codomain as the inputs of a box with index
+    :code:`len(diagram)`. For each port we store its box, its position in
+    the box and the port it is plugged into.
+
+    It is used to follow wires in :func:`discopy.rewriting.remove_snakes`,
+    :func:`discopy.rewriting.snake_removal` and
+    :meth:`discopy.quantum.zx.Diagram.to_pyzx`. The drawing and
+    :meth:`Diagram.interchange` still scan the diagram, as they need the
+    position of each wire in between the boxes.
+
+    Parameters
+    ----------
+    diagram : :class:`Diagram`
+        The diagram to index.
+
+    Examples
+    --------
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g = Box('f', x, y @ y), Box('g', y, x)
+    >>> ports = Ports(f >> g @ Id(y))
+    >>> ports.consumer(0, 1), ports.producer(2, 1)
+    ((2, 1), (0, 1))
+    >>> ports.consumer(-1, 0), ports.producer(1, 0)
+    ((0, 0), (0, 0))
+    >>> ports.outputs
+    array([0, 1, 3, 2], dtype=int32)
+    """
+    __slots__ = (
+        'n_boxes', 'in_start', 'out_start', 'in_box', 'out_box',
+        'in_pos', 'out_pos', 'inputs', 'outputs')
+
+    def __init__(self, diagram):
+        columns = diagram.columns
+        self.n_boxes = n_boxes = len(columns)
+        n_dom = columns.n_dom.tolist() + [len(diagram.cod)]
+        n_cod = [len(diagram.dom)] + columns.n_cod.tolist()
+        in_start = [0] + list(accumulate(n_dom, initial=0))[:-1]
+        out_start = list(accumulate(n_cod, initial=0))
+        inputs, scan = [], list(range(n_cod[0]))
+        for i, off in enumerate(columns.offsets.tolist()):
+            inputs += scan[off: off + n_dom[i]]
+            scan[off: off + n_dom[i]] = range(
+                out_start[i + 1], out_start[i + 2])
+        inputs += scan
+        outputs = len(inputs) * [0]
+        for wire, plug in enumerate(inputs):
+            outputs[plug] = wire
+        in_box = [i for i, n in enumerate(n_dom) for _ in range(n)]
+        out_box = [i - 1 for i, n in enumerate(n_cod) for _ in range(n)]
+        in_pos = [k for n in n_dom for k in range(n)]
+        out_pos = [k for n in n_cod for k in range(n)]
+        for attr, value in [
+                ('in_start', in_start), ('out_start', out_start),
+                ('in_box', in_box), ('out_box', out_box),
+                ('in_pos', in_pos), ('out_pos', out_pos),
+                ('inputs', inputs), ('outputs', outputs)]:
+            setattr(self, attr, np.array(value, dtype=np.int32))
+
+    def consumer(self, box, port):
+        """
+        The box and input port which output :code:`port` of :code:`box`
+        is plugged into, :code:`box` is :code:`-1` for the domain.
+        """
+        wire = self.outputs[self.out_start[box + 1] + port]
+        return int(self.in_box[wire]), int(self.in_pos[wire])
+
+    def producer(self, box, port):
+        """
+        The box and output port plugged into input :code:`port` of
+        :code:`box`, which is :code:`len(diagram)` for the codomain.
+        """
+        wire = self.inputs[self.in_start[box + 1] + port]
+        return int(self.out_box[wire]), int(self.out_pos[wire])
+
+
 class Diagram(cat.Arrow):
     """
     Defines a diagram given dom, cod, a list of boxes and offsets.
@@ -353,32 +519,38 @@ class Diagram(cat.Arrow):
         """ Downcasting to :class:`discopy.monoidal.Diagram`. """
         dom, cod = Ty(*self.dom), Ty(*self.cod)
         boxes, offsets = [box.downgrade() for box in self.boxes], self.offsets
-        return Diagram(dom, cod, boxes, offsets)
+        return Diagram(dom, cod, boxes, offsets, _scan=False)
 
-    def __init__(self, dom, cod, boxes, offsets, layers=None):
+    def __init__(self, dom, cod, boxes, offsets, layers=None, _scan=True):
         if not isinstance(dom, Ty):
             raise TypeError(messages.type_err(Ty, dom))
         if not isinstance(cod, Ty):
             raise TypeError(messages.type_err(Ty, cod))
         if len(boxes) != len(offsets):
             raise ValueError(messages.boxes_and_offsets_must_have_same_len())
-        if layers is None:
-            layers = cat.Id(dom)
+        if layers is None and _scan:
+            scan = list(dom._objects)
             for box, off in zip(boxes, offsets):
                 if not isinstance(box, Diagram):
                     raise TypeError(messages.type_err(Diagram, box))
                 if not isinstance(off, int):
                     raise TypeError(messages.type_err(int, off))
-                left = layers.cod[:off] if layers else dom[:off]
-                right = layers.cod[off + len(box.dom):]\
-                    if layers else dom[off + len(box.dom):]
-                layers = layers >> self.layer_factory(left, box, right)
-            layers = layers >> cat.Id(cod)
-        self._layers, self._offsets = layers, tuple(offsets)
+                end = off + len(box.dom)
+                if off < 0 or tuple(scan[off:end]) != box.dom._objects:
+                    raise AxiomError(messages.does_not_compose(
+                        cat.Id(Ty(*scan)), Layer(
+                            Ty(*scan[:off]), box, Ty(*scan[end:]))))
+                scan[off:end] = box.cod._objects
+            if tuple(scan) != cod._objects:
+                raise AxiomError(messages.does_not_compose(
+                    cat.Id(Ty(*scan)), cat.Id(cod)))
+        self._layers, self._hash_data = layers, None
+        self._columns = self._ports = self._scans = None
+        self._offsets = offsets if isinstance(offsets, Rope) else Rope(offsets)
         super().__init__(dom, cod, boxes, _scan=False)
 
     def to_tree(self):
-        return dict(cat.Arrow.to_tree(self), offsets=self.offsets)
+        return dict(cat.Arrow.to_tree(self), offsets=list(self.offsets))
 
     @classmethod
     def from_tree(cls, tree):
@@ -387,8 +559,13 @@ class Diagram(cat.Arrow):
 
     @property
     def offsets(self):
-        """ The offset of a box is the number of wires to its left. """
-        return list(self._offsets)
+        """
+        The offset of a box is the number of wires to its left.
+
+        It is returned as a read-only :class:`discopy.utils.Rope`, shared
+        with the compositions and slices of the diagram.
+        """
+        return self._offsets
 
     @property
     def layers(self):
@@ -407,18 +584,94 @@ class Diagram(cat.Arrow):
                 boxes=diagram.boxes[i:j],
                 offsets=diagram.offsets[i:j],
                 layers=diagram.layers[i:j])
+
+        Layers are computed lazily in one pass over the boxes and offsets,
+        the first time they are accessed.
+
+        >>> x, y = Ty('x'), Ty('y')
+        >>> f = Box('f', x, y)
+        >>> diagram = Diagram(x @ x, y @ y, [f, f], [0, 1])
+        >>> print(diagram.layers)
+        f @ Id(x) >> Id(y) @ f
         """
+        if self._layers is None:
+            scan, layers = self.dom, []
+            for box, off in zip(self._boxes, self._offsets):
+                left, right = scan[:off], scan[off + len(box.dom):]
+                layers.append(self.layer_factory(left, box, right))
+                scan = left @ box.cod @ right
+            self._layers = cat.Arrow(self.dom, self.cod, layers, _scan=False)
         return self._layers
 
+    @property
+    def columns(self):
+        """
+        The :class:`Columns` of a diagram, computed once in one pass.
+
+        >>> x = Ty('x')
+        >>> f = Box('f', x, x @ x)
+        >>> (f >> f @ Id(x)).columns.widths
+        array([1, 2, 3], dtype=int32)
+        """
+        if self._columns is None:
+            self._columns = Columns(self)
+        return self._columns
+
+    @property
+    def ports(self):
+        """
+        The :class:`Ports` of a diagram, computed once in one pass.
+
+        >>> x = Ty('x')
+        >>> f = Box('f', x, x @ x)
+        >>> (f >> f @ Id(x)).ports.consumer(0, 1)
+        (2, 2)
+        """
+        if self._ports is None:
+            self._ports = Ports(self)
+        return self._ports
+
+    def _scan(self, i):
+        """
+        The type of the wires in between boxes :code:`i - 1` and :code:`i`.
+
+        The first call scans the diagram once and keeps the wires before
+        every :code:`SCAN_STEP` boxes, later calls start from the closest.
+        """
+        if not i:
+            return self.dom
+        if i == len(self):
+            return self.cod
+        if self._layers is not None:
+            return self._layers[i].dom
+        if self._scans is None:
+            scan, self._scans = list(self.dom._objects), []
+            for j, (box, off) in enumerate(zip(self._boxes, self._offsets)):
+                if not j % SCAN_STEP:
+                    self._scans.append(tuple(scan))
+                scan[off: off + len(box.dom)] = box.cod._objects
+        start = i - i % SCAN_STEP
+        scan = list(self._scans[start // SCAN_STEP])
+        for box, off in zip(self._boxes[start:i], self._offsets[start:i]):
+            scan[off: off + len(box.dom)] = box.cod._objects
+        return self.dom.upgrade(Ty(*scan))
+
     def then(self, *others):
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if not others or any(isinstance(other, Sum) for other in others):
             return super().then(*others)
-        other, = others
-        return self.upgrade(
-            Diagram(self.dom, other.cod,
-                    self.boxes + other.boxes,
-                    self.offsets + other.offsets,
-                    layers=self.layers >> other.layers))
+        self._check_then(others, Diagram)
+        diagrams = (self, ) + others
+        layers = None if any(d._layers is None for d in diagrams)\
+            else self._layers.then(*(other._layers for other in others))
+        result = self.upgrade(
+            Diagram(self.dom, others[-1].cod,
+                    Rope.concat(*(d._boxes for d in diagrams)),
+                    Rope.concat(*(d._offsets for d in diagrams)),
+                    layers=layers, _scan=False))
+        hash_data = [d._cached_hash_data() for d in diagrams]
+        if None not in hash_data:
+            result._hash_data = reduce(self._combine_hash_data, hash_data)
+        return result
 
     def tensor(self, other=None, *rest):
         """
@@ -448,21 +701,32 @@ class Diagram(cat.Arrow):
         """
         if other is None:
             return self
-        if rest:
-            return self.tensor(other).tensor(*rest)
-        if isinstance(other, Sum):
+        others = (other, ) + rest
+        if any(isinstance(other, Sum) for other in others):
+            if rest:
+                return reduce(lambda f, g: f.tensor(g), others, self)
             return self.sum([self]).tensor(other)
-        if not isinstance(other, Diagram):
-            raise TypeError(messages.type_err(Diagram, other))
-        dom, cod = self.dom @ other.dom, self.cod @ other.cod
-        boxes = self.boxes + other.boxes
-        offsets = self.offsets + [n + len(self.cod) for n in other.offsets]
-        layers = cat.Id(dom)
-        for left, box, right in self.layers:
-            layers = layers >> self.layer_factory(left, box, right @ other.dom)
-        for left, box, right in other.layers:
-            layers = layers >> self.layer_factory(self.cod @ left, box, right)
-        return self.upgrade(Diagram(dom, cod, boxes, offsets, layers=layers))
+        for other in others:
+            if not isinstance(other, Diagram):
+                raise TypeError(messages.type_err(Diagram, other))
+        diagrams = (self, ) + others
+        dom = self.dom.tensor(*(other.dom for other in others))
+        cod = self.cod.tensor(*(other.cod for other in others))
+        shifts = [0]
+        for diagram in diagrams[:-1]:
+            shifts.append(shifts[-1] + len(diagram.cod))
+        boxes = Rope.concat(*(d._boxes for d in diagrams))
+        offsets = Rope.concat(self._offsets, *(
+            [n + shift for n in other._offsets]
+            for other, shift in zip(others, shifts[1:])))
+        result = self.upgrade(Diagram(dom, cod, boxes, offsets, _scan=False))
+        hash_data = [d._cached_hash_data() for d in diagrams]
+        if None not in hash_data:
+            result._hash_data = hash_data[0]
+            for data, shift in zip(hash_data[1:], shifts[1:]):
+                result._hash_data = self._combine_hash_data(
+                    result._hash_data, data, shift=shift)
+        return result
 
     def __matmul__(self, other):
         return self.tensor(other)
@@ -470,20 +734,79 @@ class Diagram(cat.Arrow):
     def __eq__(self, other):
         if not isinstance(other, Diagram):
             return False
+        if self is other:
+            return True
+        if None not in (self._hash, other._hash) and self._hash != other._hash:
+            return False
         return all(getattr(self, attr) == getattr(other, attr)
                    for attr in ['dom', 'cod', 'boxes', 'offsets'])
 
     def __repr__(self):
-        if not self.boxes:  # i.e. self is identity.
+        if not self._boxes:  # i.e. self is identity.
             return repr(self.id(self.dom))
-        if len(self.boxes) == 1 and self.dom == self.boxes[0].dom:
-            return repr(self.boxes[0])  # i.e. self is a generator.
+        if len(self._boxes) == 1 and self.dom == self._boxes[0].dom:
+            return repr(self._boxes[0])  # i.e. self is a generator.
         return "Diagram(dom={}, cod={}, boxes={}, offsets={})".format(
             repr(self.dom), repr(self.cod),
             repr(self.boxes), repr(self.offsets))
 
     def __hash__(self):
-        return hash(repr(self))
+        """
+        The hash of a diagram is computed from its domain, codomain and
+        the hashes of its boxes and offsets. It is cached and, when both
+        sides have been hashed already, :meth:`then` and :meth:`tensor`
+        combine the hashes of their inputs without going through the boxes.
+
+        >>> x, y = Ty('x'), Ty('y')
+        >>> f, g = Box('f', x, y), Box('g', y, x)
+        >>> diagram = f @ g >> g @ f
+        >>> assert hash(diagram) == hash(
+        ...     Diagram(x @ y, x @ y, [f, g, g, f], [0, 1, 0, 1]))
+        >>> assert hash(f @ Id(Ty())) == hash(f)
+        """
+        if self._hash is None:
+            digest, _, _ = self._get_hash_data()
+            if len(self) == 1 and self.dom == self._boxes[0].dom:
+                self._hash = hash(self._boxes[0])
+            else:
+                self._hash = hash((self.dom, self.cod, digest))
+        return self._hash
+
+    def __setstate__(self, state):
+        set_state(self, state, _hash=None, _interned=False, _hash_data=None,
+                  _columns=None, _ports=None, _scans=None)
+
+    def _get_hash_data(self):
+        """
+        Polynomial rolling hash of the boxes and offsets, returns a triple
+        :code:`(h, b ** n, 1 + b + ... + b ** (n - 1))` modulo
+        :code:`HASH_MODULUS` where :code:`b = HASH_BASE` and
+        :code:`h = sum(hash(box_i, off_i) * b ** (n - 1 - i))`.
+        """
+        if self._hash_data is None:
+            mod, base, shift = HASH_MODULUS, HASH_BASE, HASH_SHIFT
+            digest, power, total = 0, 1, 0
+            for box, off in zip(self._boxes, self._offsets):
+                digest = (digest * base + hash(box) + off * shift) % mod
+                power, total = power * base % mod, (total * base + 1) % mod
+            self._hash_data = digest, power, total
+        return self._hash_data
+
+    def _cached_hash_data(self):
+        """ The hash data if it can be computed in constant time. """
+        if self._hash_data is None and len(self._boxes) < 2 and all(
+                box._hash is not None for box in self._boxes):
+            return self._get_hash_data()
+        return self._hash_data
+
+    @staticmethod
+    def _combine_hash_data(left, right, shift=0):
+        """ The hash data for the boxes of left followed by right. """
+        mod = HASH_MODULUS
+        (digest0, power0, total0), (digest1, power1, total1) = left, right
+        digest1 = (digest1 + shift * HASH_SHIFT * total1) % mod
+        return ((digest0 * power1 + digest1) % mod, power0 * power1 % mod,
+                (total0 * power1 + total1) % mod)
 
     def __iter__(self):
         for left, box, right in self.layers:
@@ -493,6 +816,18 @@ class Diagram(cat.Arrow):
         return ' >> '.join(map(str, self.layers)) or str(self.id(self.dom))
 
     def __getitem__(self, key):
+        if key == slice(None, None, -1):
+            boxes = [box[::-1] for box in self._boxes[::-1]]
+            return self.upgrade(Diagram(
+                self.cod, self.dom, boxes, self._offsets[::-1], _scan=False))
+        if isinstance(key, slice) and key.step in (None, 1):
+            start, stop, _ = key.indices(len(self))
+            stop = max(start, stop)
+            layers = None if self._layers is None\
+                else self._layers[start:stop]
+            return self.upgrade(Diagram(
+                self._scan(start), self._scan(stop), self._boxes[start:stop],
+                self._offsets[start:stop], layers=layers, _scan=False))
         if isinstance(key, slice):
             layers = self.layers[key]
             boxes_and_offsets = tuple(zip(*(
@@ -621,7 +956,8 @@ class Diagram(cat.Arrow):
         def upgrade(old):
             ob_upgrade = type(ar_factory.id().dom).upgrade  # Is this Yoneda?
             dom, cod = ob_upgrade(old.dom), ob_upgrade(old.cod)
-            return ar_factory(dom, cod, old.boxes, old.offsets, old.layers)
+            return ar_factory(
+                dom, cod, old._boxes, old._offsets, old._layers, _scan=False)
         ar_factory.upgrade = staticmethod(upgrade)
         return ar_factory
 
@@ -639,13 +975,15 @@ class Diagram(cat.Arrow):
         if not any(isinstance(box, Bubble) for box in self.boxes):
             return self.downgrade()
 
+        class BubbleOb(Ob):
+            __slots__ = ()
+            draw_as_box = True
+
         class OpenBubbles(Functor):
             def __call__(self, diagram):
                 diagram = diagram.downgrade()
                 if isinstance(diagram, Bubble):
-                    obj = Ob(diagram.drawing_name)
-                    obj.draw_as_box = True
-                    left, right = Ty(obj), Ty("")
+                    left, right = Ty(BubbleOb(diagram.drawing_name)), Ty("")
                     open_bubble = Box(
                         "open_bubble",
                         diagram.dom, left @ diagram.inside.dom @ right)
@@ -667,7 +1005,8 @@ class Diagram(cat.Arrow):
 
     draw = drawing.draw
     to_gif = drawing.to_gif
-    interchange = rewriting.interchange
+    interchange = move = rewriting.interchange
+    reorder = rewriting.reorder
     normalize = rewriting.normalize
     normal_form = rewriting.normal_form
     foliate = rewriting.foliate
@@ -675,6 +1014,7 @@ class Diagram(cat.Arrow):
     foliation = rewriting.foliation
     depth = rewriting.depth
     width = rewriting.width
+    rewrite = rewriting.rewrite
     layer_factory = Layer
 
 
@@ -736,22 +1076,22 @@ class Box(cat.Box, Diagram):
     >>> assert Id(Ty()) @ f == f == f @ Id(Ty())
     >>> assert f == f[::-1][::-1]
     """
+    # Diagram cannot declare slots as well as cat.Box, so we declare them here.
+    __slots__ = (
+        '_offsets', '_layers', '_hash_data', '_columns', '_ports', '_scans')
+
     def downgrade(self):
         """ Downcasting to :class:`discopy.monoidal.Box`. """
         box = Box.__new__(Box)
-        for attr, value in self.__dict__.items():
-            setattr(box, attr, value)
+        box.__setstate__(self.__reduce_ex__(2)[2])  # Both dict and slots.
         dom, cod = self.dom.downgrade(), self.cod.downgrade()
-        box._dom, box._cod, box._boxes = dom, cod, [box]
-        layer = Layer(box._dom[0:0], box, box._dom[0:0])
-        box._layers = cat.Arrow(dom, cod, [layer], _scan=False)
+        box._dom, box._cod, box._boxes = dom, cod, Rope([box])
+        box._layers = box._columns = box._ports = box._scans = None
         return box
 
     def __init__(self, name, dom, cod, **params):
         cat.Box.__init__(self, name, dom, cod, **params)
-        layer = self.layer_factory(dom[0:0], self, dom[0:0])
-        layers = cat.Arrow(dom, cod, [layer], _scan=False)
-        Diagram.__init__(self, dom, cod, [self], [0], layers=layers)
+        Diagram.__init__(self, dom, cod, [self], BOX_OFFSETS, _scan=False)
         for attr, value in params.items():
             if attr in drawing.ATTRIBUTES:
                 setattr(self, attr, value)
@@ -764,8 +1104,7 @@ class Box(cat.Box, Diagram):
                 and (other.dom, other.cod) == (self.dom, self.cod)
         return False
 
-    def __hash__(self):
-        return hash(repr(self))
+    __hash__ = cat.Box.__hash__
 
 
 class BinaryBoxConstructor:
@@ -819,7 +1158,7 @@ class Sum(cat.Sum, Box):
 
     def tensor(self, *others):
         if len(others) != 1:
-            return super().tensor(*others)
+            return reduce(lambda f, g: f.tensor(g), others, self)
         other = others[0] if isinstance(others[0], Sum) else Sum(others)
         unit = Sum([], self.dom @ other.dom, self.cod @ other.cod)
         terms = [f.tensor(g) for f in self.terms for g in other.terms]
@@ -869,6 +1208,108 @@ Diagram.sum = Sum
 Diagram.bubble_factory = Bubble
 
 
+class DiagramBuilder:
+    """
+    Mutable builder for diagrams, appends boxes in amortised constant time
+    and type checks them incrementally.
+
+    Parameters
+    ----------
+    dom : monoidal.Ty
+        Domain of the diagram to build.
+    ar_factory : type, optional
+        The class of diagram to build, default is :class:`Diagram`.
+
+    Raises
+    ------
+    :class:`AxiomError`
+        Whenever an appended diagram does not compose.
+
+    Examples
+    --------
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g = Box('f', x, y), Box('g', y @ y, x)
+    >>> builder = DiagramBuilder(x @ x)
+    >>> builder.append(f, 0)
+    >>> builder.append(f, 1)
+    >>> builder >>= g
+    >>> print(builder.cod)
+    x
+    >>> print(builder.build())
+    f @ Id(x) >> Id(y) @ f >> g
+    >>> assert builder.build() == f @ f >> g
+    """
+    def __init__(self, dom, ar_factory=None):
+        if not isinstance(dom, Ty):
+            raise TypeError(messages.type_err(Ty, dom))
+        self.ar_factory = Diagram if ar_factory is None else ar_factory
+        self.dom, self._scan = dom, list(dom._objects)
+        self._boxes, self._offsets = [], []
+
+    @property
+    def cod(self):
+        """ The codomain of the diagram built so far. """
+        return self.dom.upgrade(Ty(*self._scan))
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __repr__(self):
+        return "{}(dom={}, len={})".format(
+            type(self).__name__, repr(self.dom), len(self))
+
+    def append(self, diagram, offset=0):
+        """
+        Appends a diagram at a given offset, i.e. with :code:`offset` wires
+        to its left, in time linear in the size of :code:`diagram`.
+
+        Parameters
+        ----------
+        diagram : :class:`Diagram`
+            The diagram to append, e.g. a box.
+        offset : int, optional
+            The number of wires to its left, default is :code:`0`.
+        """
+        if not isinstance(diagram, Diagram):
+            raise TypeError(messages.type_err(Diagram, diagram))
+        if not isinstance(offset, int):
+            raise TypeError(messages.type_err(int, offset))
+        scan, end = self._scan, offset + len(diagram.dom)
+        if offset < 0 or tuple(scan[offset:end]) != diagram.dom._objects:
+            raise AxiomError(messages.does_not_compose(
+                cat.Id(Ty(*scan)), Layer(
+                    Ty(*scan[:offset]), diagram, Ty(*scan[end:]))))
+        self._boxes.extend(diagram.boxes)
+        self._offsets.extend(offset + off for off in diagram.offsets)
+        scan[offset:end] = diagram.cod._objects
+
+    def then(self, *others):
+        """
+        Appends diagrams in sequence, with the same semantics as
+        :meth:`Diagram.then` but without copying what has been built so far.
+        """
+        for other in others:
+            if not isinstance(other, Diagram):
+                raise TypeError(messages.type_err(Diagram, other))
+            if tuple(self._scan) != other.dom._objects:
+                raise AxiomError(messages.does_not_compose(
+                    cat.Id(Ty(*self._scan)), other))
+            self.append(other, 0)
+        return self
+
+    def __irshift__(self, other):
+        return self.then(other)
+
+    def build(self):
+        """
+        Freezes the builder into an immutable diagram, the builder can still
+        be appended to afterwards without affecting the result.
+        """
+        return self.ar_factory.upgrade(Diagram(
+            self.dom, self.cod, Rope(self._boxes), Rope(self._offsets),
+            _scan=False))
+
+
 class Functor(cat.Functor):
     """
     Implements a monoidal functor given its image on objects and arrows.
@@ -890,16 +1331,18 @@ class Functor(cat.Functor):
     .. image:: ../_static/imgs/monoidal/functor-example.png
         :align: center
     """
-    def __init__(self, ob, ar, ob_factory=None, ar_factory=None):
+    def __init__(self, ob, ar, ob_factory=None, ar_factory=None,
+                 cache_size=None):
         if ob_factory is None:
             ob_factory = Ty
         if ar_factory is None:
             ar_factory = Diagram
-        super().__init__(ob, ar, ob_factory=ob_factory, ar_factory=ar_factory)
+        super().__init__(ob, ar, ob_factory=ob_factory, ar_factory=ar_factory,
+                         cache_size=cache_size)
 
     def __call__(self, diagram):
         if isinstance(diagram, (Sum, Bubble)):
-            super().__call__(diagram)
+            return super().__call__(diagram)
         if isinstance(diagram, Ty):
             return self.ob_factory().tensor(*[
                 self.ob[type(diagram)(x)] for x in diagram])
@@ -909,11 +1352,56 @@ class Functor(cat.Functor):
         if isinstance(diagram, Box):
             return super().__call__(diagram)
         if isinstance(diagram, Diagram):
-            scan, result = diagram.dom, self.ar_factory.id(self(diagram.dom))
-            for box, off in zip(diagram.boxes, diagram.offsets):
-                id_l = self.ar_factory.id(self(scan[:off]))
-                id_r = self.ar_factory.id(self(scan[off + len(box.dom):]))
-                result = result >> id_l @ self(box) @ id_r
-                scan = scan[:off] @ box.cod @ scan[off + len(box.dom):]
-            return result
+            def wires(typ):
+                return [self._image(typ[i:i + 1]) for i in range(len(typ))]
+            columns, scan = diagram.columns, wires(diagram.dom)
+            images = [
+                (self._image(box), wires(box.cod)) for box in columns.table]
+            steps = zip(columns.indices.tolist(), columns.offsets.tolist(),
+                        columns.n_dom.tolist())
+            # Diagrams of diagrams are built in one go, other categories
+            # compose the whiskered images with one n-ary call to then.
+            if isinstance(self.ar_factory, type)\
+                    and issubclass(self.ar_factory, Diagram)\
+                    and not issubclass(self.ar_factory, Box)\
+                    and not any(isinstance(image, Sum) or not isinstance(
+                        image, Diagram) for image, _ in images):
+                builder = DiagramBuilder(self(diagram.dom), self.ar_factory)
+                for index, off, n_dom in steps:
+                    image, cod = images[index]
+                    builder.append(image, sum(map(len, scan[:off])))
+                    scan[off:off + n_dom] = cod
+                return builder.build()
+            layers = []
+            for index, off, n_dom in steps:
+                image, cod = images[index]
+                id_l = self.ar_factory.id(
+                    self.ob_factory().tensor(*scan[:off]))
+                id_r = self.ar_factory.id(
+                    self.ob_factory().tensor(*scan[off + n_dom:]))
+                layers.append(id_l @ image @ id_r)
+                scan[off:off + n_dom] = cod
+            return self.ar_factory.id(self(diagram.dom)).then(*layers)
         raise TypeError(messages.type_err(Diagram, diagram))
+
+
+class Composite(cat.Composite, Functor):
+    """
+    The composite of two monoidal functors, see :meth:`cat.Functor.then`.
+
+    Each box of a diagram is sent through both functors once, then the
+    images are whiskered and composed in the codomain of the second functor.
+
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f = Box('f', x, y @ y)
+    >>> F = Functor({x: x, y: x}, {f: Box('g', x, x @ x)})
+    >>> G = Functor({x: y}, {Box('g', x, x @ x): Box('h', y, y @ y)})
+    >>> H = F >> G
+    >>> diagram = f @ f >> Id(y) @ f[::-1] @ Id(y)
+    >>> assert H(diagram) == G(F(diagram))
+    >>> H.cache_info()
+    CacheInfo(hits=3, misses=4, maxsize=1024, currsize=4)
+    """
+
+
+Functor.composite_factory = Composite
@@ -44,18 +44,20 @@ Arrows are diagrams generated by :class:`QuantumGate`, :class:`ClassicalGate`,
 """
 
 import random
-from itertools import takewhile, chain
+from itertools import takewhile
 from collections.abc import Mapping
 
 from discopy import messages, monoidal, rigid, tensor
 from discopy.cat import AxiomError
 from discopy.rigid import Diagram
-from discopy.tensor import Dim, Tensor
+from discopy.tensor import complex_array, Dim, Tensor
 from math import pi
-from functools import reduce, partial
+from functools import partial
 
 
 class AntiConjugate:
+    __slots__ = ()
+
     def conjugate(self):
         return type(self)(-self.phase)
 
@@ -63,6 +65,8 @@ class AntiConjugate:
 
 
 class RealConjugate:
+    __slots__ = ()
+
     def conjugate(self):
         return self
 
@@ -70,6 +74,8 @@ class RealConjugate:
 
 
 class Anti2QubitConjugate:
+    __slots__ = ()
+
     def conjugate(self):
         algebraic_conj = type(self)(-self.phase)
         return Swap(qubit, qubit) >> algebraic_conj >> Swap(qubit, qubit)
@@ -101,6 +107,8 @@ class Ob(RealConjugate, rigid.Ob):
     >>> assert bit.objects == [Ob("bit", dim=2)]
     >>> assert qubit.objects == [Ob("qubit", dim=2)]
     """
+    __slots__ = ('_dim', )
+
     def __init__(self, name, dim=2, z=0):
         super().__init__(name)
         if z != 0:
@@ -277,13 +285,16 @@ class Circuit(tensor.Diagram):
             # This allows the syntax :code:`circuit.eval(backend)`
             return self.eval(backend=others[0], mixed=mixed, **params)
         if backend is None:
+            if others and not mixed and not any(
+                    circuit.is_mixed for circuit in (self, ) + others):
+                return Circuit.eval_batch((self, ) + others)
             if others:
                 return [circuit.eval(mixed=mixed, **params)
                         for circuit in (self, ) + others]
             functor = cqmap.Functor() if mixed or self.is_mixed\
                 else tensor.Functor(lambda x: x[0].dim, lambda f: f.array)
             box = functor(self)
-            return type(box)(box.dom, box.cod, box.array + 0j)
+            return type(box)(box.dom, box.cod, complex_array(box.array))
         circuits = [circuit.to_tk() for circuit in (self, ) + others]
         results, counts = [], circuits[0].get_counts(
             *circuits[1:], backend=backend, **params)
@@ -297,6 +308,51 @@ class Circuit(tensor.Diagram):
             results.append(result)
         return results if len(results) > 1 else results[0]
 
+    def compile(self):
+        """
+        Compiles a pure circuit into a :class:`discopy.tensor.Plan`, which
+        can be run again with new arrays for its gates, see
+        :meth:`discopy.tensor.Diagram.compile`.
+
+        Examples
+        --------
+        >>> from discopy.quantum import *
+        >>> import numpy as np
+        >>> circuit = Ket(0) >> Rx(0.25) >> Bra(0)
+        >>> plan = circuit.compile()
+        >>> assert np.isclose(plan().array, circuit.eval().array)
+        >>> rx = {circuit.boxes[1]: Rx(0.5).array}
+        >>> assert np.isclose(plan(rx).array, 0)
+        """
+        if self.is_mixed:
+            raise ValueError(messages.mixed_circuit(self))
+        return super().compile(
+            tensor.Functor(lambda x: x[0].dim, lambda f: f.array))
+
+    @staticmethod
+    def eval_batch(circuits):
+        """
+        Evaluates many pure circuits at once, contracting the circuits with
+        the same shape together, see :meth:`discopy.tensor.Diagram.eval_batch`.
+
+        This is what :code:`circuit.eval(*others)` does for pure circuits.
+
+        Examples
+        --------
+        >>> from discopy.quantum import *
+        >>> circuits = [Ket(0) >> Rx(phase) >> Bra(0) for phase in [0, 0.5]]
+        >>> Circuit.eval_batch(circuits)  # doctest: +ELLIPSIS
+        [Tensor(dom=Dim(1), cod=Dim(1), array=[1.+0.j]), Tensor(...)]
+        >>> assert circuits[0].eval(*circuits[1:])\\
+        ...     == [circuit.eval() for circuit in circuits]
+        """
+        for circuit in circuits:
+            if circuit.is_mixed:
+                raise ValueError(messages.mixed_circuit(circuit))
+        functor = tensor.Functor(lambda x: x[0].dim, lambda f: f.array)
+        return [Tensor(box.dom, box.cod, complex_array(box.array))
+                for box in tensor.Diagram.eval_batch(circuits, functor)]
+
     def get_counts(self, *others, backend=None, **params):
         """
         Get counts from a backend, or simulate them with numpy.
@@ -900,6 +956,8 @@ class Box(rigid.Box, Circuit):
     _dagger : bool, optional
         If set to :code:`None` then the box is self-adjoint.
     """
+    __slots__ = ('_conjugate', '_mixed')
+
     def __init__(self, name, dom, cod,
                  is_mixed=True, data=None, _dagger=False, _conjugate=False):
         if dom and not isinstance(dom, Ty):
@@ -910,7 +968,8 @@ class Box(rigid.Box, Circuit):
         self._conjugate = _conjugate
         rigid.Box.__init__(
             self, name, dom, cod, data=data, _dagger=_dagger, _z=z)
-        Circuit.__init__(self, dom, cod, [self], [0])
+        Circuit.__init__(
+            self, dom, cod, [self], monoidal.BOX_OFFSETS, _scan=False)
         if not is_mixed:
             if all(isinstance(x, Digit) for x in dom @ cod):
                 self.classical = True
@@ -1111,13 +1170,45 @@ class Encode(RealConjugate, Box):
                    reset_bits=self.reset_bits)] * self.n_bits)
 
 
+class CircuitBuilder(monoidal.DiagramBuilder):
+    """
+    Mutable builder for circuits, with the same gate methods as
+    :class:`Circuit` but appending in amortised constant time.
+
+    >>> builder = CircuitBuilder(2)
+    >>> builder.H(0).CX(0, 1).Rz(0.5, 1)
+    CircuitBuilder(dom=qubit @ qubit, len=3)
+    >>> print(builder.build())
+    H @ Id(1) >> CX >> Id(1) @ Rz(0.5)
+    >>> assert builder.build() == Id(2).H(0).CX(0, 1).Rz(0.5, 1)
+    """
+    def __init__(self, dom=0):
+        if isinstance(dom, int):
+            dom = qubit ** dom
+        super().__init__(dom, ar_factory=Circuit)
+
+    def _apply_gate(self, gate, position):
+        """ Apply gate at position """
+        if position < 0 or position >= len(self._scan):
+            raise ValueError(f'Index {position} out of range.')
+        self.append(gate, position)
+        return self
+
+    _apply_controlled = Circuit._apply_controlled
+    H, S, X, Y, Z = Circuit.H, Circuit.S, Circuit.X, Circuit.Y, Circuit.Z
+    Rx, Ry, Rz = Circuit.Rx, Circuit.Ry, Circuit.Rz
+    CX, CY, CZ = Circuit.CX, Circuit.CY, Circuit.CZ
+    CCX, CCZ, CRx, CRz = Circuit.CCX, Circuit.CCZ, Circuit.CRx, Circuit.CRz
+
+
 class Functor(rigid.Functor):
     """ Functors into :class:`Circuit`. """
-    def __init__(self, ob, ar):
+    def __init__(self, ob, ar, cache_size=None):
         if isinstance(ob, Mapping):
             ob = {x: qubit ** y if isinstance(y, int) else y
                   for x, y in ob.items()}
-        super().__init__(ob, ar, ob_factory=Ty, ar_factory=Circuit)
+        super().__init__(ob, ar, ob_factory=Ty, ar_factory=Circuit,
+                         cache_size=cache_size)
 
     def __repr__(self):
         return super().__repr__().replace("Functor", "circuit.Functor")
@@ -1152,18 +1243,18 @@ class IQPansatz(Circuit):
             raise ValueError(
                 "Expected params of shape (depth, {})".format(n_qubits - 1))
         else:
-            depth = Tensor.np.shape(params)[0]
-            circuit = Id(n_qubits)
+            builder = CircuitBuilder(n_qubits)
 
             for thetas in params:
-                hadamards = Id().tensor(*(n_qubits * [H]))
-                rotations = Id(n_qubits).then(*(
-                    Id(i) @ CRz(thetas[i]) @ Id(n_qubits - 2 - i)
-                    for i in range(n_qubits - 1)))
-                circuit >>= hadamards >> rotations
+                for i in range(n_qubits):
+                    builder.append(H, i)
+                for i in range(n_qubits - 1):
+                    builder.append(CRz(thetas[i]), i)
+            circuit = builder.build()
 
         super().__init__(
-            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets)
+            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets,
+            _scan=False)
 
 
 class Sim14ansatz(Circuit):
@@ -1204,29 +1295,29 @@ class Sim14ansatz(Circuit):
             raise ValueError(
                 "Expected params of shape (depth, {})".format(4 * n_qubits))
         else:
-            depth = params_shape[0]
-            circuit = Id(n_qubits)
+            builder = CircuitBuilder(n_qubits)
 
             for thetas in params:
-                sublayer1 = Id().tensor(*map(Ry, thetas[:n_qubits]))
+                for i, theta in enumerate(thetas[:n_qubits]):
+                    builder.append(Ry(theta), i)
 
                 for i in range(n_qubits):
                     src = i
                     tgt = (i - 1) % n_qubits
-                    sublayer1 = sublayer1.CRx(thetas[n_qubits + i], src, tgt)
+                    builder.CRx(thetas[n_qubits + i], src, tgt)
 
-                sublayer2 = Id().tensor(
-                    *map(Ry, thetas[2 * n_qubits: 3 * n_qubits]))
+                for i, theta in enumerate(thetas[2 * n_qubits: 3 * n_qubits]):
+                    builder.append(Ry(theta), i)
 
                 for i in range(n_qubits, 0, -1):
                     src = i % n_qubits
                     tgt = (i + 1) % n_qubits
-                    sublayer2 = sublayer2.CRx(thetas[-i], src, tgt)
-
-                circuit >>= sublayer1 >> sublayer2
+                    builder.CRx(thetas[-i], src, tgt)
+            circuit = builder.build()
 
         super().__init__(
-            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets)
+            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets,
+            _scan=False)
 
 
 class Sim15ansatz(Circuit):
@@ -1267,28 +1358,29 @@ class Sim15ansatz(Circuit):
             raise ValueError(
                 "Expected params of shape (depth, {})".format(2 * n_qubits))
         else:
-            depth = params_shape[0]
-            circuit = Id(n_qubits)
+            builder = CircuitBuilder(n_qubits)
 
             for thetas in params:
-                sublayer1 = Id().tensor(*map(Ry, thetas[:n_qubits]))
+                for i, theta in enumerate(thetas[:n_qubits]):
+                    builder.append(Ry(theta), i)
 
                 for i in range(n_qubits):
                     src = i
                     tgt = (i - 1) % n_qubits
-                    sublayer1 = sublayer1.CX(src, tgt)
+                    builder.CX(src, tgt)
 
-                sublayer2 = Id().tensor(*map(Ry, thetas[n_qubits:]))
+                for i, theta in enumerate(thetas[n_qubits:]):
+                    builder.append(Ry(theta), i)
 
                 for i in range(n_qubits, 0, -1):
                     src = i % n_qubits
                     tgt = (i + 1) % n_qubits
-                    sublayer2 = sublayer2.CX(src, tgt)
-
-                circuit >>= sublayer1 >> sublayer2
+                    builder.CX(src, tgt)
+            circuit = builder.build()
 
         super().__init__(
-            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets)
+            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets,
+            _scan=False)
 
 
 class Sim8ansatz(Circuit):
@@ -1329,45 +1421,41 @@ class Sim8ansatz(Circuit):
                 "Expected params of shape (depth, {})".format(
                     5 * n_qubits - 1))
         else:
-            depth = params_shape[0]
-            circuit = Id(n_qubits)
+            builder = CircuitBuilder(n_qubits)
             for thetas in params:
-                RXs_1 = Id().tensor(*map(Rx, thetas[:n_qubits]))
+                for i, theta in enumerate(thetas[:n_qubits]):
+                    builder.append(Rx(theta), i)
 
-                RZs_1 = Id().tensor(*map(Rz, thetas[n_qubits: 2 * n_qubits]))
+                for i, theta in enumerate(thetas[n_qubits: 2 * n_qubits]):
+                    builder.append(Rz(theta), i)
 
-                bricks_1 = Id(n_qubits)
                 for i, tgt in enumerate(range(1, n_qubits, 2)):
                     src = tgt - 1
-                    bricks_1 = bricks_1.CRx(thetas[2 * n_qubits + i], src, tgt)
-
-                sublayer1 = RXs_1 >> RZs_1 >> bricks_1
+                    builder.CRx(thetas[2 * n_qubits + i], src, tgt)
 
                 # Params used by the first sublayer
                 # Used as offset for second sublayer
                 sl1_thetas = 2 * n_qubits + i + 1
 
-                RXs_2 = Id().tensor(
-                    *map(Rx, thetas[sl1_thetas: sl1_thetas + n_qubits]))
+                for i, theta in enumerate(
+                        thetas[sl1_thetas: sl1_thetas + n_qubits]):
+                    builder.append(Rx(theta), i)
 
-                RZs_2 = Id().tensor(
-                    *map(Rz,
-                         thetas[sl1_thetas + n_qubits:
-                                sl1_thetas + 2 * n_qubits]))
+                for i, theta in enumerate(
+                        thetas[sl1_thetas + n_qubits:
+                               sl1_thetas + 2 * n_qubits]):
+                    builder.append(Rz(theta), i)
 
                 thetas_used = sl1_thetas + 2 * n_qubits
 
-                bricks_2 = Id(n_qubits)
                 for i, tgt in enumerate(range(2, n_qubits, 2)):
                     src = tgt - 1
-                    bricks_2 = bricks_2.CRx(thetas[thetas_used + i], src, tgt)
-
-                sublayer2 = RXs_2 >> RZs_2 >> bricks_2
-
-                circuit >>= sublayer1 >> sublayer2
+                    builder.CRx(thetas[thetas_used + i], src, tgt)
+            circuit = builder.build()
 
         super().__init__(
-            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets)
+            circuit.dom, circuit.cod, circuit.boxes, circuit.offsets,
+            _scan=False)
 
 
 def real_amp_ansatz(params: Tensor.np.ndarray, *, entanglement='full'):
@@ -1388,24 +1476,24 @@ def real_amp_ansatz(params: Tensor.np.ndarray, *, entanglement='full'):
     dom = qubit**params.shape[1]
     n_qbs = params.shape[1]
 
-    circuit = Id(n_qbs)
+    builder = CircuitBuilder(n_qbs)
 
     for v in params[:-1]:
-        rys = Id().tensor(*(Ry(v[k]) for k in range(n_qbs)))
+        for k in range(n_qbs):
+            builder.append(Ry(v[k]), k)
         if entanglement == 'full':
-            cxs = [[ext_cx(k1, k2, dom=dom) for k2 in range(k1 + 1, n_qbs)] for
-                   k1 in range(n_qbs - 1)]
-            cxs = reduce(lambda a, b: a >> b, chain(*cxs))
+            cxs = [ext_cx(k1, k2, dom=dom)
+                   for k1 in range(n_qbs - 1) for k2 in range(k1 + 1, n_qbs)]
         else:
             cxs = [ext_cx(k, k + 1, dom=dom) for k in range(n_qbs - 1)]
-            cxs = reduce(lambda a, b: a >> b, cxs)
             if entanglement == 'circular':
-                cxs = ext_cx(n_qbs - 1, 0, dom=dom) >> cxs
-        circuit >>= rys >> cxs
+                cxs = [ext_cx(n_qbs - 1, 0, dom=dom)] + cxs
+        builder.then(*cxs)
 
-    circuit >>= Id().tensor(*(Ry(params[-1][k]) for k in range(n_qbs)))
+    for k in range(n_qbs):
+        builder.append(Ry(params[-1][k]), k)
 
-    return circuit
+    return builder.build()
 
 
 def random_tiling(n_qubits, depth=3, gateset=None, seed=None):
@@ -1430,9 +1518,9 @@ def random_tiling(n_qubits, depth=3, gateset=None, seed=None):
     if n_qubits == 1:
         phases = [random.random() for _ in range(3)]
         return Rx(phases[0]) >> Rz(phases[1]) >> Rx(phases[2])
-    result = Id(n_qubits)
+    builder = CircuitBuilder(n_qubits)
     for _ in range(depth):
-        line, n_affected = Id(0), 0
+        n_affected = 0
         while n_affected < n_qubits:
             gate = random.choice(
                 gateset if n_qubits - n_affected > 1 else [
@@ -1440,7 +1528,6 @@ def random_tiling(n_qubits, depth=3, gateset=None, seed=None):
                     if g is Rx or g is Rz or len(g.dom) == 1])
             if isinstance(gate, type) and issubclass(gate, Parametrized):
                 gate = gate(random.random())
-            line = line @ gate
+            builder.append(gate, n_affected)
             n_affected += len(gate.dom)
-        result = result >> line
-    return result
+    return builder.build()
@@ -14,7 +14,9 @@ For example, states of type :class:`Q` are density matrices:
 CQMap(dom=CQ(), cod=Q(Dim(2)), array=[0.5+0.j, 0.5+0.j, 0.5+0.j, 0.5+0.j])
 """
 
-from discopy import monoidal, rigid, messages, tensor
+from functools import reduce
+
+from discopy import rigid, messages, tensor
 from discopy.cat import AxiomError
 from discopy.rigid import Ob, Ty, Diagram
 from discopy.tensor import Dim, Tensor
@@ -152,7 +154,7 @@ class CQMap(Tensor):
 
     def then(self, *others):
         if len(others) != 1:
-            return monoidal.Diagram.then(self, *others)
+            return reduce(lambda f, g: f.then(g), others, self)
         other, = others
         return CQMap(
             self.dom, other.cod, utensor=self.utensor >> other.utensor)
@@ -162,7 +164,7 @@ class CQMap(Tensor):
 
     def tensor(self, *others):
         if len(others) != 1:
-            return monoidal.Diagram.tensor(self, *others)
+            return reduce(lambda f, g: f.tensor(g), others, self)
         other, = others
         f = rigid.Box('f', Ty('c00', 'q00', 'q00'), Ty('c10', 'q10', 'q10'))
         g = rigid.Box('g', Ty('c01', 'q01', 'q01'), Ty('c11', 'q11', 'q11'))
@@ -257,9 +259,10 @@ class Functor(rigid.Functor):
     """
     Functors from :class:`Circuit` into :class:`CQMap`.
     """
-    def __init__(self, ob=None, ar=None):
+    def __init__(self, ob=None, ar=None, cache_size=None):
         self.__ob, self.__ar = ob or {}, ar or {}
-        super().__init__(self._ob, self._ar, ob_factory=CQ, ar_factory=CQMap)
+        super().__init__(self._ob, self._ar, ob_factory=CQ, ar_factory=CQMap,
+                         cache_size=cache_size)
 
     def __repr__(self):
         return "cqmap.Functor(ob={}, ar={})".format(self.__ob, self.__ar)
@@ -7,7 +7,7 @@ import warnings
 import numpy
 
 from discopy.cat import AxiomError, rsubs
-from discopy.tensor import array2string, Dim, Tensor
+from discopy.tensor import array2string, complex_array, Dim, Tensor
 from discopy.quantum.circuit import (
     Circuit, Digit, Ty, bit, qubit, Box, Swap, Sum, Id,
     AntiConjugate, RealConjugate, Anti2QubitConjugate)
@@ -23,14 +23,15 @@ def format_number(data):
 
 class QuantumGate(Box):
     """ Quantum gates, i.e. unitaries on n qubits. """
+    __slots__ = ('_array', )
+
     def __init__(
             self, name, n_qubits, array=None, data=None,
             _dagger=False, _conjugate=False):
         dom = qubit ** n_qubits
         self._array = array
         if self._array is not None:
-            self._array = Tensor.np.array(array).reshape(
-                2 * n_qubits * (2, )) + 0j
+            self._array = complex_array(array).reshape(2 * n_qubits * (2, ))
         super().__init__(
             name, dom, dom, is_mixed=False, data=data,
             _dagger=_dagger, _conjugate=_conjugate)
@@ -106,6 +107,11 @@ class ClassicalGate(Box):
             == (other.name, other.dom, other.cod)\
             and Tensor.np.all(self.array == other.array)
 
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self.name, self.dom, self.cod))
+        return self._hash
+
     def __repr__(self):
         if self.is_dagger:
             return repr(self.dagger()) + ".dagger()"
@@ -168,6 +174,8 @@ class Digits(ClassicalGate):
     >>> assert Digits(2, dim=4).eval()\\
     ...     == Tensor(dom=Dim(1), cod=Dim(4), array=[0, 0, 1, 0])
     """
+    __slots__ = ('_digits', '_dim')
+
     def __init__(self, *digits, dim=None, _dagger=False):
         if not isinstance(dim, int):
             raise TypeError(int, dim)
@@ -233,6 +241,8 @@ class Ket(RealConjugate, Box):
     >>> assert Ket(1, 0).eval()\\
     ...     == Tensor(dom=Dim(1), cod=Dim(2, 2), array=[0, 0, 1, 0])
     """
+    __slots__ = ('_digits', '_dim')
+
     def __init__(self, *bitstring):
         if not all([bit in [0, 1] for bit in bitstring]):
             raise Exception('Bitstring can only contain integers 0 or 1.')
@@ -264,6 +274,8 @@ class Bra(RealConjugate, Box):
     >>> assert Bra(1, 0).eval()\\
     ...     == Tensor(dom=Dim(2, 2), cod=Dim(1), array=[0, 0, 1, 0])
     """
+    __slots__ = ('_digits', '_dim')
+
     def __init__(self, *bitstring):
         if not all([bit in [0, 1] for bit in bitstring]):
             raise Exception('Bitstring can only contain integers 0 or 1.')
@@ -299,6 +311,8 @@ class Controlled(QuantumGate):
         Number of qubits from the control to the target, default is :code:`0`.
         If negative, the control is on the right of the target.
     """
+    __slots__ = ('controlled', 'distance')
+
     def __init__(self, controlled, distance=1):
         if not isinstance(controlled, QuantumGate):
             raise TypeError(QuantumGate, controlled)
@@ -352,7 +352,8 @@ class Box(Diagram, monoidal.Box):
         if not isinstance(cod, PRO):
             raise TypeError(messages.type_err(PRO, cod))
         monoidal.Box.__init__(self, name, dom, cod, **params)
-        Diagram.__init__(self, dom, cod, [self], [0], layers=self.layers)
+        Diagram.__init__(
+            self, dom, cod, [self], monoidal.BOX_OFFSETS, _scan=False)
 
     def __repr__(self):
         return super().__repr__().replace('Box', 'optics.Box')
@@ -769,8 +770,9 @@ class MZI(Box):
 
 class Functor(monoidal.Functor):
     """ Can be used for catching lions """
-    def __init__(self, ob, ar):
-        super().__init__(ob, ar, ob_factory=PRO, ar_factory=Diagram)
+    def __init__(self, ob, ar, cache_size=None):
+        super().__init__(ob, ar, ob_factory=PRO, ar_factory=Diagram,
+                         cache_size=cache_size)
 
 
 def params_shape(width, depth):
@@ -90,39 +90,47 @@ class Diagram(tensor.Diagram):
         ...     7: {5: 1}}
         """
         from pyzx import Graph, VertexType, EdgeType
-        graph, scan = Graph(), []
+        graph, ports, inputs, spiders = Graph(), self.ports, [], {}
+
+        def add_edge(box, port, target):
+            # Follow the wire up through swaps and hadamards, in one step
+            # each with the connectivity index of the diagram.
+            hadamard = False
+            while True:
+                box, port = ports.producer(box, port)
+                if box == -1:
+                    source = inputs[port]
+                    break
+                if box in spiders:
+                    source = spiders[box]
+                    break
+                if isinstance(self._boxes[box], Swap):
+                    port = 1 - port
+                else:
+                    hadamard = not hadamard
+            etype = EdgeType.HADAMARD if hadamard else EdgeType.SIMPLE
+            graph.add_edge((source, target), etype)
+
         for i, _ in enumerate(self.dom):
-            node, hadamard = graph.add_vertex(VertexType.BOUNDARY), False
-            scan.append((node, hadamard))
+            node = graph.add_vertex(VertexType.BOUNDARY)
+            inputs.append(node)
             graph.set_inputs(graph.inputs() + (node,))
             graph.set_position(node, i, 0)
         for row, (box, offset) in enumerate(zip(self.boxes, self.offsets)):
             if isinstance(box, Spider):
-                node = graph.add_vertex(
+                node = spiders[row] = graph.add_vertex(
                     VertexType.Z if isinstance(box, Z) else VertexType.X,
                     phase=box.phase * 2 if box.phase else None)
                 graph.set_position(node, offset, row + 1)
                 for i, _ in enumerate(box.dom):
-                    source, hadamard = scan[offset + i]
-                    etype = EdgeType.HADAMARD if hadamard else EdgeType.SIMPLE
-                    graph.add_edge((source, node), etype)
-                scan = scan[:offset] + len(box.cod) * [(node, False)]\
-                    + scan[offset + len(box.dom):]
-            elif isinstance(box, Swap):
-                scan = scan[:offset] + [scan[offset + 1], scan[offset]]\
-                    + scan[offset + 2:]
+                    add_edge(row, i, node)
             elif isinstance(box, Scalar):
                 graph.scalar.add_float(box.data)
-            elif box == H:
-                node, hadamard = scan[offset]
-                scan[offset] = (node, not hadamard)
-            else:
+            elif not isinstance(box, Swap) and box != H:
                 raise TypeError(messages.type_err(Box, box))
         for i, _ in enumerate(self.cod):
             target = graph.add_vertex(VertexType.BOUNDARY)
-            source, hadamard = scan[i]
-            etype = EdgeType.HADAMARD if hadamard else EdgeType.SIMPLE
-            graph.add_edge((source, target), etype)
+            add_edge(len(self), i, target)
             graph.set_position(target, i, len(self) + 1)
             graph.set_outputs(graph.outputs() + (target,))
         return graph
@@ -241,7 +249,8 @@ class Box(rigid.Box, Diagram):
         if not isinstance(cod, PRO):
             raise TypeError(messages.type_err(PRO, cod))
         rigid.Box.__init__(self, name, dom, cod, **params)
-        Diagram.__init__(self, dom, cod, [self], [0])
+        Diagram.__init__(
+            self, dom, cod, [self], monoidal.BOX_OFFSETS, _scan=False)
 
 
 class Swap(rigid.Swap, Box):
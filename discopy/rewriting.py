@@ -10,7 +10,10 @@ def interchange(self, i, j, left=False):
     """
     Returns a new diagram with boxes i and j interchanged.
 
-    Gets called recursively whenever :code:`i < j + 1 or j < i - 1`.
+    Box :code:`i` is moved to position :code:`j` in one pass over the boxes
+    in between, with one interchanger per box it crosses.
+    :meth:`Diagram.move` is an alias, see :meth:`Diagram.reorder` for
+    applying a whole permutation of the boxes at once.
 
     Parameters
     ----------
@@ -33,49 +36,152 @@ def interchange(self, i, j, left=False):
         top >> Id(left) @ box1 @ Id(mid @ box0.dom @ right)
             >> Id(left @ box1.cod @ mid) @ box0 @ Id(right) >> bottom
     """
-    from discopy.monoidal import Layer, Diagram
+    from discopy.monoidal import Diagram
     if not 0 <= i < len(self) or not 0 <= j < len(self):
         raise IndexError
     if i == j:
         return self
-    if j < i - 1:
-        result = self
-        for k in range(i - j):
-            result = result.interchange(i - k, i - k - 1, left=left)
-        return result
-    if j > i + 1:
-        result = self
-        for k in range(j - i):
-            result = result.interchange(i + k, i + k + 1, left=left)
+    # We only need the offsets and number of wires of the boxes in between,
+    # the moves are applied to lists which get copied back only once.
+    start, stop = min(i, j), max(i, j) + 1
+    boxes = list(self._boxes[start:stop])
+    offsets = list(self._offsets[start:stop])
+    n_dom, n_cod = [len(box.dom) for box in boxes], [
+        len(box.cod) for box in boxes]
+    seq = list(range(stop - start))
+    _move(seq, offsets, i - start, j - start, n_dom, n_cod, boxes, left)
+    return self.upgrade(Diagram(
+        self.dom, self.cod,
+        self._boxes[:start] + [boxes[k] for k in seq] + self._boxes[stop:],
+        self._offsets[:start] + offsets + self._offsets[stop:], _scan=False))
+
+
+def reorder(self, permutation, left=False):
+    """
+    Returns a new diagram with the boxes in the order given by a
+    permutation, i.e. box :code:`k` of the result is box
+    :code:`permutation[k]` of the diagram.
+
+    This is the same as moving box :code:`permutation[k]` to position
+    :code:`k` with :func:`interchange` for each :code:`k` in turn. When every
+    box has inputs and outputs, two boxes commute if and only if they are not
+    plugged into each other, so the permutation is checked against the wires
+    in one pass and the new offsets are counted with a Fenwick tree, as in
+    :func:`sort_boxes`. Otherwise, the boxes are moved one swap at a time.
+
+    Parameters
+    ----------
+    permutation : list of int
+        The indices of the boxes in the new order.
+    left : bool, optional
+        Whether to apply left interchangers.
+
+    Raises
+    ------
+    ValueError
+        If :code:`permutation` is not a permutation of the boxes.
+    :class:`InterchangerError`
+        If two boxes that do not commute are swapped, i.e. the permutation
+        does not respect the connectivity of the diagram.
+
+    Examples
+    --------
+    >>> from discopy.monoidal import Ty, Box, Id
+    >>> x = Ty('x')
+    >>> f, g, h = Box('f', x, x), Box('g', x, x), Box('h', x @ x, x)
+    >>> diagram = f @ g >> h
+    >>> print(diagram.reorder([1, 0, 2]))
+    Id(x) @ g >> f @ Id(x) >> h
+    >>> assert diagram.reorder([1, 0, 2]) == diagram.interchange(1, 0)
+    >>> diagram.reorder([2, 0, 1])
+    Traceback (most recent call last):
+    ...
+    discopy.rewriting.InterchangerError: Boxes g and h do not commute.
+    """
+    from discopy.monoidal import Diagram
+    if sorted(permutation) != list(range(len(self))):
+        raise ValueError(messages.is_not_a_permutation(permutation, self))
+    boxes, columns = self.boxes, self.columns
+    n_dom, n_cod = columns.n_dom.tolist(), columns.n_cod.tolist()
+    if 0 in n_dom or 0 in n_cod:
+        # Each box is moved left past the boxes which come after it.
+        seq, where = list(range(len(self))), list(range(len(self)))
+        offsets = list(self.offsets)
+        for k, i in enumerate(permutation):
+            _move(seq, offsets, where[i], k, n_dom, n_cod, boxes, left, where)
+        return self.upgrade(Diagram(
+            self.dom, self.cod, [boxes[i] for i in seq], offsets,
+            _scan=False))
+    # The wires in a doubly-linked list in the order they are drawn from left
+    # to right, the box i moves up past the box j above it if and only if
+    # none of its inputs come from j.
+    rank = len(self) * [0]
+    for k, i in enumerate(permutation):
+        rank[i] = k
+    head, tail = 0, 1
+    nxt, prv, producer = [tail, None], [None, head], [None, None]
+
+    def insert(before, i=None):
+        node = len(nxt)
+        nxt.append(before)
+        prv.append(prv[before])
+        nxt[prv[before]] = prv[before] = node
+        producer.append(i)
+        return node
+
+    frontier = [insert(tail) for _ in self.dom]
+    inputs, outputs, keys, error = [], [], [], None
+    for i, off in enumerate(columns.offsets.tolist()):
+        inputs.append(frontier[off: off + n_dom[i]])
+        blocking = [producer[node] for node in inputs[-1]
+                    if producer[node] is not None
+                    and rank[producer[node]] > rank[i]]
+        if blocking and (error is None or rank[i] < rank[error[1]]):
+            error = max(blocking), i
+        keys.append(frontier[off])
+        outputs.append([insert(frontier[off], i) for _ in range(n_cod[i])])
+        frontier[off: off + n_dom[i]] = outputs[-1]
+    if error is not None:
+        raise InterchangerError(*(boxes[j] for j in error))
+    ranks, node = len(nxt) * [0], nxt[head]
+    for k in range(len(nxt) - 2):
+        ranks[node], node = k, nxt[node]
+    offsets = _count_offsets(
+        permutation, inputs, outputs, [ranks[key] for key in keys],
+        ranks, range(2, 2 + len(self.dom)))
+    return self.upgrade(Diagram(
+        self.dom, self.cod, [boxes[i] for i in permutation], offsets,
+        _scan=False))
+
+
+def _count_offsets(indices, inputs, outputs, keys, ranks, dom):
+    """
+    The offsets of the boxes in the order given by :code:`indices`, i.e. the
+    number of wires alive on the left of the wire ranked :code:`keys[i]`,
+    counted with a Fenwick tree over the :code:`ranks` of the wires.
+    Initially, the wires :code:`dom` are alive.
+    """
+    tree, offsets = (len(ranks) - 2) * [0], []
+
+    def add(rank, value):
+        while rank < len(tree):
+            tree[rank], rank = tree[rank] + value, rank | (rank + 1)
+
+    def count(rank):
+        result, rank = 0, rank - 1
+        while rank >= 0:
+            result, rank = result + tree[rank], (rank & (rank + 1)) - 1
         return result
-    if j < i:
-        i, j = j, i
-    off0, off1 = self.offsets[i], self.offsets[j]
-    left0, box0, right0 = self.layers[i]
-    left1, box1, right1 = self.layers[j]
-    # By default, we check if box0 is to the right first, then to the left.
-    if left and off1 >= off0 + len(box0.cod):  # box0 left of box1
-        off1 = off1 - len(box0.cod) + len(box0.dom)
-        middle = left1[len(left0 @ box0.cod):]
-        layer0 = self.layer_factory(left0, box0, middle @ box1.cod @ right1)
-        layer1 = self.layer_factory(left0 @ box0.dom @ middle, box1, right1)
-    elif off0 >= off1 + len(box1.dom):  # box0 right of box1
-        off0 = off0 - len(box1.dom) + len(box1.cod)
-        middle = left0[len(left1 @ box1.dom):]
-        layer0 = self.layer_factory(left1 @ box1.cod @ middle, box0, right0)
-        layer1 = self.layer_factory(left1, box1, middle @ box0.dom @ right0)
-    elif off1 >= off0 + len(box0.cod):  # box0 left of box1
-        off1 = off1 - len(box0.cod) + len(box0.dom)
-        middle = left1[len(left0 @ box0.cod):]
-        layer0 = self.layer_factory(left0, box0, middle @ box1.cod @ right1)
-        layer1 = self.layer_factory(left0 @ box0.dom @ middle, box1, right1)
-    else:
-        raise InterchangerError(box0, box1)
-    boxes = self.boxes[:i] + [box1, box0] + self.boxes[i + 2:]
-    offsets = self.offsets[:i] + [off1, off0] + self.offsets[i + 2:]
-    layers = self.layers[:i] >> layer1 >> layer0 >> self.layers[i + 2:]
-    return self.upgrade(
-        Diagram(self.dom, self.cod, boxes, offsets, layers=layers))
+
+    for node in dom:
+        add(ranks[node], 1)
+    for i in indices:
+        offsets.append(count(keys[i]))
+        for node in inputs[i]:
+            add(ranks[node], -1)
+        for node in outputs[i]:
+            add(ranks[node], 1)
+    return offsets
 
 
 class InterchangerError(cat.AxiomError):
@@ -113,8 +219,8 @@ def normalize(self, left=False):
     while True:
         no_more_moves = True
         for i in range(len(diagram) - 1):
-            box0, box1 = diagram.boxes[i], diagram.boxes[i + 1]
-            off0, off1 = diagram.offsets[i], diagram.offsets[i + 1]
+            box0, box1 = diagram._boxes[i], diagram._boxes[i + 1]
+            off0, off1 = diagram._offsets[i], diagram._offsets[i + 1]
             if left and off1 >= off0 + len(box0.cod)\
                     or not left and off0 >= off1 + len(box1.dom):
                 diagram = diagram.interchange(i, i + 1, left=left)
@@ -124,7 +230,7 @@ def normalize(self, left=False):
             break
 
 
-def normal_form(self, normalizer=None, **params):
+def normal_form(self, normalizer=None, method="dag", **params):
     """
     Returns the normal form of a diagram.
 
@@ -133,6 +239,11 @@ def normal_form(self, normalizer=None, **params):
     normalizer : iterable of :class:`Diagram`, optional
         Generator that yields rewrite steps, default is
         :meth:`Diagram.normalize`.
+    method : str, optional
+        Either :code:`"dag"` (the default) to compute the normal form
+        directly with :func:`sort_boxes`, or :code:`"rewrite"` to apply the
+        steps of :code:`normalizer` until none is left. The steps are always
+        used when a :code:`normalizer` is given.
 
     params : any, optional
         Passed to :code:`normalizer`.
@@ -141,8 +252,26 @@ def normal_form(self, normalizer=None, **params):
     ------
     NotImplementedError
         Whenever :code:`normalizer` yields the same rewrite steps twice.
+
+    Examples
+    --------
+    >>> from discopy.monoidal import *
+    >>> x = Ty('x')
+    >>> f, g = Box('f', x, x @ x), Box('g', x @ x, x)
+    >>> diagram = f >> Id(x) @ f >> f @ Id(x @ x)\\
+    ...     >> Id(x) @ g @ Id(x) >> g @ Id(x) >> g
+    >>> print(diagram.normal_form())
+    f >> f @ Id(x) >> Id(x @ x) @ f >> Id(x) @ g @ Id(x) >> g @ Id(x) >> g
+    >>> assert diagram.normal_form() == diagram.normal_form(method="rewrite")
     """
     from discopy.monoidal import Diagram
+    if method not in ("dag", "rewrite"):
+        raise ValueError(messages.unknown_method(method, "dag", "rewrite"))
+    if normalizer is None and method == "dag":
+        try:
+            return sort_boxes(self, **params)
+        except NotImplementedError:
+            pass  # The interchangers may still terminate, e.g. for snakes.
     diagram, cache = self, set()
     for _diagram in (normalizer or Diagram.normalize)(diagram, **params):
         if _diagram in cache:
@@ -152,6 +281,149 @@ def normal_form(self, normalizer=None, **params):
     return diagram
 
 
+def sort_boxes(self, left=False):
+    """
+    Computes the normal form of a connected diagram in one pass, with the
+    same result as applying the steps of :meth:`Diagram.normalize`.
+
+    This is the topological sort of the boxes which takes the leftmost (or
+    the rightmost) box available first, computed with a heap, the offsets
+    are then counted in one more pass with a Fenwick tree. When there are
+    both boxes with no inputs and boxes with no outputs, the former can
+    slide past the latter, each box is then moved up past the boxes above
+    it as long as the interchangers apply.
+
+    Parameters
+    ----------
+    left : bool, optional
+        Whether to apply left interchangers.
+
+    Raises
+    ------
+    NotImplementedError
+        Whenever two boxes can be interchanged both ways, e.g. scalars, in
+        which case :func:`normal_form` falls back to the rewrite steps.
+
+    Examples
+    --------
+    >>> from discopy.monoidal import *
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g = Box('f', x, y), Box('g', y, x @ x)
+    >>> diagram = Id(x) @ f >> Id(x) @ g >> f @ Id(x @ x)
+    >>> print(sort_boxes(diagram))
+    f @ Id(x) >> Id(y) @ f >> Id(y) @ g
+    >>> print(sort_boxes(diagram, left=True))
+    Id(x) @ f >> Id(x) @ g >> f @ Id(x @ x)
+
+    >>> s0, s1 = Box('s0', Ty(), Ty()), Box('s1', Ty(), Ty())
+    >>> sort_boxes(s0 @ s1)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    NotImplementedError: s0 >> s1 is not connected.
+    """
+    from heapq import heapify, heappop, heappush
+    from discopy.monoidal import Diagram
+    columns = self.columns
+    n_dom, n_cod = columns.n_dom.tolist(), columns.n_cod.tolist()
+    if 0 in n_dom and 0 in n_cod:
+        indices, offsets = _move_up(self, n_dom, n_cod, left)
+        return self.upgrade(Diagram(
+            self.dom, self.cod, [self._boxes[i] for i in indices], offsets,
+            _scan=False))
+    # The wires in a doubly-linked list in the order they are drawn from left
+    # to right, as in :func:`foliation`. A box depends on the boxes which
+    # output its inputs and on the effects which merged the gaps in between,
+    # a state on the box which outputs the wire next to it, on its right (or
+    # on its left) as it cannot be interchanged up.
+    head, tail = 0, 1
+    nxt, prv, producer = [tail, None], [None, head], [None, None]
+
+    def insert(before, i=None):
+        node = len(nxt)
+        nxt.append(before)
+        prv.append(prv[before])
+        nxt[prv[before]] = prv[before] = node
+        producer.append(i)
+        return node
+
+    frontier = [insert(tail) for _ in self.dom]
+    merged = [[] for _ in range(len(frontier) + 1)]
+    inputs, outputs, keys = [], [], []
+    n_deps, users = len(n_dom) * [0], [[] for _ in n_dom]
+    for i, off in enumerate(columns.offsets.tolist()):
+        wires = frontier[off: off + n_dom[i]] if n_dom[i]\
+            else frontier[off: off + 1] if left else frontier[off - 1: off]
+        deps = {producer[node] for node in wires} - {None}
+        for gap in merged[off + 1: off + n_dom[i]]:
+            deps.update(gap)
+        for j in deps:
+            n_deps[i] += 1
+            users[j].append(i)
+        anchor = frontier[off] if off < len(frontier) else tail
+        inputs.append(frontier[off: off + n_dom[i]])
+        outputs.append([insert(anchor, i) for _ in range(n_cod[i])])
+        keys.append(anchor if n_dom[i] else outputs[-1][0])
+        frontier[off: off + n_dom[i]] = outputs[-1]
+        if not n_dom[i]:
+            merged[off: off] = [[] for _ in range(n_cod[i])]
+        elif not n_cod[i]:
+            small, large = sorted(
+                (merged[off], merged[off + n_dom[i]]), key=len)
+            large += small + [i]
+            merged[off: off + n_dom[i] + 1] = [large]
+        else:
+            merged[off + 1: off + n_dom[i]] = [
+                [] for _ in range(n_cod[i] - 1)]
+    ranks, node = len(nxt) * [0], nxt[head]
+    for rank in range(len(nxt) - 2):
+        ranks[node], node = rank, nxt[node]
+    priority = [-ranks[key] if left else ranks[key] for key in keys]
+    heap = [(priority[i], i) for i, n in enumerate(n_deps) if not n]
+    heapify(heap)
+    indices = []
+    while heap:
+        _, i = heappop(heap)
+        indices.append(i)
+        for j in users[i]:
+            n_deps[j] -= 1
+            if not n_deps[j]:
+                heappush(heap, (priority[j], j))
+    # The offset of each box is the number of wires alive on its left.
+    offsets = _count_offsets(
+        indices, inputs, outputs, [ranks[key] for key in keys], ranks,
+        range(2, 2 + len(self.dom)))
+    return self.upgrade(Diagram(
+        self.dom, self.cod, [self._boxes[i] for i in indices], offsets,
+        _scan=False))
+
+
+def _move_up(self, n_dom, n_cod, left=False):
+    """
+    Moves each box up past the boxes above it which it does not depend on,
+    as long as the interchangers of :meth:`Diagram.normalize` apply.
+    Only the offsets are updated, the indices and offsets are returned.
+    """
+    indices, offsets = [], []
+    for i, off in enumerate(self.offsets):
+        k = len(indices)
+        while k:
+            j, off_j = indices[k - 1], offsets[k - 1]
+            if left and off >= off_j + n_cod[j]:  # box j left of box i
+                off = off - n_cod[j] + n_dom[j]
+                repeat = off_j >= off + n_cod[i]
+            elif not left and off_j >= off + n_dom[i]:  # box j right of i
+                off_j = off_j - n_dom[i] + n_cod[i]
+                repeat = off >= off_j + n_dom[j]
+            else:
+                break
+            if repeat:
+                raise NotImplementedError(messages.is_not_connected(self))
+            offsets[k - 1], k = off_j, k - 1
+        indices.insert(k, i)
+        offsets.insert(k, off)
+    return indices, offsets
+
+
 def foliate(self, yield_slices=False):
     """
     Generator yielding the interchanger steps in the foliation of self.
@@ -164,8 +436,8 @@ def foliate(self, yield_slices=False):
     Parameters
     ----------
     yield_slices : bool, optional
-        Yield the list of slices of self as last output,
-        used in :meth:`Diagram.foliation`.
+        Yield the list of slices of self as last output, these are the boxes
+        of :meth:`Diagram.foliation` which computes them in one pass.
 
     Examples
     --------
@@ -207,8 +479,8 @@ def foliate(self, yield_slices=False):
 
     """
     def is_right_of(last, diagram):
-        off0, off1 = diagram.offsets[last], diagram.offsets[last + 1]
-        box0, box1 = diagram.boxes[last], diagram.boxes[last + 1]
+        off0, off1 = diagram._offsets[last], diagram._offsets[last + 1]
+        box0, box1 = diagram._boxes[last], diagram._boxes[last + 1]
         if off1 >= off0 + len(box0.cod):  # box1 right of box0
             return True
         if off0 >= off1 + len(box1.dom):  # box1 left of box0
@@ -277,6 +549,10 @@ def foliation(self):
     Returns a diagram with normal_form diagrams of depth 1 as boxes
     such that its flattening gives the original diagram back.
 
+    Each box is put in the earliest slice after the boxes it depends on,
+    this is computed on integer offsets in one pass over the diagram,
+    see :func:`foliate` for the step-by-step view.
+
     >>> from discopy.monoidal import *
     >>> x, y = Ty('x'), Ty('y')
     >>> f0, f1 = Box('f0', x, y), Box('f1', y, x)
@@ -295,14 +571,136 @@ def foliation(self):
     >>> assert last_diagram == slices.flatten()
     """
     from discopy.monoidal import Diagram
-    *_, slices = self.foliate(yield_slices=True)
-    return self.upgrade(
-        Diagram(self.dom, self.cod, slices, len(slices) * [0]))
+    layers = _layers(self)
+    depth = max(layers, default=-1) + 1
+    columns, head, tail = self.columns, 0, 1
+    n_dom, n_cod = columns.n_dom.tolist(), columns.n_cod.tolist()
+    # All the wires and a marker for each scalar, in a doubly-linked list
+    # in the order they are drawn from left to right. A box or a state placed
+    # in a gap is inserted before its anchor, as if it was interchanged up.
+    nxt, prv, born, dies = [tail, None], [None, head], [None, None], [0, 0]
+
+    def insert(before, layer=None):
+        node = len(nxt)
+        nxt.append(before)
+        prv.append(prv[before])
+        nxt[prv[before]] = prv[before] = node
+        born.append(layer)
+        dies.append(depth)
+        return node
+
+    frontier = [insert(tail, -1) for _ in self.dom]
+    anchors, keys = frontier + [tail], []
+    for off, dom, cod, layer in zip(self.offsets, n_dom, n_cod, layers):
+        if dom:
+            outputs = [insert(frontier[off], layer) for _ in range(cod)]
+            keys.append(frontier[off])
+            for node in frontier[off: off + dom]:
+                dies[node] = layer
+            left = outputs[0] if cod and anchors[off] == frontier[off]\
+                else anchors[off]
+            anchors[off: off + dom + 1] = [left] + outputs[1:]\
+                + [anchors[off + dom]] if cod else [left]
+        elif cod:
+            outputs = [insert(anchors[off], layer) for _ in range(cod)]
+            keys.append(outputs[0])
+            anchors[off: off] = outputs
+        else:
+            outputs, anchors[off] = [], insert(anchors[off])
+            keys.append(anchors[off])
+        frontier[off: off + dom] = outputs
+    # Sweep the list, counting the wires to the left of each box which are
+    # alive at its layer with a Fenwick tree indexed by layers.
+    tree, boxes_of_key = (depth + 1) * [0], [[] for _ in nxt]
+    counts, ranks, node = len(keys) * [0], len(nxt) * [0], nxt[head]
+    for i, key in enumerate(keys):
+        boxes_of_key[key].append(i)
+
+    def add(layer, value):
+        while layer <= depth:
+            tree[layer], layer = tree[layer] + value, layer | (layer + 1)
+
+    def count(layer):
+        result = 0
+        while layer >= 0:
+            result, layer = result + tree[layer], (layer & (layer + 1)) - 1
+        return result
+
+    for rank in range(len(nxt) - 2):
+        ranks[node] = rank
+        for i in boxes_of_key[node]:
+            counts[i] = count(layers[i])
+        if born[node] is not None:
+            add(born[node] + 1, 1)
+            add(dies[node] + 1, -1)
+        node = nxt[node]
+    buckets = [[] for _ in range(depth)]
+    for i, layer in enumerate(layers):
+        buckets[layer].append(i)
+    boxes, offsets, slices = [], [], []
+    for bucket in buckets:
+        bucket.sort(key=lambda i: ranks[keys[i]])
+        shift, slice_offsets = 0, []
+        for i in bucket:
+            slice_offsets.append(counts[i] - shift)
+            shift += n_dom[i] - n_cod[i]
+        start = len(boxes)
+        for run in _touching_runs(bucket, slice_offsets, n_cod):
+            boxes_run, offsets_run = _insert_in_slice(
+                *run, n_dom, n_cod)
+            boxes += [self._boxes[i] for i in boxes_run]
+            offsets += offsets_run
+        slices.append((start, len(boxes)))
+    diagram = self.upgrade(Diagram(self.dom, self.cod, boxes, offsets))
+    return self.upgrade(Diagram(
+        self.dom, self.cod, [diagram[i:j] for i, j in slices],
+        len(slices) * [0]))
+
+
+def _touching_runs(bucket, offsets, n_cod):
+    """
+    Splits the boxes of a slice, sorted left to right, into runs of boxes
+    with no wire in between, the only ones :func:`foliate` may reorder.
+    """
+    start = 0
+    for k in range(1, len(bucket) + 1):
+        if k == len(bucket)\
+                or offsets[k] != offsets[k - 1] + n_cod[bucket[k - 1]]:
+            yield bucket[start: k], offsets[start: k]
+            start = k
+
+
+def _insert_in_slice(run, offsets, n_dom, n_cod):
+    """
+    Reorders a run of touching boxes in the same way as :func:`foliate`,
+    i.e. inserting them in the order of the diagram, each of them to the
+    right of the last box unless it is strictly to its left.
+    """
+    if len(run) == 1:
+        return run, offsets
+    # Offsets relative to the start of the run, before any box is applied.
+    start, order, positions, position = offsets[0], {}, {}, 0
+    for k, i in enumerate(run):
+        order[i], positions[i], position = k, position, position + n_dom[i]
+    result, result_offsets = [], []
+    for i in sorted(run):
+        off = start + positions[i] - sum(
+            n_dom[j] - n_cod[j] for j in result if order[j] < order[i])
+        result.append(i)
+        result_offsets.append(off)
+        k = len(result) - 1
+        while k and off < result_offsets[k - 1] + n_cod[result[k - 1]]:
+            j, off_j = result[k - 1], result_offsets[k - 1]
+            result[k - 1: k + 1] = [i, j]
+            result_offsets[k - 1: k + 1] = [off, off_j - n_dom[i] + n_cod[i]]
+            k -= 1
+    return result, result_offsets
 
 
 def depth(self):
     """
-    Computes the depth of a diagram by foliating it.
+    Computes the depth of a diagram, i.e. the number of slices in its
+    :meth:`Diagram.foliation`, as the longest path of boxes.
 
     >>> from discopy.monoidal import *
     >>> x, y = Ty('x'), Ty('y')
@@ -312,8 +710,45 @@ def depth(self):
     >>> assert (f @ g).depth() == 1
     >>> assert (f >> g).depth() == 2
     """
-    *_, slices = self.foliate(yield_slices=True)
-    return len(slices)
+    return max(_layers(self), default=-1) + 1
+
+
+def _layers(self):
+    """
+    The index of the slice of each box in :meth:`Diagram.foliation`.
+
+    Each wire remembers the depth of the box it comes out of. Each gap
+    between two wires remembers the depth of the box it is inside of, which
+    blocks the states and scalars placed in it, and the maximum depth of the
+    effects and scalars it holds, which block the boxes around it.
+    Otherwise boxes are interchanged as in :func:`interchange`.
+    """
+    columns = self.columns
+    n_dom, n_cod = columns.n_dom.tolist(), columns.n_cod.tolist()
+    wires = len(self.dom) * [0]
+    glue, marks = (len(self.dom) + 1) * [0], (len(self.dom) + 1) * [0]
+    layers = []
+    for off, dom, cod in zip(self.offsets, n_dom, n_cod):
+        if dom:
+            depth = 1 + max(wires[off: off + dom] + marks[off + 1: off + dom])
+        else:
+            depth = 1 + glue[off]
+        layers.append(depth - 1)
+        wires[off: off + dom] = cod * [depth]
+        if dom and cod:
+            glue[off + 1: off + dom] = (cod - 1) * [depth]
+            marks[off + 1: off + dom] = (cod - 1) * [0]
+        elif dom:
+            glue[off: off + dom + 1] = [glue[off]]
+            marks[off: off + dom + 1] = [
+                max(marks[off], marks[off + dom], depth)]
+        elif cod:
+            glue[off: off + 1] = [glue[off]]\
+                + (cod - 1) * [depth] + [glue[off]]
+            marks[off: off] = cod * [0]
+        else:
+            marks[off] = max(marks[off], depth)
+    return layers
 
 
 def width(self):
@@ -325,15 +760,19 @@ def width(self):
     >>> x = Ty('x')
     >>> f = Box('f', x, x ** 4)
     >>> assert (f @ Id(x ** 2) >> Id(x ** 2) @ f.dagger()).width() == 6
+    >>> assert Id(x ** 3).width() == 3
     """
-    return max(len(self.dom), max(
-        len(left @ box.cod @ right) for left, box, right in self.layers))
+    return int(self.columns.widths.max())
 
 
-def snake_removal(self, left=False):
+def snake_removal(self, left=False, interchange=True, steps=True):
     """
     Return a generator which yields normalization steps.
 
+    The snakes are removed first, then if :code:`interchange` the steps of
+    :meth:`monoidal.Diagram.normalize` follow. If not :code:`steps`, only the
+    diagram with all the snakes removed is yielded, see :func:`remove_snakes`.
+
     >>> from discopy.rigid import *
     >>> n, s = Ty('n'), Ty('s')
     >>> cup, cap = Cup(n, n.r), Cap(n.r, n)
@@ -360,7 +799,7 @@ def snake_removal(self, left=False):
         left_obstruction, right_obstruction = [], []
         while i < len(diagram) - 1:
             i += 1
-            box, off = diagram.boxes[i], diagram.offsets[i]
+            box, off = diagram._boxes[i], diagram._offsets[i]
             if off <= j < off + len(box.dom):
                 return i, j, (left_obstruction, right_obstruction)
             if off <= j:
@@ -374,21 +813,22 @@ def snake_removal(self, left=False):
         """
         Given a diagram, returns (cup, cap, obstructions, left_snake)
         if there is a yankable pair, otherwise returns None.
+        The wires are followed with :attr:`monoidal.Diagram.ports`.
         """
+        ports = diagram.ports
         for cap in range(len(diagram)):
-            if not isinstance(diagram.boxes[cap], Cap):
+            if not isinstance(diagram._boxes[cap], Cap):
                 continue
-            for left_snake, wire in [(True, diagram.offsets[cap]),
-                                     (False, diagram.offsets[cap] + 1)]:
-                cup, wire, obstructions =\
-                    follow_wire(diagram, cap, wire)
+            for left_snake, port in [(True, 0), (False, 1)]:
+                cup, cup_port = ports.consumer(cap, port)
                 not_yankable =\
                     cup == len(diagram)\
-                    or not isinstance(diagram.boxes[cup], Cup)\
-                    or left_snake and diagram.offsets[cup] + 1 != wire\
-                    or not left_snake and diagram.offsets[cup] != wire
+                    or not isinstance(diagram._boxes[cup], Cup)\
+                    or cup_port != port ^ 1
                 if not_yankable:
                     continue
+                _, _, obstructions = follow_wire(
+                    diagram, cap, diagram._offsets[cap] + port)
                 return cup, cap, obstructions, left_snake
         return None
 
@@ -426,18 +866,514 @@ def snake_removal(self, left=False):
                 diagram = diagram.interchange(box, cap)
                 yield diagram
                 cap += 1
-        boxes = diagram.boxes[:cap] + diagram.boxes[cup + 1:]
-        offsets = diagram.offsets[:cap] + diagram.offsets[cup + 1:]
+        boxes = diagram._boxes[:cap] + diagram._boxes[cup + 1:]
+        offsets = diagram._offsets[:cap] + diagram._offsets[cup + 1:]
         layers = diagram.layers[:cap] >> diagram.layers[cup + 1:]
         yield Diagram(diagram.dom, diagram.cod, boxes, offsets, layers)
 
     diagram = self
-    while True:
+    if not steps:
+        diagram = remove_snakes(self)
+        if len(diagram) < len(self):
+            yield diagram
+    while steps:
         yankable = find_snake(diagram)
         if yankable is None:
             break
         for _diagram in unsnake(diagram, *yankable):
             yield _diagram
             diagram = _diagram
-    for _diagram in monoidal.Diagram.normalize(diagram, left=left):
-        yield _diagram
+    if interchange:
+        for _diagram in monoidal.Diagram.normalize(diagram, left=left):
+            yield _diagram
+
+
+def _move(seq, offs, i, j, n_dom, n_cod, boxes, left=False, where=None):
+    """
+    Moves :code:`seq[i]` to :code:`seq[j]` in a list of boxes with offsets,
+    applying the same exchange moves as :func:`interchange`.
+    If given, the index :code:`where[box]` of each box is kept up to date.
+    """
+    for k in range(i, j) if i < j else range(i - 1, j - 1, -1):
+        box0, box1, off0, off1 = seq[k], seq[k + 1], offs[k], offs[k + 1]
+        # By default, we check if box0 is to the right first, then the left.
+        if left and off1 >= off0 + n_cod[box0]:  # box0 left of box1
+            off1 = off1 - n_cod[box0] + n_dom[box0]
+        elif off0 >= off1 + n_dom[box1]:  # box0 right of box1
+            off0 = off0 - n_dom[box1] + n_cod[box1]
+        elif off1 >= off0 + n_cod[box0]:  # box0 left of box1
+            off1 = off1 - n_cod[box0] + n_dom[box0]
+        else:
+            raise InterchangerError(boxes[box0], boxes[box1])
+        seq[k: k + 2], offs[k: k + 2] = [box1, box0], [off1, off0]
+        if where is not None:
+            where[box1], where[box0] = k, k + 1
+
+
+def remove_snakes(self):
+    """
+    Removes all the snakes of a rigid diagram, with the same moves as
+    :func:`snake_removal` but without building the diagrams in between.
+
+    The wires are indexed once with :attr:`Diagram.ports`, each box output
+    pointing to the box input it is plugged into. The caps plugged into a
+    cup are kept on a heap, sorted by their position in the diagram.
+    Yanking a snake only moves the boxes in between, as integers, and may
+    plug a new cap into a cup.
+
+    Examples
+    --------
+    >>> from discopy.rigid import *
+    >>> n, s = Ty('n'), Ty('s')
+    >>> cup, cap = Cup(n, n.r), Cap(n.r, n)
+    >>> f, g, h = Box('f', n, n), Box('g', s @ n, n), Box('h', n, n @ s)
+    >>> diagram = g @ cap >> f[::-1] @ Id(n.r) @ f >> cup @ h
+    >>> print(remove_snakes(diagram))
+    g >> f[::-1] >> f >> h
+    >>> *_, last_step = diagram.normalize(interchange=False)
+    >>> assert remove_snakes(diagram) == last_step
+    """
+    from heapq import heappush, heappop
+    from discopy.rigid import Diagram, Cup, Cap
+    boxes, n_boxes = self.boxes, len(self)
+    n_dom = [len(box.dom) for box in boxes]
+    n_cod = [len(box.cod) for box in boxes]
+    is_cup = [isinstance(box, Cup) for box in boxes]
+    # Copy of the connectivity index of the diagram, updated after each yank.
+    ports = self.ports
+    source, target = ports.inputs.tolist(), ports.outputs.tolist()
+    in_box, in_pos = ports.in_box.tolist(), ports.in_pos.tolist()
+    in_start, out_start = ports.in_start.tolist(), ports.out_start.tolist()
+    out_box = ports.out_box.tolist()
+    # The diagram is a doubly-linked list of boxes with their offsets. The
+    # positions of the boxes are only used to compare them.
+    nxt = {i: i + 1 for i in range(-1, n_boxes)}
+    prv = {i: i - 1 for i in range(n_boxes + 1)}
+    offsets, position = list(self.offsets), list(range(n_boxes))
+
+    def yankable(cap):
+        for left_snake, port in [(True, 0), (False, 1)]:
+            wire = target[out_start[cap + 1] + port]
+            cup = in_box[wire]
+            if cup < n_boxes and is_cup[cup]\
+                    and in_pos[wire] == int(left_snake):
+                return cup, left_snake
+        return None
+
+    def move(seq, offs, i, j):
+        _move(seq, offs, i, j, n_dom, n_cod, boxes)
+
+    heap = []
+    for i, box in enumerate(boxes):
+        if isinstance(box, Cap):
+            heappush(heap, (i, i))
+    while heap:
+        pos, cap = heappop(heap)
+        if pos != position[cap] or yankable(cap) is None:
+            continue
+        cup, left_snake = yankable(cap)
+        seq, wire = [cap], offsets[cap] + int(not left_snake)
+        while seq[-1] != cup:
+            seq.append(nxt[seq[-1]])
+        offs, left_obstruction, right_obstruction = [
+            offsets[i] for i in seq], [], []
+        for k, i in enumerate(seq[1:-1], 1):
+            if offs[k] <= wire:
+                wire += n_cod[i] - n_dom[i]
+                left_obstruction.append(k)
+            else:
+                right_obstruction.append(k)
+        first, last = 0, len(seq) - 1
+        if left_snake:
+            for k in left_obstruction:
+                move(seq, offs, k, first)
+                right_obstruction = [
+                    r + 1 if r < k else r for r in right_obstruction]
+                first += 1
+            for k in right_obstruction[::-1]:
+                move(seq, offs, k, last)
+                last -= 1
+        else:
+            for k in left_obstruction[::-1]:
+                move(seq, offs, k, last)
+                right_obstruction = [
+                    r - 1 if r > k else r for r in right_obstruction]
+                last -= 1
+            for k in right_obstruction:
+                move(seq, offs, k, first)
+                first += 1
+        # Relink the boxes in between, reusing their positions in order.
+        before, after = prv[cap], nxt[cup]
+        del seq[first: last + 1], offs[first: last + 1]
+        for i, new_position in zip(seq, sorted(position[i] for i in seq)):
+            if isinstance(boxes[i], Cap) and position[i] != new_position:
+                heappush(heap, (new_position, i))
+            position[i] = new_position
+        for i, off in zip(seq, offs):
+            offsets[i], prv[i], nxt[before], before = off, before, i, i
+        nxt[before], prv[after] = after, before
+        position[cap] = position[cup] = None
+        # Plug the wires which went through the snake into each other.
+        wire = source[in_start[cup + 1] + int(not left_snake)]
+        plug = target[out_start[cap + 1] + int(left_snake)]
+        target[wire], source[plug], box = plug, wire, out_box[wire]
+        if box >= 0 and isinstance(boxes[box], Cap):
+            heappush(heap, (position[box], box))
+    result, i = [], nxt[-1]
+    while i < n_boxes:
+        result.append(i)
+        i = nxt[i]
+    return self.upgrade(Diagram(
+        self.dom, self.cod, [boxes[i] for i in result],
+        [offsets[i] for i in result]))
+
+
+def rewrite(self, *rules, max_steps=None):
+    """
+    Applies rewrite rules until none of them matches, see :class:`Rewriter`.
+
+    Parameters
+    ----------
+    rules : :class:`Rule`
+        The rules to apply.
+    max_steps : int, optional
+        The maximum number of rewrites, no bound by default.
+
+    Examples
+    --------
+    >>> from discopy.monoidal import Ty, Box, Id
+    >>> x = Ty('x')
+    >>> f, g = Box('f', x, x), Box('g', x @ x, x)
+    >>> diagram = f @ f >> g >> f >> f[::-1]
+    >>> print(diagram.rewrite(Rule(f @ f >> g, g), Rule(f >> f[::-1], Id(x))))
+    g
+    """
+    return Rewriter(*rules)(self, max_steps=max_steps)
+
+
+class Rule:
+    """
+    A rewrite rule, i.e. a pair of diagrams :code:`lhs -> rhs` with the same
+    domain and codomain.
+
+    Parameters
+    ----------
+    lhs : :class:`discopy.monoidal.Diagram`
+        The pattern to match, a non-empty connected diagram.
+    rhs : :class:`discopy.monoidal.Diagram`
+        The diagram to replace each match with.
+    name : str, optional
+        The name of the rule, its string representation by default.
+
+    Raises
+    ------
+    :class:`discopy.cat.AxiomError`
+        If :code:`lhs` and :code:`rhs` have different types.
+    ValueError
+        If :code:`lhs` is empty or not connected.
+
+    Examples
+    --------
+    >>> from discopy.monoidal import Ty, Box, Id
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f = Box('f', x, y)
+    >>> print(Rule(f >> f[::-1], Id(x)))
+    f >> f[::-1] -> Id(x)
+    >>> Rule(f @ f, Id(x) @ f >> f @ Id(y))
+    Traceback (most recent call last):
+    ...
+    ValueError: f @ Id(x) >> Id(y) @ f is not connected.
+    """
+    def __init__(self, lhs, rhs, name=None):
+        if (lhs.dom, lhs.cod) != (rhs.dom, rhs.cod):
+            raise cat.AxiomError(messages.rule_types_do_not_match(lhs, rhs))
+        n_boxes, ports = len(lhs), lhs.ports
+        # Check that the boxes of lhs are connected, with no wire going
+        # straight from domain to codomain.
+        parent = list(range(n_boxes))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = i = parent[parent[i]]
+            return i
+        for i, box in enumerate(lhs.boxes):
+            for port in range(len(box.cod)):
+                j, _ = ports.consumer(i, port)
+                if j < n_boxes:
+                    parent[find(i)] = find(j)
+        if not n_boxes or len({find(i) for i in range(n_boxes)}) > 1 or any(
+                ports.consumer(-1, port)[0] == n_boxes
+                for port in range(len(lhs.dom))):
+            raise ValueError(messages.is_not_connected(lhs))
+        self.lhs, self.rhs = lhs, rhs
+        self.name = name or str(self)
+        self.producers = [
+            [ports.producer(i, port) for port in range(len(box.dom))]
+            for i, box in enumerate(lhs.boxes)]
+        self.consumers = [
+            [ports.consumer(i, port) for port in range(len(box.cod))]
+            for i, box in enumerate(lhs.boxes)]
+        self.dom = [ports.consumer(-1, port) for port in range(len(lhs.dom))]
+        self.cod = [
+            ports.producer(n_boxes, port) for port in range(len(lhs.cod))]
+        self.anchors = {}
+        for i, box in enumerate(lhs.boxes):
+            self.anchors.setdefault(box, []).append(i)
+
+    def __repr__(self):
+        return "Rule({}, {}, name={})".format(
+            repr(self.lhs), repr(self.rhs), repr(self.name))
+
+    def __str__(self):
+        return "{} -> {}".format(self.lhs, self.rhs)
+
+
+class Rewriter:
+    """
+    Applies a list of rewrite rules to a diagram until none of them matches.
+
+    Each box is looked up in an index from boxes to their positions in the
+    left-hand sides, matches are then extended along the connectivity of
+    the diagram, see :class:`discopy.monoidal.Ports`, rather than by
+    scanning the whole diagram. After each rewrite we only look for new
+    matches around the boxes that were created.
+
+    Parameters
+    ----------
+    rules : :class:`Rule`
+        The rules to apply, the first one that matches is applied.
+
+    Attributes
+    ----------
+    stats : dict
+        From the name of each rule to the number of times it was applied
+        and the time in seconds spent matching and applying it.
+
+    Notes
+    -----
+    A match is a set of boxes with the same connectivity as :code:`lhs`,
+    which is convex and planar, i.e. the boxes in between can be
+    interchanged out of the way so that :code:`lhs` appears as a slice of
+    the diagram.
+
+    Examples
+    --------
+    >>> from discopy.monoidal import Ty, Box, Id
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g, h = Box('f', x, y), Box('g', y, y), Box('h', x, x)
+    >>> cancel = Rule(f >> f[::-1], Id(x), name="cancel")
+    >>> rewriter = Rewriter(cancel)
+    >>> diagram = f @ f >> f[::-1] @ g >> h @ f[::-1]
+    >>> print(rewriter(diagram))
+    Id(x) @ f >> Id(x) @ g >> h @ Id(y) >> Id(x) @ f[::-1]
+    >>> rewriter.stats["cancel"][0]
+    1
+    >>> print(rewriter(f >> f[::-1] >> f >> f[::-1] >> h))
+    h
+    >>> rewriter.stats["cancel"][0]
+    3
+    """
+    def __init__(self, *rules):
+        self.rules = rules
+        self.stats = {rule.name: [0, 0.] for rule in rules}
+
+    def __call__(self, diagram, max_steps=None):
+        from time import perf_counter
+        from discopy.monoidal import Diagram
+        state = _RewriteState(diagram)
+        worklist, steps = list(range(len(diagram))), 0
+        pending = set(worklist)
+        while worklist and (max_steps is None or steps < max_steps):
+            node = worklist.pop()
+            pending.discard(node)
+            if node not in state.boxes:
+                continue
+            for rule in self.rules:
+                start, new = perf_counter(), None
+                for i in rule.anchors.get(state.boxes[node], ()):
+                    new = state.rewrite(rule, i, node)
+                    if new is not None:
+                        break
+                stats = self.stats[rule.name]
+                stats[1] += perf_counter() - start
+                if new is not None:
+                    stats[0] += 1
+                    steps += 1
+                    for neighbour in new:
+                        if neighbour not in pending:
+                            pending.add(neighbour)
+                            worklist.append(neighbour)
+                    break
+        boxes, offsets, node = [], [], state.nxt[-1]
+        while node != -2:
+            boxes.append(state.boxes[node])
+            offsets.append(state.offsets[node])
+            node = state.nxt[node]
+        return diagram.upgrade(
+            Diagram(diagram.dom, diagram.cod, boxes, offsets))
+
+
+class _RewriteState:
+    """
+    A diagram as a doubly-linked list of boxes with their offsets and its
+    connectivity, updated after each rewrite.
+
+    Boxes are numbered by the order in which they are created. The domain
+    is the box :code:`-1`, the codomain the box :code:`-2`.
+    """
+    def __init__(self, diagram):
+        n_boxes, ports = len(diagram), diagram.ports
+        self.boxes = dict(enumerate(diagram.boxes))
+        self.offsets = dict(enumerate(diagram.offsets))
+        self.n_dom = {i: len(box.dom) for i, box in self.boxes.items()}
+        self.n_cod = {i: len(box.cod) for i, box in self.boxes.items()}
+        self.nxt = {i: i + 1 for i in range(-1, n_boxes - 1)}
+        self.nxt[-1 if not n_boxes else n_boxes - 1] = -2
+        self.prv = {j: i for i, j in self.nxt.items()}
+        self.position = {i: float(i) for i in range(-1, n_boxes)}
+        self.position[-2] = float(n_boxes)
+        box_id = list(range(-1, n_boxes)) + [-2]
+        in_box = [box_id[i + 1] for i in ports.in_box.tolist()]
+        out_box = [box_id[i + 1] for i in ports.out_box.tolist()]
+        in_pos, out_pos = ports.in_pos.tolist(), ports.out_pos.tolist()
+        self.source, self.target = {}, {}
+        for wire, plug in enumerate(ports.inputs.tolist()):
+            self.source[in_box[wire], in_pos[wire]] = (
+                out_box[plug], out_pos[plug])
+            self.target[out_box[plug], out_pos[plug]] = (
+                in_box[wire], in_pos[wire])
+        self.n_nodes = n_boxes
+
+    def match(self, rule, i, node):
+        """ Extends :code:`{i: node}` to a match of :code:`rule.lhs`. """
+        lhs, boxes, matching = rule.lhs, self.boxes, {i: node}
+        n_boxes, stack = len(lhs), [i]
+        while stack:
+            i = stack.pop()
+            node = matching[i]
+            for plugs, neighbours, external in [
+                    (rule.producers[i], self.source, -1),
+                    (rule.consumers[i], self.target, n_boxes)]:
+                for port, (j, k) in enumerate(plugs):
+                    other, other_port = neighbours[node, port]
+                    if j == external:
+                        continue
+                    if other < 0 or other_port != k\
+                            or boxes[other] != lhs.boxes[j]:
+                        return None
+                    if j not in matching:
+                        if other in matching.values():
+                            return None
+                        matching[j] = other
+                        stack.append(j)
+                    elif matching[j] != other:
+                        return None
+        nodes = set(matching.values())
+        for i, node in matching.items():
+            for port, (j, _) in enumerate(rule.producers[i]):
+                if j == -1 and self.source[node, port][0] in nodes:
+                    return None
+            for port, (j, _) in enumerate(rule.consumers[i]):
+                if j == n_boxes and self.target[node, port][0] in nodes:
+                    return None
+        return matching
+
+    def rewrite(self, rule, i, node):
+        """
+        Applies :code:`rule` at a match of box :code:`i` of its left-hand
+        side with :code:`node`, returns the boxes around the new ones or
+        :code:`None` if there is no such match.
+        """
+        matching = self.match(rule, i, node)
+        if matching is None:
+            return None
+        lhs, rhs, position = rule.lhs, rule.rhs, self.position
+        nodes = set(matching.values())
+        first = min(nodes, key=position.__getitem__)
+        last = max(nodes, key=position.__getitem__)
+        before, after = self.prv[first], self.nxt[last]
+        seq = [first]
+        while seq[-1] != last:
+            seq.append(self.nxt[seq[-1]])
+        # Boxes in between go down if they depend on the match, up otherwise.
+        down, up = set(), []
+        for node in seq:
+            depends = any(
+                self.source[node, port][0] in nodes
+                or self.source[node, port][0] in down
+                for port in range(self.n_dom[node]))
+            if node in nodes and depends and any(
+                    self.source[node, port][0] in down
+                    for port in range(self.n_dom[node])):
+                return None
+            if node not in nodes:
+                if depends:
+                    down.add(node)
+                else:
+                    up.append(node)
+        offs, where = [self.offsets[node] for node in seq], {
+            node: k for k, node in enumerate(seq)}
+        args = (self.n_dom, self.n_cod, self.boxes, False, where)
+        try:
+            for k, node in enumerate(up):
+                _move(seq, offs, where[node], k, *args)
+            end = len(seq) - 1
+            for node in [node for node in seq[::-1] if node in down]:
+                _move(seq, offs, where[node], end, *args)
+                end -= 1
+            for k in range(len(lhs)):
+                _move(seq, offs, where[matching[k]], len(up) + k, *args)
+        except InterchangerError:
+            return None
+        base = offs[len(up)] - lhs.offsets[0]
+        if base < 0 or any(
+                offs[len(up) + k] != base + off
+                for k, off in enumerate(lhs.offsets)):
+            return None
+        # Plug the boundary of the match into the new boxes.
+        inputs = [self.source[matching[j], port] for j, port in rule.dom]
+        outputs = [self.target[matching[j], port] for j, port in rule.cod]
+        for node in nodes:
+            for port in range(self.n_dom[node]):
+                del self.source[node, port]
+            for port in range(self.n_cod[node]):
+                del self.target[node, port]
+            for attr in [self.boxes, self.offsets, self.n_dom, self.n_cod,
+                         self.position, self.nxt, self.prv]:
+                del attr[node]
+        new = list(range(self.n_nodes, self.n_nodes + len(rhs)))
+        self.n_nodes += len(rhs)
+        for node, box, off in zip(new, rhs.boxes, rhs.offsets):
+            self.boxes[node], self.offsets[node] = box, base + off
+            self.n_dom[node], self.n_cod[node] = len(box.dom), len(box.cod)
+        ports = rhs.ports
+
+        def plug(j, port):
+            return inputs[port] if j == -1 else (new[j], port)
+        for j, box in enumerate(rhs.boxes):
+            for port in range(len(box.dom)):
+                wire = plug(*ports.producer(j, port))
+                self.source[new[j], port] = wire
+                self.target[wire] = (new[j], port)
+        for port, wire in enumerate(outputs):
+            self.target[plug(*ports.producer(len(rhs), port))] = wire
+            self.source[wire] = plug(*ports.producer(len(rhs), port))
+        # Relink the list of boxes and spread their positions in between.
+        for node, off in zip(seq, offs):
+            if node not in nodes:
+                self.offsets[node] = off
+        seq[len(up): len(up) + len(lhs)] = new
+        low, high = position[before], position[after]
+        for node in seq:
+            self.prv[node], self.nxt[before], before = before, node, node
+        self.nxt[before], self.prv[after] = after, before
+        step = (high - low) / (len(seq) + 1)
+        if step > 1e-6:
+            for k, node in enumerate(seq, 1):
+                position[node] = low + k * step
+        else:
+            node, k = -1, 0
+            while node != -2:
+                node, k = self.nxt[node], k + 1
+                position[node] = float(k)
+        return new + [node for node, _ in inputs + outputs if node >= 0]
@@ -28,9 +28,20 @@ class Ob(cat.Ob):
     """
     Implements simple pregroup types: basic types and their iterated adjoints.
 
+    Note
+    ----
+    Unlike the other objects, :class:`Ob` does not declare :code:`__slots__`:
+    :class:`Ty` subclasses both :class:`Ob` and :class:`monoidal.Ty`, and
+    Python cannot lay out the slots of two such bases in one instance.
+    Instead, the winding number defaults to the class attribute :code:`_z`,
+    so the :code:`__dict__` of an object stays empty unless it is adjoint.
+
     >>> a = Ob('a')
     >>> assert a.l.r == a.r.l == a and a != a.l.l != a.r.r
+    >>> assert vars(a) == {} and vars(a.l) == {'_z': -1}
     """
+    _z = 0
+
     @property
     def z(self):
         """ Winding number """
@@ -49,19 +60,27 @@ class Ob(cat.Ob):
     def __init__(self, name, z=0):
         if not isinstance(z, int):
             raise TypeError(messages.type_err(int, z))
-        self._z = z
+        if z:
+            self._z = z
         super().__init__(name)
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Ob):
             if isinstance(other, cat.Ob):
                 return self.z == 0 and self.name == other.name
             return False
+        if self._interned and other._interned and type(self) is type(other):
+            return False
         return (self.name, self.z) == (other.name, other.z)
 
     def __hash__(self):
         return hash(self.name if not self.z else (self.name, self.z))
 
+    def _intern_key(self):
+        return type(self), self.name, self.z
+
     def __repr__(self):
         return "Ob({}{})".format(
             repr(self.name), ", z=" + repr(self.z) if self.z else '')
@@ -129,6 +148,8 @@ class PRO(monoidal.PRO, Ty):
     """
     Objects of the free rigid monoidal category generated by 1.
     """
+    __slots__ = ()
+
     @staticmethod
     def upgrade(old):
         return PRO(len(monoidal.PRO.upgrade(old)))
@@ -146,6 +167,8 @@ class PRO(monoidal.PRO, Ty):
 
 
 class Layer(monoidal.Layer):
+    __slots__ = ()
+
     @staticmethod
     def upgrade(old):
         return Layer(old._left, old._box, old._right)
@@ -279,20 +302,14 @@ class Diagram(monoidal.Diagram):
             >> diagram @ Id(wires.l)
 
     def _conjugate(self, use_left):
-        layers = self.layers
-        list_of_layers = []
-        for layer in layers._boxes:
-            layer_adj = layer.l if use_left else layer.r
-            left, box, right = layer_adj
-            list_of_layers += (Id(left) @ box @ Id(right)).layers.boxes
-
-        dom = layers.dom.l if use_left else layers.dom.r
-        cod = layers.cod.l if use_left else layers.cod.r
-        layers_adj = type(layers)(dom, cod, list_of_layers)
-        boxes_and_offsets = tuple(zip(*(
-            (box, len(left)) for left, box, _ in layers_adj))) or ([], [])
-        inputs = (dom, cod) + boxes_and_offsets
-        return self.upgrade(Diagram(*inputs, layers=layers_adj))
+        boxes, offsets = [], []
+        for _, box, right in self.layers:
+            box = box.l if use_left else box.r
+            boxes += box.boxes
+            offsets += [len(right) + off for off in box.offsets]
+        dom = self.dom.l if use_left else self.dom.r
+        cod = self.cod.l if use_left else self.cod.r
+        return self.upgrade(Diagram(dom, cod, boxes, offsets, _scan=False))
 
     @property
     def l(self):
@@ -302,26 +319,18 @@ class Diagram(monoidal.Diagram):
     def r(self):
         return self._conjugate(use_left=False)
 
-    def dagger(self):
-        d = super().dagger()
-        d._layers._boxes = [Layer.upgrade(b) for b in d._layers._boxes]
-        return d
-
     def transpose_box(self, i, left=False):
         bend_left = left
-        layers = self.layers
+        left, box, _ = self.layers[i]
         if bend_left:
-            box_T = layers[i]._box.r.dagger().transpose(left=True)
+            box_T = box.r.dagger().transpose(left=True)
         else:
-            box_T = layers[i]._box.l.dagger().transpose(left=False)
-        left, _, right = layers[i]
-        layers_T = (Id(left) @ box_T @ Id(right)).layers.boxes
-        list_of_layers = layers._boxes[:i] + layers_T + layers._boxes[i + 1:]
-        layers = type(layers)(layers.dom, layers.cod, list_of_layers)
-        boxes_and_offsets = tuple(zip(*(
-            (box, len(left)) for left, box, _ in layers))) or ([], [])
-        inputs = (layers.dom, layers.cod) + boxes_and_offsets
-        return self.upgrade(Diagram(*inputs, layers=layers))
+            box_T = box.l.dagger().transpose(left=False)
+        boxes = self.boxes[:i] + box_T.boxes + self.boxes[i + 1:]
+        offsets = self.offsets[:i] + [
+            len(left) + off for off in box_T.offsets] + self.offsets[i + 1:]
+        return self.upgrade(
+            Diagram(self.dom, self.cod, boxes, offsets, _scan=False))
 
     def transpose(self, left=False):
         """
@@ -352,13 +361,21 @@ class Diagram(monoidal.Diagram):
             >> self.id(self.dom.r) @ self @ self.id(self.cod.r)\
             >> self.id(self.dom.r) @ self.cups(self.cod, self.cod.r)
 
-    def normal_form(self, normalizer=None, **params):
+    def normal_form(self, normalizer=None, method="dag", **params):
         """
         Implements the normalisation of rigid monoidal categories,
         see arxiv:1601.05372, definition 2.12.
+
+        With :code:`method="dag"`, the snakes are removed without building the
+        intermediate steps, see :func:`rewriting.remove_snakes`, then the
+        monoidal normal form is computed directly.
         """
+        if normalizer is None and method == "dag":
+            return monoidal.Diagram.normal_form(
+                rewriting.remove_snakes(self), **params)
         return super().normal_form(
-            normalizer=normalizer or Diagram.normalize, **params)
+            normalizer=normalizer or Diagram.normalize, method=method,
+            **params)
 
     normalize = rewriting.snake_removal
     layer_factory = Layer
@@ -410,9 +427,12 @@ class Box(monoidal.Box, Diagram):
     >>> Box('f', a, b.l @ b, data={42})
     Box('f', Ty('a'), Ty(Ob('b', z=-1), 'b'), data={42})
     """
+    __slots__ = ('_z', )
+
     def __init__(self, name, dom, cod, **params):
         monoidal.Box.__init__(self, name, dom, cod, **params)
-        Diagram.__init__(self, dom, cod, [self], [0], layers=self.layers)
+        Diagram.__init__(
+            self, dom, cod, [self], monoidal.BOX_OFFSETS, _scan=False)
         self._z = params.get("_z", 0)
 
     def __eq__(self, other):
@@ -423,8 +443,11 @@ class Box(monoidal.Box, Diagram):
                 and (other.dom, other.cod) == (self.dom, self.cod)
         return False
 
-    def __hash__(self):
-        return hash(repr(self))
+    __hash__ = monoidal.Box.__hash__
+
+    def _intern_key(self):
+        key = monoidal.Box._intern_key(self)
+        return None if key is None else key + (self._z, )
 
     @property
     def z(self):
@@ -648,8 +671,10 @@ class Functor(monoidal.Functor):
     .. image:: ../_static/imgs/rigid/functor-example.png
         :align: center
     """
-    def __init__(self, ob, ar, ob_factory=Ty, ar_factory=Diagram):
-        super().__init__(ob, ar, ob_factory=ob_factory, ar_factory=ar_factory)
+    def __init__(self, ob, ar, ob_factory=Ty, ar_factory=Diagram,
+                 cache_size=None):
+        super().__init__(ob, ar, ob_factory=ob_factory, ar_factory=ar_factory,
+                         cache_size=cache_size)
 
     def __call__(self, diagram):
         if isinstance(diagram, monoidal.Ty):
@@ -11,12 +11,15 @@ Implements dagger monoidal functors into tensors.
 >>> assert F(Alice >> loves >> Bob.dagger()) == 1
 """
 from contextlib import contextmanager
+from copy import copy
+from functools import reduce
 
 import numpy
 
 from discopy import cat, config, messages, monoidal, rigid
 from discopy.cat import AxiomError
 from discopy.rigid import Ob, Ty, Cup, Cap
+from discopy.utils import LRUCache
 
 
 numpy.set_printoptions(threshold=config.NUMPY_THRESHOLD)
@@ -28,6 +31,37 @@ def array2string(array, **params):
         .replace('[ ', '[').replace('  ', ' ')
 
 
+def complex_array(array):
+    """
+    Promotes an array to complex numbers, without copying complex arrays.
+
+    >>> array = numpy.array([1j, 0])
+    >>> assert complex_array(array) is array
+    >>> complex_array([1, 0])
+    array([1.+0.j, 0.+0.j])
+    """
+    array = Tensor.np.asarray(array)
+    if getattr(array, "dtype", None) == object:
+        return array + 0j
+    return Tensor.np.asarray(array, dtype=complex)
+
+
+def float_array(array):
+    """
+    Promotes an array to at least the float type of the backend, i.e. that
+    of :code:`Tensor.np.eye`, without copying arrays that are already.
+
+    >>> array = numpy.array([1., 0.])
+    >>> assert float_array(array) is array
+    >>> float_array(numpy.array([1, 0]))
+    array([1., 0.])
+    """
+    array = Tensor.np.asarray(array)
+    dtype = Tensor.np.result_type(array, Tensor.np.eye(1))
+    return array if array.dtype == dtype\
+        else Tensor.np.asarray(array, dtype=dtype)
+
+
 class Dim(Ty):
     """ Implements dimensions as tuples of positive integers.
     Dimensions form a monoid with product @ and unit Dim(1).
@@ -35,6 +69,8 @@ class Dim(Ty):
     >>> Dim(1) @ Dim(2) @ Dim(3)
     Dim(2, 3)
     """
+    __slots__ = ()
+
     @staticmethod
     def upgrade(old):
         return Dim(*[x.name for x in old.objects])
@@ -60,9 +96,6 @@ class Dim(Ty):
     def __str__(self):
         return repr(self)
 
-    def __hash__(self):
-        return hash(repr(self))
-
     @property
     def l(self):
         """
@@ -100,7 +133,7 @@ class PyTorchBackend(TensorBackend):
     def __init__(self):
         import torch
         self.module = torch
-        self.array = torch.as_tensor
+        self.array = self.asarray = torch.as_tensor
 
 
 class TensorFlowBackend(TensorBackend):
@@ -176,7 +209,17 @@ class Tensor(rigid.Box, metaclass=TensorType):
     ...     f = lambda *xs: d.lambdify(phi, psi)(*xs).array
     ...     import jax
     ...     assert jax.grad(f)(1., 2.) == 2.
+
+    Swaps, daggers and tensor products only permute the axes of arrays,
+    these permutations are composed lazily and applied when the array is
+    needed, or folded into the axes of :code:`tensordot` in composition.
+
+    >>> swap = Tensor.swap(Dim(2), Dim(3)) @ Tensor.id(Dim(4))
+    >>> swap._axes
+    (0, 1, 2, 4, 5, 3, 6)
+    >>> assert swap.dagger() >> swap == Tensor.id(Dim(2, 3, 4))
     """
+    __slots__ = ('_array', '_axes')
     _backend_stack = [get_backend('jax' if config.IMPORT_JAX else 'numpy')]
 
     @classmethod
@@ -198,9 +241,28 @@ class Tensor(rigid.Box, metaclass=TensorType):
             cls._backend_stack.pop()
 
     def __init__(self, dom, cod, array):
-        self._array = Tensor.np.array(array).reshape(tuple(dom @ cod))
+        self._array = Tensor.np.asarray(array).reshape(tuple(dom @ cod))
+        self._axes = None
         super().__init__("Tensor", dom, cod)
 
+    @staticmethod
+    def _permute(dom, cod, array, axes):
+        """
+        The tensor with the axis :code:`axes[i]` of :code:`array` in
+        position :code:`i`, without moving :code:`array` in memory yet.
+        """
+        tensor = Tensor.__new__(Tensor)
+        tensor._array, tensor._axes = array, tuple(axes)
+        if tensor._axes == tuple(range(len(axes))):
+            tensor._axes = None
+        super(Tensor, tensor).__init__("Tensor", dom, cod)
+        return tensor
+
+    @property
+    def _pending(self):
+        """ The pending permutation of the axes of :code:`self._array`. """
+        return self._axes or tuple(range(len(self.dom @ self.cod)))
+
     def __iter__(self):
         for i in self.array:
             yield i
@@ -208,6 +270,10 @@ class Tensor(rigid.Box, metaclass=TensorType):
     @property
     def array(self):
         """ Numpy array. """
+        if self._axes is not None:
+            self._array = Tensor.np.moveaxis(
+                self._array, self._axes, tuple(range(len(self._axes))))
+            self._axes = None
         return self._array
 
     def __bool__(self):
@@ -252,41 +318,50 @@ class Tensor(rigid.Box, metaclass=TensorType):
             and Tensor.np.all(Tensor.np.array(self.array == other.array))
 
     def then(self, *others):
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if len(others) != 1:
+            return reduce(lambda f, g: f.then(g), others, self)
+        if isinstance(others[0], Sum):
             return monoidal.Diagram.then(self, *others)
         other, = others
         if not isinstance(other, Tensor):
             raise TypeError(messages.type_err(Tensor, other))
         if self.cod != other.dom:
             raise AxiomError(messages.does_not_compose(self, other))
-        array = Tensor.np.tensordot(self.array, other.array, len(self.cod))\
-            if self.array.shape and other.array.shape\
-            else self.array * other.array
-        return Tensor(self.dom, other.cod, array)
+        left, right = self._pending, other._pending
+        if not (self._array.shape and other._array.shape):
+            return Tensor._permute(
+                self.dom, other.cod, self._array * other._array, left + right)
+        contracted = list(left[len(self.dom):]), list(right[:len(other.dom)])
+        kept_left = [i for i in range(len(left)) if i not in contracted[0]]
+        kept_right = [i for i in range(len(right)) if i not in contracted[1]]
+        array = Tensor.np.tensordot(self._array, other._array, contracted)
+        axes = [kept_left.index(i) for i in left[:len(self.dom)]] + [
+            len(kept_left) + kept_right.index(i)
+            for i in right[len(other.dom):]]
+        return Tensor._permute(self.dom, other.cod, array, axes)
 
     def tensor(self, *others):
-        if len(others) != 1 or any(isinstance(other, Sum) for other in others):
+        if len(others) != 1:
+            return reduce(lambda f, g: f.tensor(g), others, self)
+        if isinstance(others[0], Sum):
             return monoidal.Diagram.tensor(self, *others)
         other = others[0]
         if not isinstance(other, Tensor):
             raise TypeError(messages.type_err(Tensor, other))
         dom, cod = self.dom @ other.dom, self.cod @ other.cod
-        array = Tensor.np.tensordot(self.array, other.array, 0)\
-            if self.array.shape and other.array.shape\
-            else self.array * other.array
-        source = range(len(dom @ cod))
-        target = [
-            i if i < len(self.dom) or i >= len(self.dom @ self.cod @ other.dom)
-            else i - len(self.cod) if i >= len(self.dom @ self.cod)
-            else i + len(other.dom) for i in source]
-        return Tensor(dom, cod, Tensor.np.moveaxis(array, source, target))
+        array = Tensor.np.tensordot(self._array, other._array, 0)\
+            if self._array.shape and other._array.shape\
+            else self._array * other._array
+        left, right = self._pending, other._pending
+        right = tuple(len(left) + i for i in right)
+        axes = left[:len(self.dom)] + right[:len(other.dom)]\
+            + left[len(self.dom):] + right[len(other.dom):]
+        return Tensor._permute(dom, cod, array, axes)
 
     def dagger(self):
-        array = Tensor.np.moveaxis(
-            self.array, range(len(self.dom @ self.cod)),
-            [i + len(self.cod) if i < len(self.dom) else
-             i - len(self.dom) for i in range(len(self.dom @ self.cod))])
-        return Tensor(self.cod, self.dom, Tensor.np.conjugate(array))
+        axes = self._pending[len(self.dom):] + self._pending[:len(self.dom)]
+        return Tensor._permute(
+            self.cod, self.dom, Tensor.np.conjugate(self._array), axes)
 
     @staticmethod
     def id(dom=Dim(1)):
@@ -307,11 +382,11 @@ class Tensor(rigid.Box, metaclass=TensorType):
     @staticmethod
     def swap(left, right):
         array = Tensor.id(left @ right).array
-        source = range(len(left @ right), 2 * len(left @ right))
-        target = [i + len(right) if i < len(left @ right @ left)
-                  else i - len(left) for i in source]
-        return Tensor(left @ right, right @ left,
-                      Tensor.np.moveaxis(array, source, target))
+        n_left, n_right = len(left), len(right)
+        axes = tuple(range(n_left + n_right))\
+            + tuple(range(2 * n_left + n_right, 2 * (n_left + n_right)))\
+            + tuple(range(n_left + n_right, 2 * n_left + n_right))
+        return Tensor._permute(left @ right, right @ left, array, axes)
 
     def transpose(self, left=False):
         """
@@ -321,7 +396,8 @@ class Tensor(rigid.Box, metaclass=TensorType):
         ----
         This is *not* the same as the algebraic transpose for complex dims.
         """
-        return Tensor(self.cod[::-1], self.dom[::-1], self.array.transpose())
+        return Tensor._permute(
+            self.cod[::-1], self.dom[::-1], self._array, self._pending[::-1])
 
     def conjugate(self, diagrammatic=True):
         """
@@ -336,10 +412,9 @@ class Tensor(rigid.Box, metaclass=TensorType):
         if not diagrammatic:
             return Tensor(dom, cod, Tensor.np.conjugate(self.array))
         # reverse the wires for both inputs and outputs
-        array = Tensor.np.moveaxis(
-            self.array, range(len(dom @ cod)),
-            [len(dom) - i - 1 for i in range(len(dom @ cod))])
-        return Tensor(dom[::-1], cod[::-1], Tensor.np.conjugate(array))
+        axes = self._pending[:len(dom)][::-1] + self._pending[len(dom):][::-1]
+        return Tensor._permute(
+            dom[::-1], cod[::-1], Tensor.np.conjugate(self._array), axes)
 
     l = r = property(conjugate)
 
@@ -350,6 +425,9 @@ class Tensor(rigid.Box, metaclass=TensorType):
 
     def map(self, func):
         """ Apply a function elementwise. """
+        if getattr(self.array, "dtype", None) == object:
+            return Tensor(
+                self.dom, self.cod, numpy.frompyfunc(func, 1, 1)(self.array))
         return Tensor(
             self.dom, self.cod, list(map(func, self.array.reshape(-1))))
 
@@ -410,6 +488,528 @@ class Tensor(rigid.Box, metaclass=TensorType):
         return lambda *xs: Tensor(self.dom, self.cod, array(*xs))
 
 
+def _kept(labels, others, output):
+    """ The labels of a tensor which are still needed outside of it. """
+    return [label for label in labels if label in output or others[label]]
+
+
+def _path_cost(inputs, output, sizes, path):
+    """ The number of operations and peak memory along a path. """
+    from numpy import prod
+    tensors, flops, memory = [set(labels) for labels in inputs], 0, 0
+    count = {label: 0 for label in sizes}
+    for labels in tensors:
+        for label in labels:
+            count[label] += 1
+    live = sum(int(prod([sizes[label] for label in labels]))
+               for labels in tensors)
+    for i, j in path:
+        left, right = tensors.pop(j), tensors.pop(i)
+        for label in left | right:
+            count[label] -= (label in left) + (label in right)
+        result = set(_kept(left | right, count, output))
+        for label in result:
+            count[label] += 1
+        flops += int(prod([sizes[label] for label in left | right]))
+        size = int(prod([sizes[label] for label in result]))
+        memory, live = max(memory, live + size), live + size - sum(
+            int(prod([sizes[label] for label in labels]))
+            for labels in (left, right))
+        tensors.append(result)
+    return flops, max(memory, live)
+
+
+def contraction_path(inputs, output, sizes, method=None):
+    """
+    Plans the contraction of a tensor network, one pair at a time.
+
+    Parameters
+    ----------
+    inputs : List[List[int]]
+        The labels of the indices of each tensor in the network.
+    output : List[int]
+        The labels of the indices which are left open.
+    sizes : Mapping[int, int]
+        The dimension of each index.
+    method : str, optional
+        Either :code:`"greedy"`, which contracts the pair that shrinks the
+        network the most, or :code:`"optimal"`, which minimises the number
+        of operations over all contraction trees. The default is optimal
+        for networks of at most :code:`config.OPTIMAL_CONTRACTION` tensors.
+
+    Returns
+    -------
+    path : List[Tuple[int, int]]
+        The pairs of tensors to contract, each is removed and the result is
+        appended at the end, as in :func:`numpy.einsum_path`.
+    flops : int
+        The number of multiplications along the path.
+    memory : int
+        The largest number of entries held in memory at once.
+
+    Examples
+    --------
+    >>> inputs, sizes = [[0, 1], [1, 2], [2]], {0: 8, 1: 8, 2: 8}
+    >>> contraction_path(inputs, [0], sizes)
+    ([(1, 2), (0, 1)], 128, 144)
+    >>> contraction_path(inputs, [0], sizes, method="greedy")
+    ([(1, 2), (0, 1)], 128, 144)
+    >>> contraction_path([[0], [1], [0, 1]], [], {0: 2, 1: 2})
+    ([(0, 2), (0, 1)], 6, 10)
+    """
+    if method is None:
+        method = "optimal" if len(inputs) <= config.OPTIMAL_CONTRACTION\
+            else "greedy"
+    if method not in ("greedy", "optimal"):
+        raise ValueError(messages.unknown_method(method, "greedy", "optimal"))
+    path = (_greedy_path if method == "greedy" else _optimal_path)(
+        inputs, set(output), sizes)
+    return (path, ) + _path_cost(inputs, output, sizes, path)
+
+
+def _greedy_path(inputs, output, sizes):
+    """
+    Contracts the pair of tensors sharing an index which minimises the size
+    of the result minus the size of the pair, then the number of operations.
+    Ties go to the most recent intermediate result, so that it can be freed.
+    Tensors with no index in common are contracted smallest first.
+
+    The cost of a pair only changes when one of its tensors is contracted,
+    so the candidate pairs are kept in a heap and only the pairs with the
+    new intermediate result are pushed at each step.
+    """
+    from heapq import heapify, heappop, heappush
+    from numpy import prod
+    tensors = dict(enumerate(map(frozenset, inputs)))
+    path, count = [], {label: set() for label in sizes}
+    for key, labels in tensors.items():
+        for label in labels:
+            count[label].add(key)
+    # Fenwick tree over the keys of the remaining tensors, the position of
+    # a tensor is the number of remaining tensors with a smaller key.
+    tree = (2 * len(tensors) + 1) * [0]
+
+    def update(key, delta):
+        key += 1
+        while key < len(tree):
+            tree[key] += delta
+            key += key & -key
+
+    def position(key):
+        result = 0
+        while key:
+            result += tree[key]
+            key -= key & -key
+        return result
+
+    def size(labels):
+        return int(prod([sizes[label] for label in labels]))
+
+    def result(left, right):
+        return frozenset(
+            label for label in tensors[left] | tensors[right]
+            if label in output or count[label] - {left, right})
+
+    def candidate(left, right):
+        return (size(result(left, right)) - size(tensors[left])
+                - size(tensors[right]),
+                size(tensors[left] | tensors[right]), -right, left, right)
+    for key in tensors:
+        update(key, 1)
+    pairs = [candidate(left, right) for left, right in {
+        (left, right) for keys in count.values()
+        for left in keys for right in keys if left < right}]
+    heapify(pairs)
+    smallest, key = None, len(tensors)
+    while len(tensors) > 1:
+        while pairs and not {pairs[0][-2], pairs[0][-1]} <= tensors.keys():
+            heappop(pairs)
+        if pairs:
+            *_, left, right = heappop(pairs)
+        else:
+            if smallest is None:
+                smallest = [(size(labels), k) for k, labels in tensors.items()]
+                heapify(smallest)
+            (_, left), (_, right) = heappop(smallest), heappop(smallest)
+            left, right = min(left, right), max(left, right)
+        labels = result(left, right)
+        path.append((position(left), position(right)))
+        for label in tensors[left] | tensors[right]:
+            count[label] -= {left, right}
+        for label in labels:
+            count[label].add(key)
+        del tensors[left], tensors[right]
+        tensors[key] = labels
+        update(left, -1)
+        update(right, -1)
+        update(key, 1)
+        for other in set().union(*(count[label] for label in labels)) - {key}:
+            heappush(pairs, candidate(other, key))
+        if smallest is not None:
+            heappush(smallest, (size(labels), key))
+        key += 1
+    return path
+
+
+def _optimal_path(inputs, output, sizes):
+    """
+    Minimises the number of operations, then the size of the largest
+    intermediate tensor, over all contraction trees by dynamic programming
+    over subsets of tensors, i.e. in time :code:`O(3 ** len(inputs))`.
+    """
+    from numpy import prod
+    masks = {label: 0 for label in sizes}
+    for i, labels in enumerate(inputs):
+        for label in labels:
+            masks[label] |= 1 << i
+    full = (1 << len(inputs)) - 1
+
+    def labels(subset):
+        return frozenset(
+            label for label, mask in masks.items() if mask & subset and (
+                label in output or mask & full & ~subset))
+    best = {1 << i: (0, 0, None) for i in range(len(inputs))}
+    for subset in range(1, full + 1):
+        if subset in best:
+            continue
+        result = labels(subset)
+        size = int(prod([sizes[label] for label in result]))
+        left = (subset - 1) & subset
+        while left:
+            right = subset & ~left
+            if left < right:
+                flops = best[left][0] + best[right][0] + int(prod([
+                    sizes[label] for label in labels(left) | labels(right)]))
+                memory = max(size, best[left][1], best[right][1])
+                if subset not in best or (flops, memory) < best[subset][:2]:
+                    best[subset] = (flops, memory, (left, right))
+            left = (left - 1) & subset
+    order, path = [1 << i for i in range(len(inputs))], []
+
+    def walk(subset):
+        split = best[subset][2]
+        if split is None:
+            return
+        walk(split[0])
+        walk(split[1])
+        i, j = sorted([order.index(split[0]), order.index(split[1])])
+        path.append((i, j))
+        del order[j], order[i]
+        order.append(subset)
+    if inputs:
+        walk(full)
+    return path
+
+
+class Plan:
+    """
+    Executable contraction of a tensor network, computed once from the
+    labels of its indices then run on any arrays of the right shapes.
+
+    Parameters
+    ----------
+    inputs : List[List[int]]
+        The labels of the indices of each array.
+    output : List[int]
+        The labels of the open indices, in order. The same label may appear
+        more than once, e.g. for an identity wire.
+    sizes : Mapping[int, int]
+        The dimension of each index, an index which appears nowhere is a
+        loop and contributes a scalar factor.
+    path : List[Tuple[int, int]], optional
+        Contraction path, computed with :func:`contraction_path` if omitted.
+
+    Attributes
+    ----------
+    path : List[Tuple[int, int]]
+        The contraction path.
+    flops : int
+        The number of multiplications along the path.
+    memory : int
+        The largest number of entries held in memory at once.
+    expression : str
+        The whole network as an :func:`numpy.einsum` expression, or
+        :code:`None` if it has more labels than letters.
+
+    Note
+    ----
+    A plan is only a function of the shape of the network, all the
+    bookkeeping is done once when it is built. Running it is a sequence
+    of :code:`diagonal`, :code:`sum`, :code:`tensordot` and
+    :code:`moveaxis` calls on the current backend, in a fixed order.
+
+    Examples
+    --------
+    >>> plan = Plan([[0, 1], [1]], [0], {0: 2, 1: 3})
+    >>> plan.expression, plan.path, plan.flops
+    ('ab,b->a', [(0, 1)], 6)
+    >>> plan([numpy.ones((2, 3)), numpy.arange(3)])
+    array([3., 3.])
+    >>> Plan([], [0, 0], {0: 2})([])
+    array([[1., 0.],
+           [0., 1.]])
+    """
+    cache = LRUCache(config.PLAN_CACHE_SIZE)
+
+    def __init__(self, inputs, output, sizes, path=None):
+        inputs, output = list(map(list, inputs)), list(output)
+        n_inputs, self._eyes = len(inputs), []
+        for i, label in enumerate(output):
+            if label in output[:i]:
+                fresh = output[i] = max(sizes) + 1
+                sizes = {**sizes, fresh: sizes[label]}
+                self._eyes.append(sizes[label])
+                inputs.append([label, fresh])
+        letters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        letter = dict(zip(sorted(sizes), letters))
+        self.expression = None if len(sizes) > len(letters) else "{}->{}"\
+            .format(",".join("".join(letter[label] for label in labels)
+                             for labels in inputs),
+                    "".join(letter[label] for label in output))
+        count = {label: 0 for label in sizes}
+        for labels in inputs:
+            for label in labels:
+                count[label] += 1
+        self._factor = 1
+        for label, n_legs in count.items():
+            if not n_legs and label not in output:
+                self._factor *= sizes[label]
+        self._prepare = [[] for _ in inputs]
+        for k, labels in enumerate(inputs):
+            while len(set(labels)) < len(labels):
+                i = next(i for i, label in enumerate(labels)
+                         if label in labels[:i])
+                j = labels.index(labels[i])
+                self._prepare[k].append(("diagonal", j, i))
+                count[labels[i]] -= 1
+                labels = [label for n, label in enumerate(labels)
+                          if n not in (i, j)] + [labels[i]]
+            for label in list(labels):
+                if label not in output and count[label] == 1:
+                    self._prepare[k].append(("sum", labels.index(label)))
+                    count[label] -= 1
+                    labels.remove(label)
+            inputs[k] = labels
+        if path is None:
+            path, self.flops, self.memory = contraction_path(
+                inputs, output, sizes)
+        else:
+            self.flops, self.memory = _path_cost(inputs, output, sizes, path)
+        self.path, self._steps, self._batch_steps = path, [], []
+        batched = n_inputs * [True] + len(self._eyes) * [False]
+        for i, j in path:
+            right, left = inputs.pop(j), inputs.pop(i)
+            right_batched, left_batched = batched.pop(j), batched.pop(i)
+            for label in left + right:
+                count[label] -= 1
+            shared = [label for label in left if label in right]
+            labels = [label for label in left + right if label not in shared]
+            kept = _kept(dict.fromkeys(left + right), count, output)
+            if set(labels) != set(kept):
+                self._steps.append((i, j, "einsum", (left, right, kept)))
+                labels = kept
+            else:
+                self._steps.append((i, j, "tensordot", (
+                    [left.index(label) for label in shared],
+                    [right.index(label) for label in shared])))
+            for label in labels:
+                count[label] += 1
+            inputs.append(labels)
+            batched.append(left_batched or right_batched)
+            local = dict(zip(dict.fromkeys(left + right), letters[1:]))
+            self._batch_steps.append(None if len(local) < len(set(
+                left + right)) else "{},{}->{}".format(*(
+                    "a" * flag + "".join(local[label] for label in labels)
+                    for labels, flag in [
+                        (left, left_batched), (right, right_batched),
+                        (labels, batched[-1])])))
+        self._n_inputs, self._permutation = n_inputs, None
+        self.dom = self.cod = self.boxes = self.functor = None
+        if inputs and inputs[0]:
+            self._permutation = (list(range(len(inputs[0]))), [
+                output.index(label) for label in inputs[0]])
+
+    def batch(self, arrays):
+        """
+        Runs the plan on arrays with a leading batch axis, i.e. on many
+        networks of the same shape at once, with one einsum per step.
+        If a step has more indices than einsum has letters, the networks
+        are contracted one at a time instead.
+
+        Parameters
+        ----------
+        arrays : List[array]
+            The stacked arrays, in the order of the inputs of the plan,
+            their first axis must have the same length.
+
+        Returns
+        -------
+        array : array
+            The contracted arrays, stacked along the first axis.
+
+        Examples
+        --------
+        >>> plan = Plan([[0, 1], [1]], [0], {0: 2, 1: 3})
+        >>> matrices, vectors = numpy.ones((4, 2, 3)), numpy.ones((4, 3))
+        >>> plan.batch([matrices, vectors * numpy.arange(4)[:, None]])
+        array([[0., 0.],
+               [3., 3.],
+               [6., 6.],
+               [9., 9.]])
+        """
+        if not self._n_inputs or len(arrays) != self._n_inputs:
+            raise ValueError(messages.expected_arrays(
+                self._n_inputs or 1, arrays))
+        if None in self._batch_steps:
+            return Tensor.np.stack([
+                self._run([array[n] for array in arrays])
+                for n in range(len(arrays[0]))])
+        arrays = list(map(float_array, arrays)) + [
+            Tensor.np.eye(n) for n in self._eyes]
+        for k, operations in enumerate(self._prepare):
+            for operation, *axes in operations:
+                axes = [axis + 1 for axis in axes]
+                arrays[k] = Tensor.np.diagonal(arrays[k], 0, *axes)\
+                    if operation == "diagonal" else arrays[k].sum(*axes)
+        for (i, j, _, _), subscripts in zip(self._steps, self._batch_steps):
+            right, left = arrays.pop(j), arrays.pop(i)
+            arrays.append(Tensor.np.einsum(subscripts, left, right))
+        array, = arrays
+        if self._permutation is not None:
+            source, target = self._permutation
+            array = Tensor.np.moveaxis(
+                array, [i + 1 for i in source], [i + 1 for i in target])
+        return array * self._factor if self._factor != 1 else array
+
+    @staticmethod
+    def cached(inputs, output, sizes):
+        """
+        The plan for a network, looked up in :code:`Plan.cache` by its
+        structure, i.e. the labels of its indices and their sizes.
+
+        Examples
+        --------
+        >>> Plan.cache.clear()
+        >>> plan = Plan.cached([[0, 1], [1]], [0], {0: 2, 1: 3})
+        >>> assert Plan.cached([[0, 1], [1]], [0], {0: 2, 1: 3}) is plan
+        >>> Plan.cache.info()
+        CacheInfo(hits=1, misses=1, maxsize=1024, currsize=1)
+        """
+        key = (tuple(map(tuple, inputs)), tuple(output),
+               tuple(sorted(sizes.items())))
+        plan = Plan.cache.get(key)
+        if plan is None:
+            plan = Plan.cache[key] = Plan(inputs, output, sizes)
+        return plan
+
+    def bind(self, dom, cod, boxes, functor):
+        """
+        Binds a plan to the boxes of a diagram, see :meth:`Diagram.compile`.
+
+        Parameters
+        ----------
+        dom, cod : Dim
+            The domain and codomain of the tensor to return.
+        boxes : List[discopy.rigid.Box]
+            The box for each input of the plan.
+        functor : Functor
+            Sends boxes to their default arrays.
+        """
+        plan = copy(self)
+        plan.dom, plan.cod, plan.boxes, plan.functor = dom, cod, boxes, functor
+        return plan
+
+    def __call__(self, arrays=None):
+        """
+        Runs the plan on a list of arrays, one for each input.
+
+        Parameters
+        ----------
+        arrays : List[array] or Mapping[discopy.rigid.Box, array], optional
+            The arrays, in the order of the inputs of the plan. If the plan
+            is bound to boxes, this may be a mapping from some of the boxes
+            to arrays, the other boxes are sent to their default arrays.
+
+        Returns
+        -------
+        result : array or Tensor
+            The contracted array, with one axis for each output label, as
+            a :class:`Tensor` if the plan is bound to a diagram. The
+            arrays are promoted with :func:`float_array` beforehand, as if
+            the contraction started from the identity.
+        """
+        if self.boxes is not None and not isinstance(arrays, (list, tuple)):
+            arrays = arrays or {}
+            arrays = [arrays[box] if box in arrays
+                      else self.functor._image(box).array
+                      for box in self.boxes]
+        if len(arrays) != self._n_inputs:
+            raise ValueError(messages.expected_arrays(self._n_inputs, arrays))
+        array = self._run(arrays)
+        return array if self.dom is None\
+            else Tensor(self.dom, self.cod, array)
+
+    def _run(self, arrays):
+        arrays = list(map(float_array, arrays)) + [
+            Tensor.np.eye(n) for n in self._eyes]
+        for k, operations in enumerate(self._prepare):
+            for operation, *axes in operations:
+                arrays[k] = Tensor.np.diagonal(arrays[k], 0, *axes)\
+                    if operation == "diagonal" else arrays[k].sum(*axes)
+        for i, j, operation, axes in self._steps:
+            right, left = arrays.pop(j), arrays.pop(i)
+            if operation == "einsum":
+                array = Tensor.np.einsum(
+                    left, axes[0], right, axes[1], axes[2])
+            elif not left.shape or not right.shape:
+                array = left * right
+            else:
+                array = Tensor.np.tensordot(left, right, axes)
+            arrays.append(array)
+        if not arrays:
+            array = float_array(self._factor)
+        else:
+            array, = arrays
+            if self._permutation is not None:
+                array = Tensor.np.moveaxis(array, *self._permutation)
+            if self._factor != 1:
+                array = array * self._factor
+        return array
+
+
+def contract(arrays, inputs, output, sizes, path=None):
+    """
+    Contracts a tensor network with :code:`tensordot` on the current backend,
+    i.e. builds a :class:`Plan` and runs it once.
+
+    Parameters
+    ----------
+    arrays : List[array]
+        The tensors in the network.
+    inputs : List[List[int]]
+        The labels of the indices of each tensor.
+    output : List[int]
+        The labels of the open indices, in order.
+    sizes : Mapping[int, int]
+        The dimension of each index.
+    path : List[Tuple[int, int]], optional
+        Contraction path, computed with :func:`contraction_path` if omitted.
+
+    Returns
+    -------
+    array : array
+        The contracted tensor, with one axis for each label in the output.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> a, b = np.arange(6).reshape(2, 3), np.arange(3)
+    >>> assert np.all(contract([a, b], [[0, 1], [1]], [0], {0: 2, 1: 3})
+    ...               == a.dot(b))
+    """
+    return Plan(inputs, output, sizes, path)(arrays)
+
+
 class Functor(rigid.Functor):
     """ Implements a tensor-valued rigid functor.
 
@@ -419,8 +1019,9 @@ class Functor(rigid.Functor):
     >>> F(f)
     Tensor(dom=Dim(1), cod=Dim(2), array=[0, 1])
     """
-    def __init__(self, ob, ar):
-        super().__init__(ob, ar, ob_factory=Dim, ar_factory=Tensor)
+    def __init__(self, ob, ar, cache_size=None):
+        super().__init__(ob, ar, ob_factory=Dim, ar_factory=Tensor,
+                         cache_size=cache_size)
 
     def __repr__(self):
         return super().__repr__().replace("Functor", "tensor.Functor")
@@ -446,9 +1047,9 @@ class Functor(rigid.Functor):
             return Tensor.cups(self(diagram.dom[:1]), self(diagram.dom[1:]))
         if isinstance(diagram, Cap):
             return Tensor.caps(self(diagram.cod[:1]), self(diagram.cod[1:]))
-        if isinstance(diagram, monoidal.Box)\
+        if isinstance(diagram, cat.Box)\
                 and not isinstance(diagram, monoidal.Swap):
-            if diagram.z % 2 != 0:
+            if getattr(diagram, "z", 0) % 2 != 0:
                 while diagram.z != 0:
                     diagram = diagram.l if diagram.z > 0 else diagram.r
                 return self(diagram).conjugate()
@@ -459,33 +1060,97 @@ class Functor(rigid.Functor):
         if not isinstance(diagram, monoidal.Diagram):
             raise TypeError(messages.type_err(monoidal.Diagram, diagram))
 
-        def dim(scan):
-            return len(self(scan))
-        scan, array = diagram.dom, Tensor.id(self(diagram.dom)).array
+        boxes, inputs, output, sizes = self._network(diagram)
+        plan = Plan.cached(inputs, output, sizes)
+        return Tensor(self(diagram.dom), self(diagram.cod),
+                      plan([self._image(box).array for box in boxes]))
+
+    def to_network(self, diagram):
+        """
+        Sends a diagram to a network of arrays with labelled indices.
+
+        Swaps, cups, caps and spiders with two legs are not sent to arrays,
+        they only relabel the wires, so that each label is shared by at
+        most two indices.
+
+        Parameters
+        ----------
+        diagram : discopy.rigid.Diagram
+            The diagram to send.
+
+        Returns
+        -------
+        arrays : List[array]
+            The image of each box.
+        inputs : List[List[int]]
+            The labels of the indices of each array.
+        output : List[int]
+            The labels of the domain then the codomain.
+        sizes : Dict[int, int]
+            The dimension of each label.
+
+        Examples
+        --------
+        >>> x = Ty('x')
+        >>> v, m = rigid.Box('v', Ty(), x), rigid.Box('m', x, x)
+        >>> F = Functor({x: 2}, {v: [0, 1], m: [0, 1, 1, 0]})
+        >>> diagram = v @ Id(x.r) >> Cup(x, x.r) >> Cap(x, x.l) >> m @ Id(x.l)
+        >>> arrays, inputs, output, sizes = F.to_network(diagram)
+        >>> inputs, output, sizes
+        ([[0], [1, 2]], [0, 2, 1], {0: 2, 1: 2, 2: 2})
+        """
+        boxes, inputs, output, sizes = self._network(diagram)
+        return [self._image(box).array for box in boxes], inputs, output, sizes
+
+    def _network(self, diagram):
+        """ The boxes sent to arrays and the labels of the network. """
+        parent, sizes, images = [], [], {}
+
+        def find(label):
+            while parent[label] != label:
+                parent[label] = label = parent[parent[label]]
+            return label
+
+        def fresh(typ):
+            groups = []
+            for i in range(len(typ)):
+                obj = typ[i:i + 1]
+                if obj not in images:
+                    images[obj] = list(self(obj))
+                dim = images[obj]
+                groups.append(list(range(len(parent), len(parent) + len(dim))))
+                parent.extend(groups[-1])
+                sizes.extend(dim)
+            return groups
+
+        def union(left, right):
+            for i, j in zip(left, right):
+                parent[find(j)] = find(i)
+        scan, boxes, inputs = fresh(diagram.dom), [], []
+        dom = list(scan)
         for box, off in zip(diagram.boxes, diagram.offsets):
+            groups = scan[off:off + len(box.dom)]
             if isinstance(box, monoidal.Swap):
-                source = range(
-                    dim(diagram.dom @ scan[:off]),
-                    dim(diagram.dom @ scan[:off] @ box.dom))
-                target = [
-                    i + dim(box.right)
-                    if i < dim(diagram.dom @ scan[:off]) + dim(box.left)
-                    else i - dim(box.left) for i in source]
-                array = Tensor.np.moveaxis(array, list(source), list(target))
-                scan = scan[:off] @ box.cod @ scan[off + len(box.dom):]
+                scan[off:off + len(box.dom)] =\
+                    groups[len(box.left):] + groups[:len(box.left)]
                 continue
-            left = dim(scan[:off])
-            source = list(range(dim(diagram.dom) + left,
-                                dim(diagram.dom) + left + dim(box.dom)))
-            target = list(range(dim(box.dom)))
-            array =\
-                Tensor.np.tensordot(array, self(box).array, (source, target))
-            source = range(len(array.shape) - dim(box.cod), len(array.shape))
-            target = range(dim(diagram.dom) + left,
-                           dim(diagram.dom) + left + dim(box.cod))
-            array = Tensor.np.moveaxis(array, list(source), list(target))
-            scan = scan[:off] @ box.cod @ scan[off + len(box.dom):]
-        return Tensor(self(diagram.dom), self(diagram.cod), array)
+            groups += fresh(box.cod)
+            if isinstance(box, (Cup, Cap)):
+                union(groups[0], groups[1][::-1])
+            elif isinstance(box, Spider) and len(groups) == 2 * len(box.dim):
+                for i in range(len(box.dim)):
+                    union(groups[i], groups[i + len(box.dim)])
+            else:
+                boxes.append(box)
+                inputs.append(sum(groups, []))
+            scan[off:off + len(box.dom)] = groups[len(box.dom):]
+        relabel = {}
+        for label in map(find, range(len(parent))):
+            relabel.setdefault(label, len(relabel))
+        inputs = [[relabel[find(i)] for i in labels] for labels in inputs]
+        output = [relabel[find(i)] for labels in dom + scan for i in labels]
+        sizes = {relabel[find(i)]: dim for i, dim in enumerate(sizes)}
+        return boxes, inputs, output, sizes
 
 
 @monoidal.Diagram.subclass
@@ -517,6 +1182,12 @@ class Diagram(rigid.Diagram):
         tensor : Tensor
             With the same domain and codomain as self.
 
+        Note
+        ----
+        Without a contractor, the diagram is sent to a network of labelled
+        arrays with :meth:`Functor.to_network` then contracted along the
+        path given by :func:`contraction_path`, see :func:`contract`.
+
         Examples
         --------
         >>> vector = Box('vector', Dim(1), Dim(2), [0, 1])
@@ -524,16 +1195,106 @@ class Diagram(rigid.Diagram):
         >>> import tensornetwork as tn
         >>> assert (vector >> vector[::-1]).eval(tn.contractors.auto) == 1
         """
-        if contractor is None and "numpy" not in Tensor.np.__package__:
-            raise Exception(
-                'Provide a tensornetwork contractor'
-                'when using a non-numpy backend.')
-
         if contractor is None:
             return Functor(ob=lambda x: x, ar=lambda f: f.array)(self)
         array = contractor(*self.to_tn(dtype=dtype)).tensor
         return Tensor(self.dom, self.cod, array)
 
+    def compile(self, functor=None):
+        """
+        Compiles a diagram into a :class:`Plan`, which can be run again on
+        new arrays for its boxes without looking at the diagram.
+
+        Plans only depend on the shape of the diagram, they are cached in
+        :code:`Plan.cache` so that diagrams with the same shape share them.
+
+        Parameters
+        ----------
+        functor : Functor, optional
+            Sends boxes to their default arrays, the default is the arrays
+            of the boxes themselves.
+
+        Returns
+        -------
+        plan : Plan
+            Takes a list of arrays for :code:`plan.boxes`, or a mapping
+            from some of them to arrays, and returns a :class:`Tensor`.
+
+        Examples
+        --------
+        >>> alice = Box('alice', Dim(1), Dim(2), [1, 0])
+        >>> bob = Box('bob', Dim(1), Dim(2), [0, 1])
+        >>> loves = Box('loves', Dim(2), Dim(2), [0, 1, 1, 0])
+        >>> plan = (alice >> loves >> bob[::-1]).compile()
+        >>> plan.expression, plan.path
+        ('a,ab,b->', [(0, 1), (0, 1)])
+        >>> assert plan() == 1 and plan({loves: numpy.eye(2)}) == 0
+        >>> vector = numpy.array([0, 1])
+        >>> plan([vector, numpy.eye(2), vector])
+        Tensor(dom=Dim(1), cod=Dim(1), array=[1.])
+        >>> assert (bob >> loves >> alice[::-1]).compile().path is plan.path
+        """
+        functor = functor or Functor(ob=lambda x: x, ar=lambda f: f.array)
+        boxes, inputs, output, sizes = functor._network(self)
+        return Plan.cached(inputs, output, sizes).bind(
+            functor(self.dom), functor(self.cod), boxes, functor)
+
+    @staticmethod
+    def eval_batch(diagrams, functor=None):
+        """
+        Evaluates many diagrams at once, grouped by their :class:`Plan`.
+
+        Diagrams are grouped by their plan together with the images of their
+        domain and codomain, since the output labels of a plan do not tell
+        apart two ways of splitting the same wires into dom and cod.
+        The arrays of the diagrams in each group are stacked box by box
+        along a leading axis, then each group is contracted in one go with
+        :meth:`Plan.batch`, i.e. with one batched einsum per step.
+
+        Parameters
+        ----------
+        diagrams : List[Diagram]
+            The diagrams to evaluate.
+        functor : Functor, optional
+            Sends boxes to arrays, the default is the arrays of the boxes.
+
+        Returns
+        -------
+        tensors : List[Tensor]
+            The evaluation of each diagram, in order.
+
+        Examples
+        --------
+        >>> words = [Box(name, Dim(1), Dim(2), [i, 1 - i])
+        ...          for i, name in enumerate(["alice", "bob"])]
+        >>> loves = Box('loves', Dim(2), Dim(2), [0, 1, 1, 0])
+        >>> sentences = [x >> loves >> y[::-1] for x in words for y in words]
+        >>> tensors = Diagram.eval_batch(sentences)
+        >>> tensors  # doctest: +ELLIPSIS
+        [Tensor(dom=Dim(1), cod=Dim(1), array=[0.]), ...]
+        >>> assert tensors == [sentence.eval() for sentence in sentences]
+        """
+        functor = functor or Functor(ob=lambda x: x, ar=lambda f: f.array)
+        groups = {}
+        for i, diagram in enumerate(diagrams):
+            boxes, inputs, output, sizes = functor._network(diagram)
+            key = (Plan.cached(inputs, output, sizes),
+                   functor(diagram.dom), functor(diagram.cod))
+            groups.setdefault(key, []).append((i, boxes))
+        results = len(diagrams) * [None]
+        for (plan, dom, cod), group in groups.items():
+            if not group[0][1]:
+                array = plan([])
+                for i, _ in group:
+                    results[i] = Tensor(dom, cod, array)
+                continue
+            array = plan.batch([
+                Tensor.np.stack([functor._image(box).array for box in boxes])
+                for boxes in zip(*[boxes for _, boxes in group])])
+            for n, (i, _) in enumerate(group):
+                results[i] = Tensor(dom, cod, array[n])
+        return results
+
     def to_tn(self, dtype=None):
         """
         Sends a diagram to :code:`tensornetwork`.
@@ -726,7 +1487,8 @@ class Box(rigid.Box, Diagram):
     """ Box in a tensor.Diagram """
     def __init__(self, name, dom, cod, data, **params):
         rigid.Box.__init__(self, name, dom, cod, data=data, **params)
-        Diagram.__init__(self, dom, cod, [self], [0])
+        Diagram.__init__(
+            self, dom, cod, [self], monoidal.BOX_OFFSETS, _scan=False)
 
     @property
     def array(self):
@@ -734,7 +1496,7 @@ class Box(rigid.Box, Diagram):
         dom, cod = self.dom, self.cod
         data = self.data
         try:
-            return Tensor.np.array(data).reshape(tuple(dom @ cod) or ())
+            return Tensor.np.asarray(data).reshape(tuple(dom @ cod) or ())
         except Exception:
             return data
 
@@ -2,7 +2,9 @@
 
 """ DisCoPy utility functions. """
 
-from collections.abc import Mapping, Iterable
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping, Iterable, Sequence
+from itertools import chain
 
 import json
 
@@ -63,6 +65,294 @@ def loads(raw):
     return from_tree(obj)
 
 
+class Rope(Sequence):
+    """
+    Immutable sequence with structural sharing, used to store the boxes,
+    offsets and layers of diagrams.
+
+    A rope is a height-balanced binary tree with slices of tuples as leaves.
+    Concatenation and contiguous slicing take logarithmic time and share
+    subtrees with the original ropes, iterating flattens a rope into a tuple
+    at most once.
+
+    Parameters
+    ----------
+    items : iterable, optional
+        The items of the rope, empty by default.
+
+    Examples
+    --------
+    >>> rope = Rope([1, 2, 3]) + [4, 5] + Rope([6])
+    >>> rope
+    [1, 2, 3, 4, 5, 6]
+    >>> rope[2:5], rope[-1], len(rope)
+    ([3, 4, 5], 6, 6)
+    >>> assert rope == [1, 2, 3, 4, 5, 6] and rope == (1, 2, 3, 4, 5, 6)
+    >>> assert [0] + rope[::-1] == [0, 6, 5, 4, 3, 2, 1]
+    """
+    __slots__ = (
+        '_items', '_start', '_stop', '_left', '_right',
+        '_len', '_height', '_flat')
+
+    max_leaf = 32
+
+    def __init__(self, items=()):
+        items = tuple(items)
+        self._items, self._start, self._stop = items, 0, len(items)
+        self._left = self._right = None
+        self._len, self._height, self._flat = len(items), 0, items
+
+    @classmethod
+    def _leaf(cls, items, start, stop):
+        rope = cls.__new__(cls)
+        rope._items, rope._start, rope._stop = items, start, stop
+        rope._left = rope._right = rope._flat = None
+        rope._len, rope._height = stop - start, 0
+        return rope
+
+    @classmethod
+    def _node(cls, left, right):
+        rope = cls.__new__(cls)
+        rope._items = rope._flat = None
+        rope._left, rope._right = left, right
+        rope._len = left._len + right._len
+        rope._height = 1 + max(left._height, right._height)
+        return rope
+
+    @classmethod
+    def _join(cls, left, right):
+        """ Joins two ropes with heights differing by at most two. """
+        if left._height > right._height + 1:
+            if left._left._height >= left._right._height:
+                return cls._node(left._left, cls._node(left._right, right))
+            middle = left._right
+            return cls._node(cls._node(left._left, middle._left),
+                             cls._node(middle._right, right))
+        if right._height > left._height + 1:
+            if right._right._height >= right._left._height:
+                return cls._node(cls._node(left, right._left), right._right)
+            middle = right._left
+            return cls._node(cls._node(left, middle._left),
+                             cls._node(middle._right, right._right))
+        return cls._node(left, right)
+
+    @classmethod
+    def _concat(cls, left, right):
+        if not left._len:
+            return right
+        if not right._len:
+            return left
+        if left._height > right._height + 1:
+            return cls._join(left._left, cls._concat(left._right, right))
+        if right._height > left._height + 1:
+            return cls._join(cls._concat(left, right._left), right._right)
+        if left._left is right._left is None\
+                and left._len + right._len <= cls.max_leaf:
+            return cls(left._tuple() + right._tuple())
+        return cls._node(left, right)
+
+    @classmethod
+    def concat(cls, *ropes):
+        """
+        Concatenates any number of ropes, lists or tuples in one pass.
+
+        The parts are joined pairwise in a balanced way, so that this takes
+        linear time in the number of parts rather than quadratic.
+
+        >>> Rope.concat(Rope([1, 2]), [3], (), Rope([4, 5]))
+        [1, 2, 3, 4, 5]
+        """
+        parts = [rope if isinstance(rope, Rope) else cls(rope)
+                 for rope in ropes if len(rope)]
+        if not parts:
+            return cls()
+        while len(parts) > 1:
+            pairs = zip(parts[0::2], parts[1::2])
+            parts = [cls._concat(left, right) for left, right in pairs]\
+                + parts[len(parts) - len(parts) % 2:]
+        return parts[0]
+
+    def _slice(self, start, stop):
+        if start == 0 and stop == self._len:
+            return self
+        if self._left is None:
+            return self._leaf(
+                self._items, self._start + start, self._start + stop)
+        middle = self._left._len
+        if stop <= middle:
+            return self._left._slice(start, stop)
+        if start >= middle:
+            return self._right._slice(start - middle, stop - middle)
+        return self._concat(self._left._slice(start, middle),
+                            self._right._slice(0, stop - middle))
+
+    def _tuple(self):
+        if self._flat is None:
+            parts, stack = [], [self]
+            while stack:
+                node = stack.pop()
+                if node._flat is not None:
+                    parts.append(node._flat)
+                elif node._left is None:
+                    parts.append(node._items[node._start:node._stop])
+                else:
+                    stack += [node._right, node._left]
+            self._flat = tuple(chain.from_iterable(parts))
+        return self._flat
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return iter(self._tuple())
+
+    def __reversed__(self):
+        return reversed(self._tuple())
+
+    def __contains__(self, item):
+        return item in self._tuple()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                return type(self)(self._tuple()[key])
+            return self._slice(start, max(start, stop))
+        if self._flat is not None:
+            return self._flat[key]
+        if key < 0:
+            key += self._len
+        if not 0 <= key < self._len:
+            raise IndexError(key)
+        node = self
+        while node._left is not None:
+            if key < node._left._len:
+                node = node._left
+            else:
+                key, node = key - node._left._len, node._right
+        return node._items[node._start + key]
+
+    def __add__(self, other):
+        if isinstance(other, Rope):
+            return self._concat(self, other)
+        if isinstance(other, (list, tuple)):
+            return self._concat(self, type(self)(other))
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, (list, tuple)):
+            return self._concat(type(self)(other), self)
+        return NotImplemented
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, Rope):
+            return self._len == other._len\
+                and self._tuple() == other._tuple()
+        if isinstance(other, (list, tuple)):
+            return self._tuple() == tuple(other)
+        return False
+
+    def __hash__(self):
+        return hash(self._tuple())
+
+    def __repr__(self):
+        return repr(list(self._tuple()))
+
+    def __reduce__(self):
+        return type(self), (self._tuple(), )
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    Mapping with a bounded size which evicts the least recently used keys,
+    keeping count of hits and misses like :func:`functools.lru_cache`.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of keys, or :code:`None` for an unbounded cache.
+
+    Examples
+    --------
+    >>> cache = LRUCache(2)
+    >>> cache['x'], cache['y'] = 1, 2
+    >>> cache.get('x'), cache.get('z')
+    (1, None)
+    >>> cache['z'] = 3
+    >>> assert 'y' not in cache and 'x' in cache
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, maxsize=2, currsize=2)
+    """
+    __slots__ = ('maxsize', 'hits', 'misses', '_data')
+
+    def __init__(self, maxsize=128):
+        self.maxsize, self.hits, self.misses = maxsize, 0, 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """ Looks up a key, counting a hit or a miss. """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        """ The hits, misses, maximum and current size of the cache. """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self))
+
+    def clear(self):
+        """ Empties the cache and resets its statistics. """
+        self._data.clear()
+        self.hits = self.misses = 0
+
+
+def set_state(obj, state, **defaults):
+    """
+    Sets the attributes of an object with :code:`__slots__` when unpickling.
+
+    The state is either the pair of instance dictionary and slots given by
+    :code:`object.__reduce_ex__` or, for objects pickled before their class
+    declared slots, a plain dictionary. Cached hashes are reset to their
+    :code:`defaults`, they are not valid outside of the process that
+    computed them, as is whether an object is interned.
+
+    Examples
+    --------
+    >>> import pickle
+    >>> from discopy.cat import Ob
+    >>> x = Ob('x')
+    >>> x.__setstate__({'_name': 'y', '_interned': True})
+    >>> assert x == Ob('y') and not x._interned
+    >>> assert pickle.loads(pickle.dumps(x)) == x
+    """
+    attrs, slots = state if isinstance(state, tuple) else (state, None)
+    for attr, value in chain((attrs or {}).items(), (slots or {}).items()):
+        setattr(obj, attr, value)
+    for attr, value in defaults.items():
+        setattr(obj, attr, value)
+
+
 def rmap(func, data):
     """
     Apply :code:`func` recursively to :code:`data`.
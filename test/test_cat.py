@@ -183,6 +183,12 @@ def test_Box_repr():
     assert repr(f.dagger()) == "Box('f', Ob('x'), Ob('y'), data=42).dagger()"
 
 
+def test_Box_memory():
+    for obj in [Ob('x'), Box('f', Ob('x'), Ob('y'))]:
+        assert not hasattr(obj, '__dict__')
+        assert all('__slots__' in vars(cls) for cls in type(obj).__mro__[:-1])
+
+
 def test_Box_str():
     f = Box('f', Ob('x'), Ob('y'), data=42)
     assert str(f) == "f"
@@ -198,6 +204,36 @@ def test_Box_eq():
     assert f == Arrow(Ob('x'), Ob('y'), [f]) and f != Ob('x')
 
 
+def test_eq_and_hash():
+    x, y = Ob('x'), Ob('y')
+    f, g = Box('f', x, y, data=1), Box('f', x, y, data=1.0)
+    h = Box('h', y, x)
+    for left, right in [(f, g), (f >> h, g >> h)]:
+        assert hash(left) == hash(right) and left == right
+        assert len({left, right}) == 1 and {left: 0}[right] == 0
+    assert f != Box('f', x, y, data=2) and hash(f) != hash(h)
+    assert f >> h != Box('f', x, y, data=2) >> h
+
+
+class EqualData:
+    """ Data that is equal to any other, with a different hash. """
+    def __eq__(self, other):
+        return isinstance(other, EqualData)
+
+    def __hash__(self):
+        return id(self)
+
+
+def test_eq_before_and_after_hash():
+    x, y = Ob('x'), Ob('y')
+    f, g = Box('f', x, y, data=EqualData()), Box('f', x, y, data=EqualData())
+    h = Box('h', y, x)
+    for left, right in [(f, g), (f >> h, g >> h)]:
+        assert left == right
+        hash(left), hash(right)
+        assert left == right and len({left, right}) == 1
+
+
 def test_Functor():
     x, y, z = Ob('x'), Ob('y'), Ob('z')
     f, g = Box('f', x, y), Box('g', y, z)
@@ -294,3 +330,34 @@ def test_sum_lambdify():
 
     empty_sum = Sum([], Ob('x'), Ob('y'))
     assert empty_sum.lambdify(phi)(123) == empty_sum
+
+
+def test_intern():
+    x, y = intern(Ob('x')), intern(Ob('y'))
+    assert intern(Ob('x')) is x and x != y and x == Ob('x')
+    f = intern(Box('f', x, y))
+    assert intern(Box('f', Ob('x'), Ob('y'))) is f
+    assert intern(Box('f', x, y, data=[1])) is not f
+    assert intern(Box('f', x, y, data=1)) is intern(Box('f', x, y, data=1))
+    import numpy as np
+    from discopy.tensor import Box as TensorBox, Dim
+    one, two = np.zeros(2000), np.zeros(2000)
+    two[1000] = 1
+    boxes = [TensorBox('f', Dim(1), Dim(2000), array) for array in (one, two)]
+    assert intern(boxes[0]) is boxes[0] and intern(boxes[1]) is boxes[1]
+    from discopy import config
+    from discopy.rigid import Ob as RigidOb, Ty
+    assert intern(RigidOb('x')) == x and intern(RigidOb('x')) is not x
+    assert intern(RigidOb('x', z=1)) != intern(RigidOb('x'))
+    config.INTERN_OBJECTS = True
+    try:
+        types = [Ty('x', 'y') for _ in range(10)] + [Ty('x') @ Ty('y').l.r]
+        assert all(t[1] is types[0][1] for t in types)
+        assert intern(types[0]) is intern(types[-1])
+    finally:
+        config.INTERN_OBJECTS = False
+    assert Ty('x')[0] is not Ty('x')[0]
+    t = Ty('x', 'y')
+    objects = t._objects
+    assert t._intern_key()[1] is objects and t[0] is not intern(RigidOb('x'))
+    assert intern(t)[0] is t[0] is intern(RigidOb('x'))
@@ -0,0 +1,54 @@
+from pytest import raises
+from discopy import monoidal
+from discopy.cat import AxiomError
+from discopy.rigid import Ty, Box, Id, Cup, Cap
+from discopy.rewriting import Rule
+from discopy.egraph import *
+
+
+def test_EGraph_init():
+    x, y = Ty('x'), Ty('y')
+    f = Box('f', x, y)
+    with raises(AxiomError):
+        EGraph(rules=[(f, Id(x))])
+    assert len(EGraph(rules=[Rule(f >> f[::-1], Id(x))]))
+    with raises(TypeError):
+        EGraph(rules=[(f, f)]).add(monoidal.Box('f', x, y))
+
+
+def test_EGraph_equal():
+    x, y = Ty('x'), Ty('y')
+    f, g, s = Box('f', x, y), Box('g', y @ y, x), Box('s', Ty(), y)
+    left = f @ s >> g
+    right = Id(x) @ s >> f @ Id(y) >> g
+    egraph = EGraph()
+    assert egraph.equal(left, right)
+    assert not egraph.equal(left, s @ f >> g)
+    snake = Cap(x, x.l) @ Id(x) >> Id(x) @ Cup(x.l, x)
+    assert not EGraph().equal(snake, Id(x))
+    assert EGraph(rules=[(snake, Id(x))]).equal(f @ snake, f @ Id(x))
+
+
+def test_EGraph_saturate():
+    x = Ty('x')
+    f, g = Box('f', x, x @ x), Box('g', x @ x, x)
+    diagram = Id(x).then(*(4 * [f >> g]))
+    egraph = EGraph(max_nodes=10)
+    egraph.add(diagram)
+    assert not egraph.saturate()
+    assert len(egraph) > 10
+    assert not egraph.saturate(max_nodes=10 ** 6, timeout=0)
+    assert egraph.saturate(max_nodes=10 ** 6, max_iter=100)
+
+
+def test_EGraph_extract():
+    x = Ty('x')
+    f, g, k = Box('f', x, x @ x), Box('g', x @ x, x), Box('k', x, x)
+    egraph = EGraph(rules=[(f >> g, k >> k >> k)])
+    diagram = f @ f >> Id(x) @ g @ Id(x) >> g @ Id(x) >> g
+    i = egraph.add(diagram)
+    egraph.saturate()
+    assert egraph.extract(i) == diagram
+    assert egraph.simplify(f >> g) == f >> g
+    cost = ContractionCost({x: 100})
+    assert egraph.simplify(f >> g, cost=cost) == k >> k >> k
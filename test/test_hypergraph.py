@@ -32,6 +32,20 @@ def test_Diagram_tensor():
     assert Id().tensor(Id(), Id()) == Id().tensor() == Id()
 
 
+def test_Diagram_then_tensor_many():
+    x, y = types('x y')
+    f, merge = Box('f', x, y), Spider(2, 1, x)
+    boxes = 1000 * [f >> f[::-1]]
+    chain, tensor = Id(x).then(*boxes), Id().tensor(*boxes)
+    assert len(chain.boxes) == len(tensor.boxes) == 2000
+    assert chain.n_spiders == 2001 and tensor.n_spiders == 3000
+    assert chain[::-1] == chain and tensor[::-1] == tensor
+    assert (Id(x) @ Spider(0, 1, x) >> merge).then(f, f[::-1])\
+        == (Spider(0, 1, x) @ Id(x)).then(merge >> f, f[::-1])
+    with raises(AxiomError):
+        Id(x).then(Id(x), Id(y))
+
+
 def test_Diagram_getitem():
     with raises(NotImplementedError):
         Spider(1, 2, Ty('x'))[0]
@@ -42,6 +56,71 @@ def test_Diagram_bijection():
         Spider(1, 2, Ty('x')).bijection
 
 
+def test_Diagram_canonical_form():
+    x, y = types('x y')
+    f, g = Box('f', x, y), Box('g', y, y)
+    left = f @ f >> g @ Id(y)
+    right = Swap(x, x) >> f @ f >> Id(y) @ g >> Swap(y, y)
+    assert left.wires != right.wires and left == right
+    assert left.canonical_form() == left.canonical_form().canonical_form()
+    assert len({left, right, f @ (f >> g), f >> g}) == 3
+    assert {left: 1}[right] == 1
+    assert left != f @ f >> Id(y) @ g
+    assert Spider(0, 0, x) @ f != Spider(0, 0, y) @ f
+    assert canonical_labelling([0, 0, 0], [[], [], []]) == [0, 1, 2]
+
+
+def test_Diagram_canonical_form_symmetric():
+    x = Ty('x')
+    g = Box('g', x, x)
+
+    def ring(n):
+        return Cap(x, x) >> Id(x).then(*n * [g]) @ Id(x) >> Cup(x, x)
+    left, right = ring(6) @ ring(3) @ ring(3), ring(3) @ ring(3) @ ring(6)
+    assert left == right and hash(left) == hash(right)
+    assert left != ring(6) @ ring(6) and ring(12) != ring(6) @ ring(6)
+    assert len({Diagram.tensor(*n * [ring(2)]) for n in [4, 4, 5]}) == 2
+
+
+def test_Diagram_eq_and_hash():
+    x = Ty('x')
+    f, g = Box('f', x, x, data=1), Box('f', x, x, data=1.0)
+    h, k = Box('h', x, x, data=[1]), Box('h', x, x, data=[2])
+    assert f == g and hash(f) == hash(g) and h != k
+    assert f @ h == Swap(x, x) >> h @ g >> Swap(x, x)
+    assert hash(f @ h) == hash(Swap(x, x) >> h @ g >> Swap(x, x))
+    assert f @ h != f @ k
+
+
+def test_Diagram_eval():
+    import numpy as np
+    from discopy.tensor import Dim, Functor, Tensor
+    x, y = types('x y')
+    f, g = Box('f', x, y), Box('g', y @ y, y)
+    arrays = {'f': np.arange(6).reshape(2, 3), 'g': np.arange(27)}
+    F = Functor({x: 2, y: 3}, lambda box: arrays[box.name])
+    for diagram in [
+            f @ f >> g, (f @ f >> Swap(y, y) >> g)[::-1], Id(x) @ g,
+            f @ Cap(y, y) >> Swap(y, y) @ Id(y) >> Id(y) @ Cup(y, y)]:
+        assert diagram.eval(F) == F(diagram.downgrade())
+    copy = np.zeros((2, 2, 3, 2, 3), dtype=int)
+    for i in range(2):
+        copy[i, i, :, i, :] = np.outer(arrays['f'][i], arrays['f'][i])
+    assert np.all((Spider(2, 3, x) >> f @ Id(x) @ f).eval(F).array == copy)
+    assert Spider(0, 0, x @ y).eval(F) == 6 and Id().eval(F) == 1
+    m = Box('m', x, x)
+    G = Functor({x: 2}, lambda box: np.array([[0, 1], [1, 0]]))
+    chain = Id(x).then(*80 * [m])
+    assert chain.n_spiders > 52
+    assert chain.eval(G) == G(chain.downgrade()) == Tensor.id(Dim(2))
+    M = np.array([[0, 1], [2, 3]])
+    H = Functor({x: 2}, {m: M}, cache_size=4)
+    assert (m >> m[::-1]).eval(H) == Tensor(Dim(2), Dim(2), M @ M.T)
+    assert Id(x).then(*20 * [m]).eval(H) == Tensor(
+        Dim(2), Dim(2), np.linalg.matrix_power(M, 20))
+    assert H.cache_info()[:2] == (20, 2)
+
+
 def test_Box():
     box = Box('box', Ty('x'), Ty('y'))
     assert box == box and box == box @ Id() and box != 1
@@ -212,6 +212,23 @@ def test_Diagram_interchange():
     assert d.interchange(2, 0) == Id(x) @ f1 >> f0 @ Id(x) >> f1 @ f0
 
 
+def test_Diagram_reorder():
+    x, y = Ty('x'), Ty('y')
+    f0, f1 = Box('f0', x, y), Box('f1', y, x)
+    d = f0 @ Id(y) >> f1 @ f1 >> Id(x) @ f0
+    assert d.reorder([0, 1, 2, 3]) == d
+    assert d.reorder([2, 0, 1, 3]) == d.interchange(2, 0)
+    assert d.reorder([2, 0, 3, 1]) == d.move(2, 0).move(3, 2)
+    cup, cap = Box('cup', x @ x, Ty()), Box('cap', Ty(), x @ x)
+    for left in [False, True]:
+        assert (cup >> cap).reorder([1, 0], left=left)\
+            == (cup >> cap).interchange(1, 0, left=left)
+    with raises(InterchangerError):
+        d.reorder([1, 0, 2, 3])
+    with raises(ValueError):
+        d.reorder([0, 0, 1, 2])
+
+
 def test_Diagram_normalize():
     x, y = Ty('x'), Ty('y')
     f0, f1 = Box('f0', x, y), Box('f1', y, x)
@@ -288,6 +305,13 @@ def test_Box_init():
     assert (f.name, f.dom, f.cod, f.data) == ('f', Ty('x', 'y'), Ty('z'), 42)
 
 
+def test_Layer_memory():
+    x, y = Ty('x'), Ty('y')
+    for obj in [x, Layer(x, Box('f', x, y), y)]:
+        assert not hasattr(obj, '__dict__')
+        assert all('__slots__' in vars(cls) for cls in type(obj).__mro__[:-1])
+
+
 def test_Box_hash():
     f = Box('f', Ty('x', 'y'), Ty('z'), data=42)
     assert {f: 42}[f] == 42
@@ -325,6 +349,9 @@ def test_Functor_call():
     assert F(F(f)) == f
     assert F(f >> f.dagger()) == f.dagger() >> f
     assert F(f @ f.dagger()) == f.dagger() @ Id(x) >> Id(x) @ f
+    assert F(Id(x @ x).then(*500 * [f @ f >> f[::-1] @ f[::-1]]))\
+        == Id(y @ y).then(*500 * [f[::-1] @ Id(y) >> Id(x) @ f[::-1]
+                                  >> f @ Id(x) >> Id(y) @ f])
     with raises(TypeError) as err:
         F(F)
     assert str(err.value) == messages.type_err(Diagram, F)
@@ -359,3 +386,229 @@ def test_bad_permute():
         Id(Ty('n')).permute(1)
     with raises(ValueError):
         Id(Ty('n')).permute(0, 0)
+
+
+def test_Diagram_init_lazy_layers():
+    x, y = Ty('x'), Ty('y')
+    f = Box('f', x, y)
+    n = 2000
+    diagram = Diagram(x ** n, y ** n, n * [f], list(range(n)))
+    assert diagram._layers is None
+    assert diagram.layers[0] == Layer(Ty(), f, x ** (n - 1))
+    assert diagram.layers[-1] == Layer(y ** (n - 1), f, Ty())
+    assert diagram[::-1] == diagram.dagger()
+    assert diagram[:3] == f @ f @ f @ Id(x ** (n - 3))
+    with raises(AxiomError):
+        Diagram(x, y, [f], [-1])
+
+
+def test_DiagramBuilder():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y @ y, x)
+    builder = DiagramBuilder(x @ x)
+    builder.append(f @ f)
+    diagram = builder.build()
+    builder >>= g
+    assert diagram == f @ f and builder.build() == f @ f >> g
+    assert builder.cod == x and len(builder) == 3
+    with raises(TypeError):
+        DiagramBuilder(x).append(f, 1.0)
+    with raises(TypeError):
+        DiagramBuilder(x).append(Ty('x'))
+    with raises(AxiomError):
+        DiagramBuilder(x).append(f, 1)
+    with raises(AxiomError):
+        DiagramBuilder(x @ x).append(g)
+    with raises(AxiomError):
+        DiagramBuilder(x @ x).then(f)
+    n = 2000
+    builder = DiagramBuilder(x ** n)
+    for i in range(n):
+        builder.append(f, i)
+    assert builder.build() == Diagram(
+        x ** n, y ** n, n * [f], list(range(n)))
+
+
+def test_Diagram_structural_sharing():
+    x = Ty('x')
+    f, g = Box('f', x, x), Box('g', x, x)
+    diagram = Diagram(x, x, 1000 * [f], 1000 * [0])
+    composed = diagram >> g
+    assert composed.boxes[:1000] == diagram.boxes
+    assert composed[:1000] == diagram and composed[1000:] == g
+    assert composed[500:502] == f >> f
+    assert (diagram @ g).offsets == 1000 * [0] + [1]
+    assert str(composed[-2:]) == "f >> g"
+
+
+def test_Diagram_hash_incremental():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y @ y, x)
+    left, right = f @ f >> g, Id(x) @ f
+    for one, two, method in [
+            (left, f, Diagram.tensor), (left, right, Diagram.tensor),
+            (right, Id(x) @ f[::-1], Diagram.then), (f @ f, g, Diagram.then)]:
+        hash(one), hash(two)
+        result = method(one, two)
+        assert result._hash_data is not None
+        fresh = Diagram(result.dom, result.cod, result.boxes, result.offsets)
+        assert fresh._get_hash_data() == result._hash_data
+        assert hash(fresh) == hash(result) and fresh == result
+    assert hash(PRO(2)) == hash(Ty(1, 1))
+    assert hash(Diagram(x, y, [f], [0])) == hash(f)
+    assert len({f @ f, Id(x) @ f >> f @ Id(y), f @ Id(x) >> Id(y) @ f}) == 2
+
+
+def test_Diagram_eq_and_hash():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y, data=1), Box('f', x, y, data=1.0)
+    left, right = f @ f >> Box('h', y @ y, x), g @ g >> Box('h', y @ y, x)
+    assert hash(left) == hash(right) and left == right
+    assert len({left, right, f @ f, g @ g}) == 2
+    assert left != Box('f', x, y, data=2) @ f >> Box('h', y @ y, x)
+
+
+def test_Diagram_columns():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y @ y), Box('g', y, x)
+    diagram = f @ f >> g @ Id(y) @ g @ Id(y)
+    columns = diagram.columns
+    assert columns is diagram.columns and len(columns) == len(diagram)
+    assert columns.table == (f, g) and list(columns.indices) == [0, 0, 1, 1]
+    assert list(columns.offsets) == diagram.offsets
+    assert list(columns.widths) == [2, 3, 4, 4, 4] and diagram.width() == 4
+    assert diagram.interchange(2, 1).interchange(1, 2) == diagram
+    assert diagram.interchange(2, 1)._layers is None
+    F = Functor(ob={x: y, y: x @ x}, ar={
+        f: Box('f', y, x ** 4), g: Box('g', x @ x, y)})
+    assert F(diagram) == F(f) @ F(f) >> F(g) @ Id(x @ x) @ F(g) @ Id(x @ x)
+
+
+def test_Diagram_then_tensor_many():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y, x)
+    composite = Id(x).then(*2000 * [f, g])
+    assert composite == Diagram(x, x, 2000 * [f, g], 4000 * [0])
+    product = Id(Ty()).tensor(*2000 * [f])
+    assert product == Diagram(x ** 2000, y ** 2000, 2000 * [f], range(2000))
+    assert hash(product) == hash(
+        Diagram(x ** 2000, y ** 2000, 2000 * [f], list(range(2000))))
+    with raises(AxiomError) as err:
+        f.then(g, g)
+    assert str(err.value) == messages.does_not_compose(f >> g, g)
+    with raises(TypeError):
+        f.tensor(g, x)
+
+
+def test_Diagram_normal_form_dag():
+    x = Ty('x')
+    unit, counit = Box('unit', Ty(), x), Box('counit', x, Ty())
+    cup, cap = Box('cup', x @ x, Ty()), Box('cap', Ty(), x @ x)
+    spiral = unit
+    for i in range(5):
+        spiral = spiral >> Id(x ** i) @ cap @ Id(x ** (i + 1))
+    spiral = spiral >> Id(x ** 5) @ counit @ Id(x ** 5)
+    for i in range(5):
+        spiral = spiral >> Id(x ** (4 - i)) @ cup @ Id(x ** (4 - i))
+    for left in [False, True]:
+        assert spiral.normal_form(left=left)\
+            == spiral.normal_form(method="rewrite", left=left)
+    with raises(NotImplementedError):
+        sort_boxes(spiral)
+    f, g = Box('f', x, x @ x), Box('g', x @ x, x)
+    diagram = f >> Id(x) @ f >> f @ Id(x @ x) >> Id(x) @ g @ Id(x) >> g @ Id(x)
+    assert sort_boxes(diagram) == diagram.normal_form(method="rewrite")
+    h = Box('h', x @ x, x @ x)
+    for diagram in [
+            f @ Id(x) >> Id(x) @ f @ Id(x) >> Id(x) @ cup @ Id(x) >> g,
+            f @ Id(x) >> Id(x) @ h >> Id(x) @ unit @ Id(x @ x)]:
+        for left in [False, True]:
+            assert sort_boxes(diagram, left=left)\
+                == diagram.normal_form(method="rewrite", left=left)
+    with raises(ValueError):
+        spiral.normal_form(method="bubble")
+
+
+def test_Diagram_foliation():
+    x = Ty('x')
+    f, g = Box('f', x, x @ x), Box('g', x @ x, x)
+    state, effect = Box('s', Ty(), x), Box('e', x, Ty())
+    scalar = Box('a', Ty(), Ty())
+    diagrams = [
+        f >> Id(x) @ f >> g @ Id(x) >> g,
+        state @ f >> effect @ g @ scalar >> state @ Id(x) >> scalar @ g,
+        Id(x) @ state @ scalar >> f @ effect >> scalar @ g @ state,
+        (f >> g) @ (f >> g) >> effect @ effect]
+    for diagram in diagrams:
+        *_, slices = diagram.foliate(yield_slices=True)
+        assert diagram.foliation()\
+            == Diagram(diagram.dom, diagram.cod, slices, len(slices) * [0])
+        assert diagram.depth() == len(slices)
+
+
+def test_Diagram_ports():
+    x, y = Ty('x'), Ty('y')
+    f, g, s = Box('f', x, y @ y), Box('g', y @ x, x), Box('s', Ty(), x)
+    diagram = f @ s >> Id(y) @ g >> Id(y) @ s @ Id(x)
+    ports = diagram.ports
+    assert ports is diagram.ports
+    assert ports.consumer(-1, 0) == (0, 0)
+    assert ports.consumer(0, 0) == (4, 0)
+    assert ports.consumer(0, 1) == (2, 0)
+    assert ports.consumer(1, 0) == (2, 1)
+    assert ports.producer(4, 1) == (3, 0)
+    assert ports.producer(4, 2) == (2, 0)
+    for box in range(-1, len(diagram)):
+        n_cod = len(diagram.dom if box < 0 else diagram.boxes[box].cod)
+        for port in range(n_cod):
+            assert ports.producer(*ports.consumer(box, port)) == (box, port)
+
+
+def test_Rewriter():
+    x, y = Ty('x'), Ty('y')
+    f, g, h = Box('f', x, y), Box('g', y @ y, y), Box('h', y, x @ x)
+    cancel = Rule(f >> f[::-1], Id(x), name="cancel")
+    fuse = Rule(f @ f >> g, Box('ff', x @ x, y), name="fuse")
+    diagram = h >> f @ f >> g >> f[::-1] >> f >> f[::-1]
+    rewriter = Rewriter(cancel, fuse)
+    assert rewriter(diagram) == h >> Box('ff', x @ x, y) >> f[::-1]
+    assert rewriter.stats["cancel"][0] == rewriter.stats["fuse"][0] == 1
+    assert diagram.rewrite(cancel, max_steps=0) == diagram
+    k = Box('k', x, x)
+    scattered = f @ f >> f[::-1] @ Id(y) >> k @ Id(y) >> Id(x) @ f[::-1]
+    assert scattered.rewrite(cancel) == k @ Id(x)
+    with raises(AxiomError):
+        Rule(f, Id(x))
+    with raises(ValueError):
+        Rule(f @ f, f @ f)
+
+
+def test_Diagram_getitem_scan():
+    x, y = Ty('x'), Ty('y')
+    f, g, h = Box('f', x, x @ y), Box('g', y @ y, y), Box('h', y, Ty())
+    step = f >> f @ Id(y) >> Id(x) @ g >> Id(x) @ h
+    diagram = Id(x).then(*(150 * [step]))
+    for key in [slice(0, 0), slice(70, 73), slice(150, 600), slice(-5, -1),
+                slice(599, 1000), slice(300, 200), slice(None, 64)]:
+        fresh = Diagram(diagram.dom, diagram.cod, diagram.boxes,
+                        diagram.offsets, _scan=False)
+        layers = diagram.layers[key]
+        assert (fresh[key].dom, fresh[key].cod) == (layers.dom, layers.cod)
+        assert fresh[key] == diagram[key] and fresh._layers is None
+    with raises(AttributeError):
+        diagram.boxes.append(f)
+    assert len(diagram.boxes) == len(diagram) == 600
+
+
+def test_Diagram_reorder_wires():
+    x = Ty('x')
+    f, g = Box('f', x, x @ x), Box('g', x @ x, x)
+    d = f @ f >> Id(x) @ g @ Id(x) >> g @ Id(x)
+    assert d.reorder([1, 0, 2, 3]) == d.interchange(1, 0)
+    with raises(InterchangerError) as error:
+        d.reorder([1, 0, 3, 2])
+    assert str(error.value) == "Boxes g and g do not commute."
+    n = 50
+    parallel = Diagram(x ** n, x ** (2 * n), n * [f], list(range(0, 2 * n, 2)))
+    assert parallel.reorder(list(range(n))[::-1]).offsets\
+        == list(range(n))[::-1]
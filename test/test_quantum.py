@@ -50,6 +50,25 @@ def test_Circuit_eval():
     assert MixedState().eval() == Discard().eval().dagger()
 
 
+def test_Circuit_compile():
+    circuit = Ket(0, 0) >> H @ Rx(0.25) >> CX
+    plan = circuit.compile()
+    assert np.allclose(plan().array, circuit.eval().array)
+    other = Ket(1, 0) >> X @ Rx(0.5) >> CX
+    assert other.compile().path is plan.path
+    with raises(ValueError):
+        Measure().compile()
+
+
+def test_Circuit_eval_batch():
+    circuits = [Ket(0, 0) >> H @ Rx(phase) >> CX for phase in [0, .25, .5]]
+    circuits += [Ket(1) >> H, Ket(0, 1) >> CX]
+    assert Circuit.eval_batch(circuits)\
+        == [circuit.eval() for circuit in circuits]
+    with raises(ValueError):
+        Circuit.eval_batch([H, Measure()])
+
+
 def test_Circuit_cups_and_caps():
     assert Circuit.cups(bit, bit) == Match() >> Discard(bit)
     assert Circuit.caps(bit, bit) == MixedState(bit) >> Copy()
@@ -430,6 +449,14 @@ def test_Digits():
     assert d.dagger().dagger() == d
 
 
+def test_ClassicalGate_hash():
+    circuit = Bits(1) >> Copy()
+    assert hash(circuit) == hash(Bits(1) >> Copy())
+    assert len({circuit, Bits(1) >> Copy(), Bits(0) >> Copy()}) == 2
+    F = Functor(ob=lambda x: x, ar=lambda f: f, cache_size=2)
+    assert F(circuit) == circuit
+
+
 def test_Bits():
     assert repr(Bits(0).dagger()) == "Bits(0).dagger()"
     assert Bits(0).dagger().dagger() == Bits(0)
@@ -448,6 +475,16 @@ def test_Rz():
     assert Rz(0).eval() == Id(1).eval()
 
 
+def test_eq_before_and_after_hash():
+    for left, right in [
+            (Rz(0.1), Rz(np.float32(0.1))),
+            (Scalar(1j)[::-1], Scalar(-1j)),
+            (Rz(0.1) @ Id(1) >> CX, Rz(np.float32(0.1)) @ Id(1) >> CX)]:
+        assert left == right
+        hash(left), hash(right)
+        assert left == right and len({left, right}) == 1
+
+
 def test_CRz():
     assert CRz(0).eval() == Id(2).eval()
 
@@ -779,3 +816,15 @@ def test_circuit_chaining():
         Id(1).CRx(0.7, 1, 0)
     with raises(ValueError):
         Id(2).X(999)
+
+
+def test_CircuitBuilder():
+    builder = CircuitBuilder(3)
+    builder.H(0).CX(0, 2).CRz(0.5, 2, 1).append(Ket(0), 3)
+    assert builder.build()\
+        == Id(3).H(0).CX(0, 2).CRz(0.5, 2, 1) @ Ket(0)
+    assert isinstance(builder.build(), Circuit)
+    with raises(ValueError):
+        builder.H(4)
+    with raises(AxiomError):
+        builder.append(Bra(0, 0), 3)
@@ -76,6 +76,24 @@ def test_Diagram_normal_form():
     assert str(err.value) == messages.is_not_connected(Eckmann_Hilton)
 
 
+def test_remove_snakes():
+    from discopy.rewriting import remove_snakes
+    x, y = Ty('x'), Ty('y')
+    f = Box('f', x, y @ x)
+    for diagram in [
+            f.transpose().transpose(left=True),
+            f.transpose(left=True) @ f.transpose().transpose(left=True),
+            Id(x).transpose() @ f.transpose(left=True).transpose(),
+            f.transpose().transpose().transpose(left=True)]:
+        *_, last_step = [diagram] + list(
+            diagram.normalize(interchange=False))
+        assert remove_snakes(diagram) == last_step
+        assert list(diagram.normalize(steps=False, interchange=False))\
+            == [last_step]
+    assert remove_snakes(f) == f
+    assert list(f.normalize(steps=False)) == []
+
+
 def test_Cup_init():
     with raises(TypeError):
         Cup('x', Ty('y'))
@@ -253,3 +271,35 @@ def test_cup_chaining():
 
     with raises(ValueError):
         Id(n @ n.r).cup(0, 2)
+
+
+def test_Box_memory():
+    assert vars(Ob('x')) == {} and vars(Ob('x', z=1)) == {'_z': 1}
+    box = Box('f', Ty('x'), Ty('y').l, data=None)
+    assert vars(box) == {}  # Only the diagrams have a __dict__.
+    assert all('__slots__' in vars(cls) for cls in type(box).__mro__
+               if not issubclass(Diagram, cls))
+
+
+def test_Box_pickle():
+    import pickle
+    f = Box('f', Ty('x'), Ty('y').l, data=[42], _z=1)
+    diagram = f >> f[::-1]
+    assert pickle.loads(pickle.dumps(f)) == f
+    assert pickle.loads(pickle.dumps(diagram)) == diagram
+    assert hash(pickle.loads(pickle.dumps(diagram))) == hash(diagram)
+
+
+def test_Functor_cache():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y @ x), Box('g', y, x)
+    ob = {x: y @ x, y: x}
+    ar = {f: Box('F', y @ x, x @ y @ x), g: Box('G', x, y @ x)}
+    F, G = Functor(ob, ar), Functor(ob, ar, cache_size=128)
+    diagram = f.l @ f.r >> Id(x.l) @ g.l @ Id(x.r) @ g.r\
+        >> Id(x.l) @ g[::-1].l @ Id(x.r) @ g.r[::-1]
+    diagram = diagram @ (f >> g @ Id(x)).bubble() @ (f >> g @ g[::-1]).bubble()
+    for _ in range(2):
+        assert F(diagram) == G(diagram)
+    assert G.cache_info().misses == G.cache_info().currsize
+    assert G.cache_info().hits > G.cache_info().misses
@@ -117,6 +117,39 @@ def test_Tensor_transpose():
         == Tensor.cups(Dim(2), Dim(2))
 
 
+def test_Tensor_no_copy():
+    array = np.arange(4.)
+    assert np.shares_memory(Tensor(Dim(2), Dim(2), array).array, array)
+    assert np.shares_memory(Box('f', Dim(2), Dim(2), array).array, array)
+
+
+def test_Diagram_eval_peak_memory():
+    import tracemalloc
+    x = Dim(128)
+    boxes = [Box('f{}'.format(i), x, x, np.random.rand(128, 128))
+             for i in range(20)]
+    diagram = Diagram.id(x).then(*boxes)
+    expected = diagram.eval()
+    tracemalloc.start()
+    result = diagram.eval()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert np.allclose(result.array, expected.array)
+    assert peak < 4 * boxes[0].array.nbytes
+
+
+def test_Tensor_lazy_permutations():
+    f = Tensor(Dim(2), Dim(3, 4), np.arange(24))
+    g = Tensor(Dim(4, 3), Dim(2), np.arange(24) * 1j)
+    h = (f @ g.dagger() >> Tensor.swap(Dim(3, 4), Dim(4, 3))).conjugate()
+    assert h._axes is not None
+    g_dagger = np.einsum('kja->akj', g.array.conj())
+    expected = np.einsum('acd,bef->badcfe', f.array, g_dagger).conj()
+    assert h._axes is not None and np.allclose(h.array, expected)
+    assert h._axes is None and h.array.shape == (2, 2, 4, 3, 3, 4)
+    assert f.transpose().transpose()._array is f.array
+
+
 def test_Tensor_tensor():
     assert Tensor.tensor(Tensor.id(Dim(2))) == Tensor.id(Dim(2))
 
@@ -158,6 +191,111 @@ def test_Functor_call():
     assert Functor(ob={x: Ty(2, 3)}, ar=None)(x) == Dim(2, 3)
 
 
+def test_contraction_path():
+    inputs, sizes = [[0, 1], [1, 2], [2, 3], [3]], dict.fromkeys(range(4), 4)
+    greedy = contraction_path(inputs, [0], sizes, method="greedy")
+    optimal = contraction_path(inputs, [0], sizes, method="optimal")
+    assert greedy[1:] == optimal[1:] == (4 ** 2 * 3, 3 * 4 ** 2 + 2 * 4)
+    assert contraction_path([[0]], [0], {0: 2}) == ([], 0, 2)
+    assert contraction_path([[0], [1, 2], [3]], [], {
+        0: 2, 1: 3, 2: 3, 3: 2}, method="greedy")[0] == [(0, 2), (0, 1)]
+    chain = [[i, i + 1] for i in range(1000)][::-1]
+    path, flops, _ = contraction_path(
+        chain, [0, 1000], dict.fromkeys(range(1001), 2), method="greedy")
+    assert len(path) == 999 and flops == 8 * 999
+    with raises(ValueError):
+        contraction_path(inputs, [0], sizes, method="random")
+
+
+def test_contract():
+    a, b = np.arange(4).reshape(2, 2), np.arange(8).reshape(2, 2, 2)
+    assert contract([a], [[0, 0]], [], {0: 2}) == 3
+    assert contract([], [], [], {0: 2, 1: 3}) == 6
+    assert np.all(contract([a, b], [[0, 1], [1, 2, 0]], [2, 2], {
+        0: 2, 1: 2, 2: 2}) == np.einsum('ab,bca->c', a, b) * np.eye(2))
+    assert np.all(contract([a, b, a], [[0, 1], [1, 0, 2], [2, 0]], [0], {
+        0: 2, 1: 2, 2: 2}) == np.einsum('ab,bac,ca->a', a, b, a))
+
+
+def test_Functor_pregroup():
+    n, s = Ty('n'), Ty('s')
+    words = [rigid.Box('w{}'.format(i), Ty(), n) for i in range(12)]
+    verb = rigid.Box('verb', Ty(), n.r @ s @ n.l)
+    sentence, cups = rigid.Id(Ty()), rigid.Id(Ty())
+    for i in range(0, 12, 2):
+        sentence = sentence @ words[i] @ verb @ words[i + 1]
+        cups = cups @ rigid.Cup(n, n.r) @ rigid.Id(s) @ rigid.Cup(n.l, n)
+    arrays = {word: np.random.rand(4) for word in words}
+    arrays[verb] = np.random.rand(4, 2, 4)
+    F = Functor({n: 4, s: 2}, lambda box: arrays[box])
+    expected = np.ones(())
+    for left, right in zip(words[::2], words[1::2]):
+        expected = np.multiply.outer(expected, np.einsum(
+            'a,asb,b->s', arrays[left], arrays[verb], arrays[right]))
+    assert np.allclose(F(sentence >> cups).array, expected)
+
+
+def test_Diagram_compile():
+    Plan.cache.clear()
+    alice = Box('alice', Dim(1), Dim(2), [1, 0])
+    bob = Box('bob', Dim(1), Dim(2), [0, 1])
+    loves = Box('loves', Dim(2), Dim(2), [2, 3, 4, 5])
+    plan = (alice >> loves >> bob[::-1]).compile()
+    assert plan.boxes == [alice, loves, bob[::-1]]
+    assert (bob >> loves >> alice[::-1]).compile().path is plan.path
+    assert Plan.cache.info().hits == 1
+    assert plan() == Tensor(Dim(1), Dim(1), 3)
+    assert plan({alice: np.array([0, 1])}) == Tensor(Dim(1), Dim(1), 5)
+    vector = np.array([1, 1])
+    assert plan([vector, np.eye(2), vector]) == Tensor(Dim(1), Dim(1), 2)
+    with raises(ValueError):
+        plan([vector])
+    assert Plan([], [0, 0], {0: 2}).expression == "ab->ab"
+
+
+def test_Diagram_eval_batch():
+    x = Dim(2)
+    f, g = Box('f', x, x, [1, 2, 3, 4]), Box('g', x, x, [0, 1, 1, 0])
+    diagrams = [
+        f >> g, g >> f, Spider(1, 2, x) >> f @ g, Spider(2, 1, x),
+        Diagram.caps(x @ x, x @ x), Diagram.caps(x, x) >> Diagram.cups(x, x),
+        Diagram.caps(x, x) >> f @ Id(x) >> Diagram.cups(x, x), Id(Dim(1))]
+    assert Diagram.eval_batch(diagrams)\
+        == [diagram.eval() for diagram in diagrams]
+    F = Functor(lambda x: x, lambda box: np.ones(box.array.shape))
+    assert Diagram.eval_batch(diagrams[:3], F) == list(map(F, diagrams[:3]))
+    assert Diagram.eval_batch([]) == []
+    f, g = Box('f', Dim(2), Dim(1), [1, 2]), Box('g', Dim(1), Dim(2), [3, 4])
+    assert f.compile().path is g.compile().path
+    assert Diagram.eval_batch([f, g]) == [f.eval(), g.eval()]
+
+
+def test_Diagram_eval_dtype():
+    f = Box('f', Dim(2), Dim(2), [1, 2, 3, 4])
+    for diagram in [f >> f, f @ f, Diagram.cups(Dim(2), Dim(2)),
+                    Spider(1, 2, Dim(2)), Id(Dim(2))]:
+        assert diagram.eval().array.dtype == np.float64
+    assert repr((f >> f).eval()) == repr(
+        Tensor.id(Dim(2)) >> f.eval() >> f.eval())
+    assert Diagram.eval_batch([f >> f])[0].array.dtype == np.float64
+    sevens = Box('sevens', Dim(2), Dim(2), [7, 0, 0, 7])
+    result = Id(Dim(2)).then(*(30 * [sevens])).eval().array[0, 0]
+    assert np.isclose(result, 7. ** 30)  # No int64 overflow.
+
+
+def test_Plan_batch_too_many_indices():
+    import torch
+    labels = list(range(60))
+    plan = Plan([labels[:30], labels[30:]], labels, dict.fromkeys(labels, 1))
+    assert None in plan._batch_steps
+    shape = (3, ) + 30 * (1, )
+    arrays = [torch.arange(3.).reshape(shape), torch.ones(shape)]
+    with Tensor.backend('pytorch'):
+        result = plan.batch(arrays)
+    assert result.shape == (3, ) + 60 * (1, )
+    assert result.flatten().tolist() == [0, 1, 2]
+
+
 def test_Functor_swap():
     x, y = Ty('x'), Ty('y')
     f, g = rigid.Box('f', x, x), rigid.Box('g', y, y)
@@ -166,6 +304,35 @@ def test_Functor_swap():
            F(rigid.Diagram.swap(x, y) >> g @ f)
 
 
+def test_Functor_cache():
+    x, y = Ty('x'), Ty('y')
+    f, g = rigid.Box('f', x, x @ y), rigid.Box('g', y, y)
+    ob, ar = {x: 2, y: 3}, {f: list(range(12)), g: list(range(9))}
+    F, G = Functor(ob, ar), Functor(ob, ar, cache_size=2)
+    swap = rigid.Diagram.swap
+    diagram = f >> swap(x, y) >> g @ rigid.Id(x) >> swap(y, x) >> f[::-1]\
+        >> f >> rigid.Id(x) @ g[::-1]
+    for _ in range(2):
+        assert F(diagram) == G(diagram)
+    assert G.cache_info().hits > 0 and G.cache_info().currsize == 2
+    G.cache_clear()
+    assert G.cache_info() == (0, 0, 2, 0) and F.cache_info() is None
+
+
+def test_Functor_then():
+    s, n, x = Ty('s'), Ty('n'), Ty('x')
+    alice, bob = rigid.Box('Alice', Ty(), n), rigid.Box('Bob', Ty(), n)
+    loves = rigid.Box('loves', Ty(), n.r @ s @ n.l)
+    sentence = alice @ loves @ bob\
+        >> rigid.Cup(n, n.r) @ rigid.Id(s) @ rigid.Cup(n.l, n)
+    a, b = rigid.Box('a', Ty(), x @ x), rigid.Box('b', Ty(), x @ x)
+    c = rigid.Box('c', Ty(), (x @ x).r @ (x @ x).l)
+    F = rigid.Functor({s: Ty(), n: x @ x}, {alice: a, bob: b, loves: c})
+    G = Functor({x: 2}, {a: [1, 2, 3, 4], b: [0, 1, 1, 0], c: range(16)})
+    for diagram in [sentence, rigid.Cap(n, n.l) @ rigid.Diagram.swap(n, s)]:
+        assert (F >> G)(diagram) == G(F(diagram)) == (G << F)(diagram)
+
+
 def test_AxiomError():
     m = Tensor(Dim(2, 2), Dim(2), [1, 0, 0, 1, 0, 1, 1, 0])
     with raises(AxiomError) as err:
@@ -278,10 +445,10 @@ def test_Tensor_adjoint_eval():
 
 def test_non_numpy_eval():
     import torch
-    Tensor.np = torch
-    with raises(Exception):
-        Swap(Dim(2), Dim(2)).eval()
-    Tensor.np = np
+    with Tensor.backend('pytorch'):
+        result = Swap(Dim(2), Dim(3)).eval().array
+        assert isinstance(result, torch.Tensor)
+    assert np.all(result.numpy() == Tensor.swap(Dim(2), Dim(3)).array)
 
 
 def test_Tensor_array():
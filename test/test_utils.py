@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock
 from unittest.mock import patch
+from pytest import raises
 
 from discopy import Ob
 from discopy.utils import *
@@ -14,3 +15,26 @@ zip_mock.open().__enter__().read.return_value =\
 @patch('zipfile.ZipFile', return_value=zip_mock)
 def test_load_corpus(a, b):
     assert load_corpus("[fake url]") == [Ob("a")]
+
+
+def test_Rope():
+    import pickle
+    import random
+    random.seed(42)
+    rope, items = Rope(), []
+    for i in range(1000):
+        if random.random() < .8:
+            rope, items = rope + [i], items + [i]
+        else:
+            j = random.randrange(len(items) + 1)
+            rope = rope[:j] + [i] + rope[j:]
+            items = items[:j] + [i] + items[j:]
+        assert rope[i // 2 - len(items)] == items[i // 2 - len(items)]
+    assert rope == items and len(rope) == len(items)
+    assert rope._height <= 2 * len(items).bit_length()
+    assert rope[100:900:3] == items[100:900:3]
+    assert list(reversed(rope)) == items[::-1]
+    assert hash(rope[:10]) == hash(tuple(items[:10]))
+    assert pickle.loads(pickle.dumps(rope)) == rope
+    with raises(IndexError):
+        rope[len(items)]
@@ -106,6 +106,15 @@ def test_to_pyzx():
     assert Diagram.from_pyzx(Z(0, 2).to_pyzx()) == Z(0, 2) >> SWAP
 
 
+def test_to_pyzx_wires():
+    from pyzx import EdgeType
+    diagram = Z(0, 1) @ Z(0, 1) >> H @ Id(1) >> SWAP >> X(1, 0) @ Id(1)
+    graph = diagram.to_pyzx()
+    assert graph.graph == {0: {3: 2}, 1: {2: 1}, 2: {1: 1}, 3: {0: 2}}
+    assert graph.edge_type(graph.edge(0, 3)) == EdgeType.HADAMARD
+    assert graph.edge_type(graph.edge(1, 2)) == EdgeType.SIMPLE
+
+
 def test_to_pyzx_scalar():
     # Test that a scalar is translated to the corresponding pyzx object.
     k = np.exp(np.pi / 4 * 1j)
@@ -185,3 +194,10 @@ def test_circuit2zx():
             == Diagram(dom=PRO(3), cod=PRO(3),
                        boxes=[SWAP, Z(1, 2), X(2, 1), scalar(2 ** 0.5), SWAP],
                        offsets=[1, 0, 1, 2, 1]))
+
+
+def test_eq_before_and_after_hash():
+    left, right = Z(1, 1, 0.1) >> H, Z(1, 1, np.float32(0.1)) >> H
+    assert left == right
+    hash(left), hash(right)
+    assert left == right and len({left, right}) == 1